@@ -0,0 +1,161 @@
+"""Transparent compression of large text fields, with GridFS spillover for very large ones"""
+import os
+import zlib
+import asyncio
+import logging
+from typing import Dict, Optional, Tuple, Union
+
+from bson import Binary
+from gridfs.errors import NoFile
+from motor.motor_asyncio import AsyncIOMotorGridFSBucket
+
+try:
+    import zstandard
+except ImportError:  # Optional: zlib is used when it isn't installed
+    zstandard = None
+
+# Texts shorter than this (UTF-8 bytes) are stored as plain strings
+CONTENT_COMPRESSION_THRESHOLD = int(os.environ.get('CONTENT_COMPRESSION_THRESHOLD', 16 * 1024))
+# Compressed payloads larger than this go to GridFS; keeps documents far below the 16 MB BSON limit
+CONTENT_GRIDFS_THRESHOLD = int(os.environ.get('CONTENT_GRIDFS_THRESHOLD', 4 * 1024 * 1024))
+CONTENT_CODEC = os.environ.get('CONTENT_CODEC', 'zstd' if zstandard else 'zlib')
+GRIDFS_BUCKET = 'content'
+
+# Project fields holding full article bodies
+COMPRESSED_FIELDS: Dict[str, Tuple[str, ...]] = {
+    "projects": ("original_content", "translated_content"),
+}
+
+EncodedText = Union[str, Dict, None]
+
+
+class ContentCodecError(Exception):
+    """Stored content that cannot be decoded here (unknown codec or missing zstandard)"""
+
+
+def compress(data: bytes, codec: str) -> bytes:
+    if codec == 'zstd':
+        if zstandard is None:
+            raise ContentCodecError("zstd codec needs the zstandard package")
+        return zstandard.ZstdCompressor(level=6).compress(data)
+    if codec == 'zlib':
+        return zlib.compress(data, 6)
+    raise ContentCodecError(f"Unknown codec: {codec}")
+
+
+def decompress(data: bytes, codec: str) -> bytes:
+    if codec == 'zstd':
+        if zstandard is None:
+            raise ContentCodecError("zstd codec needs the zstandard package")
+        return zstandard.ZstdDecompressor().decompress(data)
+    if codec == 'zlib':
+        return zlib.decompress(data)
+    raise ContentCodecError(f"Unknown codec: {codec}")
+
+
+def is_encoded(value) -> bool:
+    return isinstance(value, dict) and 'codec' in value
+
+
+def encode_text(text: Optional[str], codec: str = CONTENT_CODEC) -> Tuple[EncodedText, Optional[bytes]]:
+    """
+    (stored value, GridFS payload). Small texts stay strings; larger ones become
+    {codec, size, data: Binary}. When the compressed payload is too big for a document,
+    'data' is left out and the payload is returned for the caller to put in GridFS.
+    """
+    if text is None:
+        return None, None
+    raw = text.encode('utf-8')
+    if len(raw) < CONTENT_COMPRESSION_THRESHOLD:
+        return text, None
+    payload = compress(raw, codec)
+    if len(payload) >= len(raw):
+        # Incompressible: nothing to gain
+        return text, None
+    encoded = {"codec": codec, "size": len(raw)}
+    if len(payload) > CONTENT_GRIDFS_THRESHOLD:
+        return encoded, payload
+    encoded["data"] = Binary(payload)
+    return encoded, None
+
+
+def spill_id(value: EncodedText):
+    """GridFS file id of a spilled value, else None"""
+    return value.get('gridfs_id') if is_encoded(value) else None
+
+
+def decode_text(value: EncodedText, payload: Optional[bytes] = None) -> Optional[str]:
+    """Plain string back from a stored value; GridFS-backed values need their payload passed in"""
+    if not is_encoded(value):
+        return value
+    data = payload if payload is not None else value.get('data')
+    if data is None:
+        raise ContentCodecError("GridFS-backed content decoded without its payload")
+    return decompress(bytes(data), value['codec']).decode('utf-8')
+
+
+class ContentCodec:
+    """Encodes COMPRESSED_FIELDS before writes and decodes them when a full document is served"""
+
+    def __init__(self, db, bucket_name: str = GRIDFS_BUCKET):
+        self.db = db
+        self.bucket = AsyncIOMotorGridFSBucket(db, bucket_name=bucket_name)
+
+    async def encode(self, collection: str, doc_id: str, field: str, text: Optional[str]) -> EncodedText:
+        """Stored value for one field; a spilled payload is uploaded to GridFS first"""
+        encoded, payload = await asyncio.to_thread(encode_text, text)
+        if payload is not None:
+            encoded["gridfs_id"] = await self.bucket.upload_from_stream(
+                f"{collection}/{doc_id}/{field}",
+                payload,
+                metadata={"collection": collection, "doc_id": doc_id, "field": field}
+            )
+        return encoded
+
+    async def encode_fields(self, collection: str, document: Dict) -> Dict:
+        """Copy of document with its large text fields encoded for storage"""
+        encoded = dict(document)
+        for field in COMPRESSED_FIELDS.get(collection, ()):
+            if isinstance(encoded.get(field), str):
+                encoded[field] = await self.encode(collection, document['id'], field, encoded[field])
+        return encoded
+
+    async def decode_fields(self, collection: str, document: Optional[Dict]) -> Optional[Dict]:
+        """Decode encoded fields in place (documents that predate compression pass through)"""
+        if not document:
+            return document
+        for field in COMPRESSED_FIELDS.get(collection, ()):
+            value = document.get(field)
+            if not is_encoded(value):
+                continue
+            payload = None
+            if value.get('gridfs_id') is not None:
+                stream = await self.bucket.open_download_stream(value['gridfs_id'])
+                payload = await stream.read()
+            document[field] = await asyncio.to_thread(decode_text, value, payload)
+        return document
+
+    async def discard(self, value: EncodedText) -> bool:
+        """
+        Delete the GridFS spill of one stored value: the value a write replaced (from the
+        pre-image), or a freshly encoded one whose write didn't land. Other spills of the
+        same field, such as one a concurrent write just stored, are left alone.
+        """
+        gridfs_id = spill_id(value)
+        if gridfs_id is None:
+            return False
+        try:
+            await self.bucket.delete(gridfs_id)
+        except NoFile:
+            return False
+        return True
+
+    async def release(self, collection: str, doc_id: str) -> int:
+        """Delete every GridFS spill of a document; called after the document was deleted"""
+        removed = 0
+        async for spilled in self.bucket.find({"metadata.collection": collection, "metadata.doc_id": doc_id}):
+            await self.bucket.delete(spilled._id)
+            removed += 1
+        if removed:
+            logging.info(f"🗜️ Removed {removed} spilled content file(s) of {collection}/{doc_id}")
+        return removed
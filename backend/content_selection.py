@@ -0,0 +1,87 @@
+"""Relevance-ranked selection of source passages under a prompt token budget"""
+import os
+import re
+from typing import List, Set
+
+# Per-endpoint input budgets (approximate tokens of source text in the prompt)
+SOCIAL_POST_TOKEN_BUDGET = int(os.environ.get('SOCIAL_POST_TOKEN_BUDGET', 1200))
+KOL_POST_TOKEN_BUDGET = int(os.environ.get('KOL_POST_TOKEN_BUDGET', 3000))
+NEWS_TOKEN_BUDGET = int(os.environ.get('NEWS_TOKEN_BUDGET', 3000))
+
+# Rough chars-per-token for Gemini on mixed English/Vietnamese text
+CHARS_PER_TOKEN = 4
+
+_WORD_PATTERN = re.compile(r'\w+')
+_STOPWORDS = {
+    'a', 'an', 'the', 'and', 'or', 'of', 'to', 'in', 'on', 'for', 'with', 'is', 'are', 'was', 'be',
+    'by', 'at', 'as', 'from', 'it', 'its', 'this', 'that', 'how', 'what', 'why', 'new', 'your', 'our',
+    'và', 'của', 'là', 'có', 'cho', 'các', 'những', 'một', 'trong', 'với', 'được', 'này', 'về'
+}
+
+
+def estimate_tokens(text: str) -> int:
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def _terms(text: str) -> Set[str]:
+    return {word for word in _WORD_PATTERN.findall(text.lower()) if word not in _STOPWORDS and len(word) > 1}
+
+
+def split_passages(text: str) -> List[str]:
+    """One passage per non-empty line (extract_main_text emits one block per line)"""
+    return [line.strip() for line in text.splitlines() if line.strip()]
+
+
+def score_passage(passage: str, index: int, total: int, title_terms: Set[str]) -> float:
+    """
+    Higher is better. Combines position (articles front-load the key facts),
+    text density (real sentences beat menu fragments) and overlap with the title.
+    """
+    words = _WORD_PATTERN.findall(passage.lower())
+    if not words:
+        return 0.0
+
+    position = 1.0 - index / max(total, 1)
+    density = min(len(words), 60) / 60
+    # Sentences end with punctuation; navigation crumbs and button labels don't
+    if len(words) < 6 and not passage.rstrip().endswith(('.', '!', '?', ':')):
+        density *= 0.3
+
+    overlap = 0.0
+    if title_terms:
+        overlap = len(title_terms.intersection(words)) / len(title_terms)
+
+    return position + density + 2 * overlap
+
+
+def select_passages(text: str, title: str, token_budget: int) -> str:
+    """
+    Pack the highest-scoring passages into token_budget and return them in their
+    original order. Text already within budget is returned unchanged.
+    """
+    if not text or estimate_tokens(text) <= token_budget:
+        return text
+
+    passages = split_passages(text)
+    title_terms = _terms(title or '')
+    ranked = sorted(
+        range(len(passages)),
+        key=lambda i: score_passage(passages[i], i, len(passages), title_terms),
+        reverse=True
+    )
+
+    chosen = []
+    remaining = token_budget
+    for i in ranked:
+        cost = estimate_tokens(passages[i]) + 1  # +1 for the joining newline
+        if cost <= remaining:
+            chosen.append(i)
+            remaining -= cost
+        if remaining <= 0:
+            break
+
+    if not chosen:
+        # A single passage larger than the whole budget: keep its beginning
+        return passages[ranked[0]][:token_budget * CHARS_PER_TOKEN]
+
+    return '\n'.join(passages[i] for i in sorted(chosen))
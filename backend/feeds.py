@@ -0,0 +1,347 @@
+"""RSS/Atom/sitemap ingestion with incremental crawling"""
+import io
+import os
+import gzip
+import asyncio
+import logging
+import xml.etree.ElementTree as ET
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from fetcher import FetchError, fetch_url
+
+FEED_CONTENT_TYPES = (
+    'application/rss+xml', 'application/atom+xml', 'application/xml', 'text/xml',
+    'application/x-gzip', 'application/gzip', 'application/octet-stream', 'text/plain'
+)
+MAX_FEED_BYTES = int(os.environ.get('SCRAPE_MAX_FEED_BYTES', 20 * 1024 * 1024))
+# Entries scraped per poll, so a large sitemap is worked through over several polls
+MAX_ENTRIES_PER_POLL = int(os.environ.get('FEED_MAX_ENTRIES_PER_POLL', 20))
+# Entries scraped in parallel during one poll
+FEED_INGEST_CONCURRENCY = int(os.environ.get('FEED_INGEST_CONCURRENCY', 4))
+# Failed entries are retried with exponential backoff, then given up on
+FEED_MAX_ATTEMPTS = int(os.environ.get('FEED_MAX_ATTEMPTS', 5))
+FEED_RETRY_BASE_SECONDS = int(os.environ.get('FEED_RETRY_BASE_SECONDS', 15 * 60))
+FEED_RETRY_MAX_SECONDS = int(os.environ.get('FEED_RETRY_MAX_SECONDS', 24 * 3600))
+
+FEED_TARGETS = ('project', 'news')
+
+
+class FeedParseError(Exception):
+    """Raised when a document is not RSS, Atom or a sitemap"""
+
+
+def _local_name(tag: str) -> str:
+    """Strip the {namespace} prefix ElementTree puts on tags"""
+    return tag.rsplit('}', 1)[-1].lower()
+
+
+def _child_text(element, name: str) -> Optional[str]:
+    """Text of the first direct child with the given local name"""
+    for child in element:
+        if _local_name(child.tag) == name and child.text:
+            return child.text.strip()
+    return None
+
+
+def parse_feed_date(value: Optional[str]) -> Optional[datetime]:
+    """Parse RFC 822 (RSS) or ISO 8601 (Atom, sitemaps) dates as aware UTC datetimes"""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        try:
+            parsed = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+def parse_feed(content: bytes) -> Dict:
+    """
+    Parse an RSS, Atom, sitemap or sitemap index document.
+    Returns {'kind': ..., 'entries': [{'url', 'lastmod', 'title'}]}; for a sitemap
+    index the entries are the child sitemaps.
+    """
+    if content[:2] == b'\x1f\x8b':
+        # Gzipped sitemap - decompress under the same size cap as the download
+        try:
+            with gzip.GzipFile(fileobj=io.BytesIO(content)) as archive:
+                content = archive.read(MAX_FEED_BYTES + 1)
+        except (OSError, EOFError) as e:
+            raise FeedParseError(f"Invalid gzip data: {e}")
+        if len(content) > MAX_FEED_BYTES:
+            raise FeedParseError(f"Decompressed feed exceeds {MAX_FEED_BYTES} bytes")
+    try:
+        root = ET.fromstring(content)
+    except ET.ParseError as e:
+        raise FeedParseError(f"Invalid XML: {e}")
+
+    kind = _local_name(root.tag)
+    entries = []
+
+    if kind == 'rss' or kind == 'rdf':
+        for item in root.iter():
+            if _local_name(item.tag) != 'item':
+                continue
+            link = _child_text(item, 'link') or _child_text(item, 'guid')
+            if link:
+                entries.append({
+                    'url': link,
+                    'lastmod': parse_feed_date(_child_text(item, 'pubdate') or _child_text(item, 'date')),
+                    'title': _child_text(item, 'title')
+                })
+        kind = 'rss'
+
+    elif kind == 'feed':
+        kind = 'atom'
+        for entry in root:
+            if _local_name(entry.tag) != 'entry':
+                continue
+            link = None
+            for child in entry:
+                if _local_name(child.tag) == 'link' and child.get('rel', 'alternate') == 'alternate':
+                    link = child.get('href')
+                    break
+            if link:
+                entries.append({
+                    'url': link,
+                    'lastmod': parse_feed_date(_child_text(entry, 'updated') or _child_text(entry, 'published')),
+                    'title': _child_text(entry, 'title')
+                })
+
+    elif kind in ('urlset', 'sitemapindex'):
+        item_name = 'url' if kind == 'urlset' else 'sitemap'
+        kind = 'sitemap' if kind == 'urlset' else 'sitemapindex'
+        for item in root:
+            if _local_name(item.tag) != item_name:
+                continue
+            loc = _child_text(item, 'loc')
+            if loc:
+                entries.append({
+                    'url': loc,
+                    'lastmod': parse_feed_date(_child_text(item, 'lastmod')),
+                    'title': None
+                })
+
+    else:
+        raise FeedParseError(f"Unsupported feed root element <{kind}>")
+
+    return {'kind': kind, 'entries': entries}
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def retry_delay(attempts: int) -> timedelta:
+    """Wait before retrying an entry that failed attempts times: doubling from the base, capped"""
+    return timedelta(seconds=min(FEED_RETRY_BASE_SECONDS * 2 ** max(attempts - 1, 0), FEED_RETRY_MAX_SECONDS))
+
+
+def is_entry_changed(entry: Dict, seen: Optional[Dict], now: Optional[datetime] = None) -> bool:
+    """
+    New URL, an unfinished child sitemap, a failure whose backoff has passed (until
+    FEED_MAX_ATTEMPTS), or a lastmod newer than the one we ingested
+    """
+    if seen is None or seen.get('status') == 'pending':
+        return True
+    if seen.get('status') == 'failed':
+        if seen.get('attempts', 1) >= FEED_MAX_ATTEMPTS:
+            return False
+        retry_at = seen.get('next_attempt_at')
+        return retry_at is None or _as_utc(retry_at) <= (now or datetime.now(timezone.utc))
+    if entry['lastmod'] is None or seen.get('lastmod') is None:
+        return False
+    return entry['lastmod'] > _as_utc(seen['lastmod'])
+
+
+class FeedIngestor:
+    """
+    Polls registered feeds and hands new/changed entry URLs to a handler per target
+    ('project' creates a project, 'news' queues a news article). Handlers get the id of
+    the document an earlier poll created for the URL, so a changed entry refreshes it.
+    Seen URLs and their lastmod live in feed_entries, keyed by (feed_id, url).
+    """
+
+    def __init__(self, db, handlers: Dict[str, Callable[[str, Optional[str]], Awaitable[str]]]):
+        self.db = db
+        self.handlers = handlers
+        self._polling: set = set()
+
+    async def _fetch(self, url: str, conditional: Optional[Dict] = None) -> Dict:
+        """Fetch a feed document, with If-None-Match/If-Modified-Since when known"""
+        headers = {}
+        if conditional:
+            if conditional.get('etag'):
+                headers['If-None-Match'] = conditional['etag']
+            if conditional.get('last_modified'):
+                headers['If-Modified-Since'] = conditional['last_modified']
+        return await fetch_url(url, FEED_CONTENT_TYPES, MAX_FEED_BYTES, timeout=20, headers=headers or None)
+
+    async def _collect_entries(self, feed: Dict, document: Dict, report: Dict) -> Tuple[List[Dict], List[Dict]]:
+        """
+        Flatten a sitemap index into page entries, re-fetching only child sitemaps that
+        are new, changed, unfinished or have no lastmod. Returns (entries, fetched_children).
+        """
+        if document['kind'] != 'sitemapindex':
+            return document['entries'], []
+
+        children = document['entries']
+        seen = await self._load_seen(feed['id'], [child['url'] for child in children])
+        entries = []
+        fetched_children = []
+        for child in children:
+            if child['lastmod'] is not None and not is_entry_changed(child, seen.get(child['url'])):
+                continue
+            try:
+                page = await self._fetch(child['url'])
+                entries.extend(parse_feed(page['content'])['entries'])
+                fetched_children.append(child)
+            except (FetchError, FeedParseError) as e:
+                logging.warning(f"⚠️ Child sitemap {child['url']} failed: {e}")
+                report['errors'].append(f"{child['url']}: {e}")
+                await self._mark_failed(feed['id'], child, seen.get(child['url']))
+        return entries, fetched_children
+
+    async def _load_seen(self, feed_id: str, urls: List[str]) -> Dict[str, Dict]:
+        """Seen-entry records for a batch of URLs"""
+        if not urls:
+            return {}
+        cursor = self.db.feed_entries.find(
+            {"feed_id": feed_id, "url": {"$in": urls}},
+            {"_id": 0, "url": 1, "lastmod": 1, "status": 1, "target_id": 1, "attempts": 1, "next_attempt_at": 1}
+        )
+        return {doc['url']: doc async for doc in cursor}
+
+    async def _mark_seen(self, feed_id: str, entry: Dict, status: str, target_id: Optional[str],
+                         attempts: int = 0, next_attempt_at: Optional[datetime] = None):
+        """Upsert the seen-entry record"""
+        now = datetime.now(timezone.utc)
+        update = {
+            "lastmod": entry['lastmod'],
+            "status": status,
+            "last_seen_at": now,
+            "attempts": attempts,
+            "next_attempt_at": next_attempt_at
+        }
+        if target_id:
+            update["target_id"] = target_id
+        await self.db.feed_entries.update_one(
+            {"feed_id": feed_id, "url": entry['url']},
+            {"$set": update, "$setOnInsert": {"first_seen_at": now}},
+            upsert=True
+        )
+
+    async def _mark_failed(self, feed_id: str, entry: Dict, seen: Optional[Dict]):
+        """Record a failed attempt and when to try it again"""
+        attempts = seen.get('attempts', 1) + 1 if seen and seen.get('status') == 'failed' else 1
+        if attempts >= FEED_MAX_ATTEMPTS:
+            logging.warning(f"⚠️ Giving up on feed entry {entry['url']} after {attempts} attempts")
+        await self._mark_seen(
+            feed_id, entry, 'failed', None,
+            attempts=attempts, next_attempt_at=datetime.now(timezone.utc) + retry_delay(attempts)
+        )
+
+    async def _ingest_entry(self, feed: Dict, entry: Dict, seen: Optional[Dict], semaphore: asyncio.Semaphore, report: Dict):
+        """Scrape one entry through the feed's target handler and record the outcome"""
+        async with semaphore:
+            try:
+                target_id = await self.handlers[feed['target']](entry['url'], (seen or {}).get('target_id'))
+                await self._mark_seen(feed['id'], entry, 'ingested', target_id)
+                report['created'].append(target_id)
+            except Exception as e:
+                logging.error(f"❌ Feed entry {entry['url']} failed: {e}")
+                await self._mark_failed(feed['id'], entry, seen)
+                report['errors'].append(f"{entry['url']}: {e}")
+
+    async def poll_feed(self, feed: Dict) -> Dict:
+        """Poll one feed and ingest its new/changed entries"""
+        report = {
+            'feed_id': feed['id'],
+            'not_modified': False,
+            'entries_found': 0,
+            'entries_new': 0,
+            'created': [],
+            'errors': []
+        }
+        if feed['id'] in self._polling:
+            report['errors'].append("Poll already in progress")
+            return report
+        self._polling.add(feed['id'])
+
+        feed_update = {"last_polled_at": datetime.now(timezone.utc), "last_error": None}
+        try:
+            try:
+                page = await self._fetch(feed['url'], feed)
+                if page['status_code'] == 304:
+                    report['not_modified'] = True
+                    return report
+                document = parse_feed(page['content'])
+                feed_update['kind'] = document['kind']
+                entries, fetched_children = await self._collect_entries(feed, document, report)
+            except (FetchError, FeedParseError) as e:
+                feed_update['last_error'] = str(e)
+                report['errors'].append(str(e))
+                return report
+
+            # De-duplicate URLs within the document, keeping the newest lastmod
+            unique = {}
+            for entry in entries:
+                current = unique.get(entry['url'])
+                if current is None or (entry['lastmod'] and (current['lastmod'] is None or entry['lastmod'] > current['lastmod'])):
+                    unique[entry['url']] = entry
+            report['entries_found'] = len(unique)
+
+            seen = await self._load_seen(feed['id'], list(unique))
+            pending = [entry for url, entry in unique.items() if is_entry_changed(entry, seen.get(url))]
+            report['entries_new'] = len(pending)
+
+            if not feed.get('baseline_done') and not feed.get('backfill'):
+                # First poll without backfill: remember what exists, ingest only what appears later
+                for entry in pending:
+                    await self._mark_seen(feed['id'], entry, 'baseline', None)
+                pending = []
+            else:
+                # Newest first, capped per poll
+                pending.sort(key=lambda e: e['lastmod'] or datetime.min.replace(tzinfo=timezone.utc), reverse=True)
+                semaphore = asyncio.Semaphore(FEED_INGEST_CONCURRENCY)
+                await asyncio.gather(*(
+                    self._ingest_entry(feed, entry, seen.get(entry['url']), semaphore, report)
+                    for entry in pending[:MAX_ENTRIES_PER_POLL]
+                ))
+            feed_update['baseline_done'] = True
+
+            # Entries beyond the cap are picked up next poll, so keep child sitemaps
+            # unfinished and skip the conditional-request validators until we catch up
+            finished = len(pending) <= MAX_ENTRIES_PER_POLL
+            for child in fetched_children:
+                await self._mark_seen(feed['id'], child, 'ingested' if finished else 'pending', None)
+            if finished:
+                feed_update['etag'] = page['headers'].get('etag')
+                feed_update['last_modified'] = page['headers'].get('last-modified')
+
+            logging.info(f"📰 Feed {feed['url']}: {report['entries_found']} entries, {len(report['created'])} ingested, {len(report['errors'])} errors")
+            return report
+        finally:
+            await self.db.feeds.update_one({"id": feed['id']}, {"$set": feed_update})
+            self._polling.discard(feed['id'])
+
+    async def poll_all(self) -> List[Dict]:
+        """Poll every enabled feed (feeds run concurrently; the fetcher keeps per-host limits)"""
+        feeds = await self.db.feeds.find({"enabled": True}, {"_id": 0}).to_list(1000)
+        return await asyncio.gather(*(self.poll_feed(feed) for feed in feeds))
+
+    async def run_forever(self, interval_seconds: float):
+        """Background polling loop"""
+        while True:
+            try:
+                await self.poll_all()
+            except Exception as e:
+                logging.error(f"Feed polling error: {e}")
+            await asyncio.sleep(interval_seconds)
@@ -0,0 +1,329 @@
+"""Bounded, streamed HTTP fetching shared by the scrapers in server.py"""
+import os
+import re
+import time
+import codecs
+import random
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+import httpx
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+}
+
+# Size caps (bytes) - a page or image larger than this is aborted mid-stream
+MAX_PAGE_BYTES = int(os.environ.get('SCRAPE_MAX_PAGE_BYTES', 5 * 1024 * 1024))
+MAX_IMAGE_BYTES = int(os.environ.get('SCRAPE_MAX_IMAGE_BYTES', 15 * 1024 * 1024))
+
+# Content types accepted before any of the body is read
+HTML_CONTENT_TYPES = ('text/html', 'application/xhtml+xml')
+IMAGE_CONTENT_TYPES = ('image/',)
+
+# Per-host politeness: concurrent requests, spacing between request starts (seconds), retries on 5xx/429
+MAX_REQUESTS_PER_HOST = int(os.environ.get('FETCH_MAX_PER_HOST', 4))
+MIN_HOST_INTERVAL = float(os.environ.get('FETCH_HOST_INTERVAL', 0.2))
+MAX_FETCH_RETRIES = int(os.environ.get('FETCH_MAX_RETRIES', 2))
+
+CHUNK_SIZE = 64 * 1024
+# How much of the body we look at for a <meta charset> when the header has none
+CHARSET_SNIFF_BYTES = 4096
+
+_META_CHARSET_PATTERN = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?\s*([a-zA-Z0-9_.:-]+)', re.IGNORECASE)
+_BOMS = (
+    (codecs.BOM_UTF8, 'utf-8'),
+    (codecs.BOM_UTF16_LE, 'utf-16-le'),
+    (codecs.BOM_UTF16_BE, 'utf-16-be'),
+)
+
+
+class FetchError(Exception):
+    """Raised when a URL cannot be fetched within the configured limits"""
+
+    def __init__(self, message: str, retryable: bool = False, retry_after: Optional[float] = None):
+        super().__init__(message)
+        # 5xx, 429, timeouts and connection errors are worth another attempt
+        self.retryable = retryable
+        self.retry_after = retry_after
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After in seconds (HTTP-date values are ignored)"""
+    if value and value.strip().isdigit():
+        return float(value.strip())
+    return None
+
+
+class HostScheduler:
+    """
+    Per-host concurrency limiter and politeness scheduler.
+    Requests to different hosts run fully in parallel; requests to the same host are
+    capped, spaced out, given a timeout adapted to that host's observed latency,
+    and retried with exponential backoff on retryable failures.
+    """
+
+    def __init__(
+        self,
+        max_per_host: int = MAX_REQUESTS_PER_HOST,
+        min_interval: float = MIN_HOST_INTERVAL,
+        max_retries: int = MAX_FETCH_RETRIES,
+        base_backoff: float = 0.5,
+        min_timeout: float = 5,
+        max_timeout: float = 45
+    ):
+        self.max_per_host = max_per_host
+        self.min_interval = min_interval
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        # Earliest monotonic time the next request to a host may start
+        self._next_slot: Dict[str, float] = {}
+        # Exponentially weighted average response time per host (seconds)
+        self._latency: Dict[str, float] = {}
+
+    @staticmethod
+    def get_host(url: str) -> str:
+        """Scheduling key for a URL"""
+        return (urlparse(url).hostname or '').lower()
+
+    def get_timeout(self, host: str, default: float) -> float:
+        """Timeout for the next request: ~4x the host's average latency, clamped"""
+        if host not in self._latency:
+            return default
+        return min(self.max_timeout, max(self.min_timeout, self._latency[host] * 4))
+
+    def record_latency(self, host: str, seconds: float):
+        """Update the host's latency average after a request"""
+        previous = self._latency.get(host)
+        self._latency[host] = seconds if previous is None else previous * 0.7 + seconds * 0.3
+
+    async def _wait_for_slot(self, host: str):
+        """Space out request starts to the same host by min_interval"""
+        now = time.monotonic()
+        slot = max(now, self._next_slot.get(host, now))
+        self._next_slot[host] = slot + self.min_interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+    def _backoff_delay(self, attempt: int, error: FetchError) -> float:
+        """Exponential backoff with jitter, honoring Retry-After"""
+        delay = self.base_backoff * (2 ** attempt) + random.uniform(0, self.base_backoff)
+        if error.retry_after is not None:
+            delay = max(delay, min(error.retry_after, self.max_timeout))
+        return delay
+
+    async def run(self, url: str, func: Callable[[float], Awaitable], default_timeout: float):
+        """Run func(timeout) for url under the host's limits, retrying retryable FetchErrors"""
+        host = self.get_host(url)
+        semaphore = self._semaphores.setdefault(host, asyncio.Semaphore(self.max_per_host))
+
+        for attempt in range(self.max_retries + 1):
+            async with semaphore:
+                await self._wait_for_slot(host)
+                timeout = self.get_timeout(host, default_timeout)
+                started = time.monotonic()
+                try:
+                    result = await func(timeout)
+                    self.record_latency(host, time.monotonic() - started)
+                    return result
+                except FetchError as e:
+                    # A slow failure still tells us about the host's latency
+                    self.record_latency(host, time.monotonic() - started)
+                    if not e.retryable or attempt == self.max_retries:
+                        raise
+                    error = e
+
+            delay = self._backoff_delay(attempt, error)
+            logging.warning(f"🔁 Retrying {url} in {delay:.1f}s (attempt {attempt + 2}/{self.max_retries + 1}): {error}")
+            await asyncio.sleep(delay)
+
+
+# Shared scheduler for every outgoing scrape/image request
+host_scheduler = HostScheduler()
+
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Shared AsyncClient so connections are pooled across scrapes"""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            headers=DEFAULT_HEADERS,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+        )
+    return _client
+
+
+async def close_http_client():
+    """Close the shared client (called on app shutdown)"""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def _normalize_charset(name: str) -> Optional[str]:
+    """Return a Python codec name for a declared charset, or None if unknown"""
+    try:
+        return codecs.lookup(name.strip().strip('"\'')).name
+    except (LookupError, ValueError):
+        return None
+
+
+def charset_from_content_type(content_type: str) -> Optional[str]:
+    """Extract charset=... from a Content-Type header"""
+    for param in content_type.split(';')[1:]:
+        key, _, value = param.partition('=')
+        if key.strip().lower() == 'charset' and value:
+            return _normalize_charset(value)
+    return None
+
+
+def sniff_charset(head: bytes) -> Optional[str]:
+    """Detect the encoding from a BOM or <meta charset> in the first bytes of a document"""
+    for bom, encoding in _BOMS:
+        if head.startswith(bom):
+            return encoding
+    match = _META_CHARSET_PATTERN.search(head[:CHARSET_SNIFF_BYTES])
+    if match:
+        return _normalize_charset(match.group(1).decode('ascii', 'ignore'))
+    return None
+
+
+def is_content_type_allowed(content_type: str, allowed_types: Tuple[str, ...]) -> bool:
+    """Prefix match on the media type; a missing header is left to the parser"""
+    if not allowed_types:
+        return True
+    media_type = content_type.split(';')[0].strip().lower()
+    if not media_type:
+        return True
+    return any(media_type.startswith(allowed) for allowed in allowed_types)
+
+
+async def _fetch_once(
+    url: str,
+    allowed_types: Tuple[str, ...],
+    max_bytes: int,
+    timeout: float,
+    headers: Optional[Dict[str, str]],
+    truncate: bool = False
+) -> Dict:
+    """
+    Stream a URL into memory, aborting as soon as the response is the wrong type
+    or grows beyond max_bytes. Returns a dict with content, encoding and headers.
+    With truncate=True, reading stops at max_bytes instead of failing and
+    'complete' tells whether the whole body was received.
+    """
+    client = get_http_client()
+    try:
+        async with client.stream('GET', url, headers=headers, timeout=timeout) as response:
+            # Conditional requests (feeds) get their 304 back instead of an error
+            if response.status_code == 304:
+                return {
+                    'url': str(response.url),
+                    'status_code': 304,
+                    'headers': response.headers,
+                    'content_type': response.headers.get('content-type', ''),
+                    'encoding': None,
+                    'content': b''
+                }
+            response.raise_for_status()
+
+            # Gate on content type and declared size before reading the body
+            content_type = response.headers.get('content-type', '')
+            if not is_content_type_allowed(content_type, allowed_types):
+                raise FetchError(f"Unsupported content type '{content_type}' for {url}")
+
+            declared_length = response.headers.get('content-length', '')
+            if not truncate and declared_length.isdigit() and int(declared_length) > max_bytes:
+                raise FetchError(f"Response too large ({declared_length} bytes, limit {max_bytes}) for {url}")
+
+            encoding = charset_from_content_type(content_type)
+            chunks = []
+            total = 0
+            head = b''
+            complete = True
+            async for chunk in response.aiter_bytes(CHUNK_SIZE):
+                total += len(chunk)
+                if total > max_bytes:
+                    if not truncate:
+                        raise FetchError(f"Response exceeded {max_bytes} bytes for {url}")
+                    chunks.append(chunk[:max_bytes - (total - len(chunk))])
+                    complete = False
+                    break
+                chunks.append(chunk)
+
+                # Sniff the charset from the first few KB as they arrive
+                if encoding is None and len(head) < CHARSET_SNIFF_BYTES:
+                    head += chunk[:CHARSET_SNIFF_BYTES - len(head)]
+                    encoding = sniff_charset(head)
+
+            content = b''.join(chunks)
+            if response.status_code == 206:
+                # Partial response to a Range request: complete only if the range covered the whole file
+                total_size = response.headers.get('content-range', '').rpartition('/')[2]
+                complete = complete and total_size.isdigit() and int(total_size) == len(content)
+
+            return {
+                'url': str(response.url),
+                'status_code': response.status_code,
+                'headers': response.headers,
+                'content_type': content_type,
+                'encoding': encoding,
+                'content': content,
+                'complete': complete
+            }
+    except httpx.HTTPStatusError as e:
+        status = e.response.status_code
+        raise FetchError(
+            f"HTTP {status} for {url}",
+            retryable=status >= 500 or status == 429,
+            retry_after=_parse_retry_after(e.response.headers.get('retry-after'))
+        ) from e
+    except httpx.TransportError as e:
+        # Timeouts, connection resets, DNS hiccups
+        raise FetchError(f"{type(e).__name__} fetching {url}: {e}", retryable=True) from e
+    except httpx.HTTPError as e:
+        raise FetchError(f"{type(e).__name__} fetching {url}: {e}") from e
+
+
+async def fetch_url(
+    url: str,
+    allowed_types: Tuple[str, ...] = HTML_CONTENT_TYPES,
+    max_bytes: int = MAX_PAGE_BYTES,
+    timeout: float = 15,
+    headers: Optional[Dict[str, str]] = None,
+    truncate: bool = False
+) -> Dict:
+    """Fetch a URL through the per-host scheduler (timeout is the default before the host is profiled)"""
+    return await host_scheduler.run(
+        url,
+        lambda host_timeout: _fetch_once(url, allowed_types, max_bytes, host_timeout, headers, truncate),
+        default_timeout=timeout
+    )
+
+
+async def fetch_page(url: str, timeout: float = 15, headers: Optional[Dict[str, str]] = None) -> Dict:
+    """Fetch an HTML page with the page size cap"""
+    return await fetch_url(url, HTML_CONTENT_TYPES, MAX_PAGE_BYTES, timeout, headers)
+
+
+async def fetch_image(url: str, timeout: float = 10) -> Dict:
+    """Fetch an image with the image size cap"""
+    return await fetch_url(url, IMAGE_CONTENT_TYPES, MAX_IMAGE_BYTES, timeout)
+
+
+async def fetch_image_head(url: str, max_bytes: int, timeout: float = 10) -> Dict:
+    """
+    Fetch only the first max_bytes of an image (Range request, truncated if the server ignores it).
+    Small images arrive whole, in which case 'complete' is True and the content can be stored directly.
+    """
+    return await fetch_url(url, IMAGE_CONTENT_TYPES, max_bytes, timeout, {'Range': f'bytes=0-{max_bytes - 1}'}, truncate=True)
@@ -0,0 +1,126 @@
+"""SimHash fingerprints for near-duplicate source detection"""
+import re
+import hashlib
+import unicodedata
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+FINGERPRINT_BITS = 64
+# 4 bands of 16 bits: two fingerprints within Hamming distance 3 share at least one band exactly
+BAND_COUNT = 4
+BAND_BITS = FINGERPRINT_BITS // BAND_COUNT
+MAX_DUPLICATE_DISTANCE = 3
+SHINGLE_SIZE = 3
+# Very short texts ("Bitcoin hits $100k") collide too easily to be fingerprinted
+MIN_FINGERPRINT_WORDS = 40
+
+_TAG_PATTERN = re.compile(r'<[^>]+>')
+_WORD_PATTERN = re.compile(r'\w+')
+
+
+def normalize_text(text: str) -> List[str]:
+    """Strip markup and punctuation, fold case and width; return the word list"""
+    text = _TAG_PATTERN.sub(' ', text)
+    text = unicodedata.normalize('NFKC', text).lower()
+    return _WORD_PATTERN.findall(text)
+
+
+def _hash64(value: str) -> int:
+    """Stable 64-bit hash (the builtin hash() is salted per process)"""
+    return int.from_bytes(hashlib.blake2b(value.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+def simhash(words: List[str]) -> int:
+    """64-bit SimHash over word shingles, weighted by shingle frequency"""
+    if len(words) >= SHINGLE_SIZE:
+        shingles = Counter(' '.join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1))
+    else:
+        shingles = Counter(words)
+
+    weights = [0] * FINGERPRINT_BITS
+    for shingle, count in shingles.items():
+        h = _hash64(shingle)
+        for bit in range(FINGERPRINT_BITS):
+            if h >> bit & 1:
+                weights[bit] += count
+            else:
+                weights[bit] -= count
+
+    fingerprint = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+def compute_fingerprint(text: str) -> Optional[int]:
+    """Fingerprint of a source text, or None when it is too short to compare"""
+    words = normalize_text(text or '')
+    if len(words) < MIN_FINGERPRINT_WORDS:
+        return None
+    return simhash(words)
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin(a ^ b).count('1')
+
+
+def fingerprint_bands(fingerprint: int) -> List[int]:
+    """Band keys (band index in the high bits) for the multikey lookup index"""
+    mask = (1 << BAND_BITS) - 1
+    return [(band << BAND_BITS) | (fingerprint >> (band * BAND_BITS) & mask) for band in range(BAND_COUNT)]
+
+
+def _to_int64(value: int) -> int:
+    """Mongo stores signed 64-bit integers"""
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+def _from_int64(value: int) -> int:
+    return value + (1 << 64) if value < 0 else value
+
+
+class FingerprintIndex:
+    """
+    Near-duplicate index over source texts of projects, news_articles and kol_posts.
+    Lookups hit the multikey index on bands, so only fingerprints sharing a 16-bit band
+    are compared - milliseconds even with tens of thousands of documents.
+    """
+
+    def __init__(self, db, max_distance: int = MAX_DUPLICATE_DISTANCE):
+        self.db = db
+        self.max_distance = max_distance
+
+    async def find_near_duplicate(self, collection: str, fingerprint: Optional[int]) -> Optional[Dict]:
+        """Closest indexed document in the collection within max_distance, or None"""
+        if fingerprint is None:
+            return None
+        candidates = self.db.fingerprints.find(
+            {"collection": collection, "bands": {"$in": fingerprint_bands(fingerprint)}},
+            {"_id": 0, "doc_id": 1, "simhash": 1}
+        )
+        best = None
+        async for candidate in candidates:
+            distance = hamming_distance(fingerprint, _from_int64(candidate['simhash']))
+            if distance <= self.max_distance and (best is None or distance < best['distance']):
+                best = {"collection": collection, "doc_id": candidate['doc_id'], "distance": distance}
+        return best
+
+    async def add(self, collection: str, doc_id: str, fingerprint: Optional[int]):
+        """Index a document's source fingerprint"""
+        if fingerprint is None:
+            return
+        await self.db.fingerprints.update_one(
+            {"collection": collection, "doc_id": doc_id},
+            {"$set": {
+                "simhash": _to_int64(fingerprint),
+                "bands": fingerprint_bands(fingerprint),
+                "created_at": datetime.now(timezone.utc)
+            }},
+            upsert=True
+        )
+
+    async def remove(self, collection: str, doc_id: str):
+        """Drop a deleted document from the index"""
+        await self.db.fingerprints.delete_one({"collection": collection, "doc_id": doc_id})
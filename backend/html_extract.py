@@ -0,0 +1,372 @@
+"""HTML helpers used by the scrapers in server.py"""
+import re
+import html
+from typing import Dict, List, Optional, Set, Tuple
+from urllib.parse import urljoin
+
+from bs4 import BeautifulSoup, CData, Comment, Doctype, NavigableString, ProcessingInstruction
+
+# Containers whose images are never part of the article body
+EXCLUDED_CLASS_TERMS = ('navigation', 'menu', 'footer', 'sidebar', 'widget', 'related')
+EXCLUDED_ID_TERMS = ('nav', 'menu', 'footer', 'sidebar', 'widget')
+EXCLUDED_TAGS = ('footer', 'nav')
+
+# Author/profile/avatar images (usually small)
+EXCLUDED_IMG_CLASS_TERMS = ('avatar', 'profile', 'author-image', 'author-profile')
+
+# Attributes that may carry the real image URL (lazy loaders put a placeholder in src)
+IMAGE_SRC_ATTRS = ('src', 'data-src', 'data-lazy-src', 'data-original')
+
+# Analytics beacons and spacer images that show up as <img> tags
+TRACKING_URL_PATTERN = re.compile(
+    r'(doubleclick\.net|google-analytics\.com|googletagmanager\.com|facebook\.com/tr|'
+    r'pixel\.wp\.com|/pixel[./?]|/beacon[./?]|spacer\.gif|1x1\.(gif|png)|/tr\?)',
+    re.IGNORECASE
+)
+# Largest declared width/height still treated as a tracking pixel
+TRACKING_PIXEL_MAX_SIZE = 2
+_SRCSET_WIDTH_PATTERN = re.compile(r'\s(\d+)w\s*(?:,|$)')
+
+
+def _is_excluded_container(tag) -> bool:
+    """Check a single element (not its ancestors) against the exclusion rules"""
+    if tag.name in EXCLUDED_TAGS:
+        return True
+
+    classes = tag.get('class')
+    if classes:
+        class_text = ' '.join(classes).lower()
+        if any(term in class_text for term in EXCLUDED_CLASS_TERMS):
+            return True
+
+    tag_id = tag.get('id')
+    if tag_id:
+        tag_id = tag_id.lower()
+        if any(term in tag_id for term in EXCLUDED_ID_TERMS):
+            return True
+
+    return False
+
+
+def build_excluded_regions(soup) -> Set[int]:
+    """
+    Compute, in a single traversal, the ids of every element that is or sits inside
+    a nav/menu/footer/sidebar/widget/related container.
+    find_all() yields elements in document order, so each parent is decided before its children.
+    """
+    excluded: Set[int] = set()
+    for tag in soup.find_all(True):
+        if id(tag.parent) in excluded or _is_excluded_container(tag):
+            excluded.add(id(tag))
+    return excluded
+
+
+def is_in_excluded_region(img, excluded: Set[int]) -> bool:
+    """O(1) check whether an image lives inside an excluded container"""
+    return id(img.parent) in excluded
+
+
+def get_image_source(img) -> Optional[str]:
+    """Return the first real (non data-URI) image URL of an <img>, or None"""
+    for attr in IMAGE_SRC_ATTRS:
+        value = (img.get(attr) or '').strip()
+        if value and not value.lower().startswith('data:'):
+            return value
+    return None
+
+
+def _parse_dimension(value) -> Optional[int]:
+    """Parse a width/height attribute like '1', '1px' or '100%'"""
+    if not value:
+        return None
+    match = re.match(r'\s*(\d+)\s*(px)?\s*$', str(value))
+    return int(match.group(1)) if match else None
+
+
+def is_tracking_pixel(img, src: str) -> bool:
+    """Detect 1x1 trackers and analytics beacons from attributes and URL alone"""
+    width = _parse_dimension(img.get('width'))
+    height = _parse_dimension(img.get('height'))
+    if width is not None and width <= TRACKING_PIXEL_MAX_SIZE:
+        return True
+    if height is not None and height <= TRACKING_PIXEL_MAX_SIZE:
+        return True
+    return bool(TRACKING_URL_PATTERN.search(src))
+
+
+def get_declared_size(img) -> Tuple[Optional[int], Optional[int]]:
+    """Pixel width/height from the tag's attributes, when declared"""
+    return _parse_dimension(img.get('width')), _parse_dimension(img.get('height'))
+
+
+def srcset_max_width(img) -> Optional[int]:
+    """Largest 'NNNw' descriptor in srcset/data-srcset, or None if there are no width descriptors"""
+    widths = [
+        int(match)
+        for attr in ('srcset', 'data-srcset')
+        for match in _SRCSET_WIDTH_PATTERN.findall(img.get(attr) or '')
+    ]
+    return max(widths) if widths else None
+
+
+def is_unwanted_image(img) -> bool:
+    """Author/profile/avatar images and short 'logo' alt texts"""
+    classes = img.get('class')
+    if classes:
+        img_class = ' '.join(classes).lower()
+        if any(term in img_class for term in EXCLUDED_IMG_CLASS_TERMS):
+            return True
+
+    # Short alt text with "logo" is usually a logo
+    alt_text = (img.get('alt') or '').lower()
+    if 'logo' in alt_text and len(alt_text) < 20:
+        return True
+
+    return False
+
+
+# Compact semantic markup: the only tags kept when storing/translating article HTML
+COMPACT_BLOCK_TAGS = ('h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'p', 'ul', 'ol', 'li', 'blockquote', 'pre', 'table', 'tr', 'td', 'th')
+COMPACT_INLINE_TAGS = {'strong': 'strong', 'b': 'strong', 'em': 'em', 'i': 'em', 'code': 'code'}
+# Dropped together with everything inside them
+COMPACT_DROP_TAGS = ('script', 'style', 'noscript', 'svg', 'iframe', 'form', 'button', 'input', 'select', 'textarea', 'template', 'canvas')
+# Containers that become a <p> when they hold loose text (figcaption, wrapper divs with text)
+COMPACT_TEXT_CONTAINERS = ('div', 'figcaption', 'section', 'article', 'main', 'header', 'aside', 'figure')
+
+_WHITESPACE_PATTERN = re.compile(r'\s+')
+_IMAGE_REF_PATTERN = re.compile(r'src="(img-\d+)"')
+
+
+def _compact_node(node, base_url: Optional[str], parts: List[str]):
+    """Append the compact markup of one node to parts"""
+    if isinstance(node, (Comment, Doctype, ProcessingInstruction)):
+        return
+    if isinstance(node, NavigableString):
+        text = _WHITESPACE_PATTERN.sub(' ', str(node))
+        if text.strip() or (parts and text == ' '):
+            parts.append(html.escape(text, quote=False))
+        return
+
+    name = node.name
+    if name in COMPACT_DROP_TAGS:
+        return
+
+    if name == 'img':
+        src = get_image_source(node)
+        if src and not is_tracking_pixel(node, src) and not is_unwanted_image(node):
+            if base_url:
+                src = urljoin(base_url, src)
+            alt = _WHITESPACE_PATTERN.sub(' ', node.get('alt') or '').strip()
+            parts.append(f'<img src="{html.escape(src)}" alt="{html.escape(alt)}">')
+        return
+
+    if name == 'br':
+        parts.append('<br>')
+        return
+
+    if name == 'a':
+        href = (node.get('href') or '').strip()
+        inner = _compact_children(node, base_url)
+        if not inner.strip():
+            return
+        if href and not href.startswith(('#', 'javascript:')):
+            if base_url:
+                href = urljoin(base_url, href)
+            parts.append(f'<a href="{html.escape(href)}">{inner}</a>')
+        else:
+            parts.append(inner)
+        return
+
+    inner = _compact_children(node, base_url)
+    if not inner.strip():
+        return
+
+    if name in COMPACT_BLOCK_TAGS:
+        parts.append(f'<{name}>{inner.strip()}</{name}>')
+    elif name in COMPACT_INLINE_TAGS:
+        tag = COMPACT_INLINE_TAGS[name]
+        parts.append(f'<{tag}>{inner}</{tag}>')
+    elif name in COMPACT_TEXT_CONTAINERS and not node.find(list(COMPACT_BLOCK_TAGS) + ['img']):
+        parts.append(f'<p>{inner.strip()}</p>')
+    else:
+        # Wrapper element - keep only its content
+        parts.append(inner)
+
+
+def _compact_children(node, base_url: Optional[str]) -> str:
+    parts: List[str] = []
+    for child in node.children:
+        _compact_node(child, base_url, parts)
+    return ''.join(parts)
+
+
+def compact_html(content, base_url: Optional[str] = None) -> str:
+    """
+    Reduce article HTML to minimal semantic markup: headings, paragraphs, lists, quotes,
+    tables, links and images, with no classes, styles, data attributes or wrapper divs.
+    Accepts an HTML string or a BeautifulSoup element; relative URLs are resolved against base_url.
+    """
+    if isinstance(content, str):
+        content = BeautifulSoup(content, 'html.parser')
+    parts: List[str] = []
+    _compact_node(content, base_url, parts)
+    compact = re.sub(r' {2,}', ' ', ''.join(parts))
+    # Block boundaries on their own lines keep the markup readable for editors and the LLM
+    compact = re.sub(r'(</(?:h[1-6]|p|ul|ol|li|blockquote|pre|table|tr)>|<img [^>]*>)\s*', r'\1\n', compact)
+    return re.sub(r' *\n *', '\n', compact).strip()
+
+
+# A closing tag of a real element, or a void element: "a<b and x>y" in plain text is neither
+_HTML_ELEMENT_PATTERN = re.compile(
+    r'</(?:html|body|article|section|main|div|span|p|h[1-6]|ul|ol|li|blockquote|pre|code|table|thead|tbody|tr|td|th|'
+    r'a|b|i|em|strong|u|s|sup|sub|figure|figcaption)\s*>|<(?:br|hr|img)\b[^<>]*>',
+    re.IGNORECASE
+)
+
+
+def looks_like_html(text: str) -> bool:
+    return bool(text) and bool(_HTML_ELEMENT_PATTERN.search(text))
+
+
+def compact_source(content: str) -> str:
+    """
+    compact_html for HTML input. Plain text (raw_text projects, pasted drafts) is returned
+    unchanged: compacting would collapse its paragraph breaks and parse stray '<' as tags.
+    """
+    return compact_html(content) if looks_like_html(content) else content
+
+
+def abbreviate_image_sources(compact: str) -> Tuple[str, Dict[str, str]]:
+    """Replace image URLs with short img-N refs before sending markup to the LLM"""
+    mapping: Dict[str, str] = {}
+    reverse: Dict[str, str] = {}
+
+    def replace(match):
+        src = match.group(1)
+        if src not in reverse:
+            ref = f"img-{len(reverse) + 1}"
+            reverse[src] = ref
+            mapping[ref] = html.unescape(src)
+        return f'<img src="{reverse[src]}"'
+
+    return re.sub(r'<img src="([^"]*)"', replace, compact), mapping
+
+
+def restore_image_sources(markup: str, mapping: Dict[str, str]) -> str:
+    """Put the original image URLs back after translation"""
+    if not mapping:
+        return markup
+    return _IMAGE_REF_PATTERN.sub(
+        lambda m: f'src="{html.escape(mapping[m.group(1)])}"' if m.group(1) in mapping else m.group(0),
+        markup
+    )
+
+
+# Class terms the KOL/news scrapers treat as article content regions
+CONTENT_CLASS_TERMS = ('content', 'article', 'post', 'entry')
+# Elements inside a content region that are never article text
+BOILERPLATE_CLASS_TERMS = ('cookie', 'consent', 'gdpr', 'share', 'social', 'newsletter', 'subscribe', 'related', 'comment', 'advert', 'promo')
+BOILERPLATE_LINE_PATTERN = re.compile(
+    r'^(share (this|on)\b|accept (all )?cookies|we use cookies|this (web)?site uses cookies|subscribe to|'
+    r'sign up for|follow us|read more$|tweet$|copy link$|share$|advertisement$)',
+    re.IGNORECASE
+)
+# Blocks whose text is emitted as one line
+TEXT_BLOCK_TAGS = ('p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'li', 'blockquote', 'pre', 'td', 'th', 'figcaption', 'dt', 'dd')
+# Containers that end the line before them, so loose text around them gets its own line too
+LINE_BREAK_TAGS = TEXT_BLOCK_TAGS + ('div', 'section', 'article', 'main', 'ul', 'ol', 'dl', 'table', 'tr', 'figure')
+
+
+def _has_content_class(classes) -> bool:
+    return bool(classes) and any(term in str(classes).lower() for term in CONTENT_CLASS_TERMS)
+
+
+def _is_boilerplate(tag) -> bool:
+    """Cookie banners, share widgets, newsletter boxes and the like"""
+    # Page-level containers carry theme classes like "social-enabled"; never drop them
+    if tag.name in ('html', 'body', 'main', 'article') or _has_content_class(tag.get('class')):
+        return False
+    names = list(tag.get('class') or [])
+    if tag.get('id'):
+        names.append(tag['id'])
+    return any(term in name.lower() for name in names for term in BOILERPLATE_CLASS_TERMS)
+
+
+def find_content_regions(soup) -> list:
+    """
+    Content containers (article/main/div with a content-like class), keeping only the
+    outermost ones so nested wrappers don't contribute the same text several times.
+    """
+    candidates = soup.find_all(['article', 'main', 'div'], class_=_has_content_class)
+    selected = set()
+    regions = []
+    for candidate in candidates:
+        # find_all is in document order, so any enclosing candidate was already seen
+        if any(id(parent) in selected for parent in candidate.parents):
+            continue
+        selected.add(id(candidate))
+        regions.append(candidate)
+    return regions
+
+
+def _text_blocks(region) -> List[str]:
+    """
+    Lines of a region in document order: each block's own text, plus loose text between
+    blocks (bare text in a <div>, <br>-separated lines) grouped under its nearest block.
+    """
+    blocks = []
+    line = []
+
+    def end_line():
+        if line:
+            blocks.append(' '.join(line))
+            line.clear()
+
+    def walk(node):
+        for child in node.children:
+            if isinstance(child, NavigableString):
+                # Plain text and CDATA only, as get_text() does (no comments, scripts or doctypes)
+                if type(child) in (NavigableString, CData) and child.strip():
+                    line.append(child.strip())
+            elif child.name == 'br':
+                end_line()
+            elif child.name in LINE_BREAK_TAGS:
+                end_line()
+                walk(child)
+                end_line()
+            else:
+                walk(child)
+
+    walk(region)
+    end_line()
+    return blocks
+
+
+def extract_main_text(soup) -> str:
+    """
+    Article text for LLM prompts: non-overlapping content regions, boilerplate removed,
+    one block per line and each repeated line kept only once.
+    """
+    for tag in soup.find_all(_is_boilerplate):
+        if not tag.decomposed:
+            tag.decompose()
+
+    regions = find_content_regions(soup)
+    if regions:
+        blocks = [text for region in regions for text in _text_blocks(region)]
+    else:
+        # Fallback to all paragraph text
+        blocks = [p.get_text(separator=' ', strip=True) for p in soup.find_all('p')]
+
+    lines = []
+    seen = set()
+    for text in blocks:
+        text = _WHITESPACE_PATTERN.sub(' ', text).strip()
+        if not text or BOILERPLATE_LINE_PATTERN.match(text):
+            continue
+        key = text.lower()
+        if key in seen:
+            continue
+        seen.add(key)
+        lines.append(text)
+    return '\n'.join(lines)
@@ -0,0 +1,118 @@
+"""Cheap image prefilter: drop tracking pixels and icons before full download and slug translation"""
+import os
+import asyncio
+import logging
+from typing import Dict, List, Optional, Tuple
+
+from PIL import ImageFile
+
+from fetcher import fetch_image_head
+from html_extract import TRACKING_PIXEL_MAX_SIZE
+
+# Images whose width AND height are both below this are icons, badges or avatars
+IMAGE_MIN_DIMENSION = int(os.environ.get('IMAGE_MIN_DIMENSION', 100))
+# Bytes read to find the dimensions; JPEG SOF usually sits within the first few KB (after EXIF)
+IMAGE_PROBE_BYTES = int(os.environ.get('IMAGE_PROBE_BYTES', 32 * 1024))
+IMAGE_PROBE_CONCURRENCY = int(os.environ.get('IMAGE_PROBE_CONCURRENCY', 8))
+IMAGE_PROBE_TIMEOUT = float(os.environ.get('IMAGE_PROBE_TIMEOUT', 8))
+
+
+def is_too_small(width: Optional[int], height: Optional[int]) -> bool:
+    """Tracking pixels (either side tiny) and icons (both sides small)"""
+    known = [size for size in (width, height) if size is not None]
+    if not known:
+        return False
+    if min(known) <= TRACKING_PIXEL_MAX_SIZE:
+        return True
+    return all(size < IMAGE_MIN_DIMENSION for size in known)
+
+
+def dimensions_from_head(head: bytes) -> Optional[Tuple[str, Optional[int], Optional[int]]]:
+    """
+    (format, width, height) parsed from the first bytes of an image, or None if they aren't an image.
+    SVG has no intrinsic pixel size and comes back as ('svg', None, None).
+    """
+    stripped = head[:1024].lstrip().lower()
+    if stripped.startswith((b'<?xml', b'<svg')) and b'<svg' in stripped:
+        return 'svg', None, None
+
+    parser = ImageFile.Parser()
+    try:
+        parser.feed(head)
+    except Exception:
+        return None
+    if parser.image is None:
+        # Header not complete within the probe bytes: unknown, not invalid
+        return ('unknown', None, None) if _looks_like_image(head) else None
+    width, height = parser.image.size
+    return (parser.image.format or 'unknown').lower(), width, height
+
+
+def _looks_like_image(head: bytes) -> bool:
+    return head.startswith((b'\xff\xd8\xff', b'\x89PNG', b'GIF8', b'RIFF', b'II*\x00', b'MM\x00*')) or head[4:8] == b'ftyp'
+
+
+def declared_decision(candidate: Dict) -> Optional[bool]:
+    """
+    Decide from HTML attributes alone: True = keep, False = drop, None = needs a probe.
+    srcset width descriptors describe the real image, so a large one settles it.
+    """
+    width, height = candidate.get('declared_width'), candidate.get('declared_height')
+    if is_too_small(width, height):
+        return False
+    srcset_width = candidate.get('srcset_width')
+    if srcset_width and srcset_width >= IMAGE_MIN_DIMENSION:
+        return True
+    if width is not None and height is not None:
+        return True
+    return None
+
+
+async def probe_image(url: str) -> Dict:
+    """
+    Read the first IMAGE_PROBE_BYTES of an image. Returns keep/format/width/height, plus the
+    full content when the whole image fit in the probe (so it isn't downloaded twice).
+    Network failures keep the image; the full download decides then.
+    """
+    try:
+        head = await asyncio.wait_for(fetch_image_head(url, IMAGE_PROBE_BYTES), IMAGE_PROBE_TIMEOUT)
+    except Exception as e:
+        logging.debug(f"Probe failed for {url}: {e}")
+        return {'keep': True}
+
+    dimensions = dimensions_from_head(head['content'])
+    if dimensions is None:
+        return {'keep': False, 'reason': 'not an image'}
+    image_format, width, height = dimensions
+    if is_too_small(width, height):
+        return {'keep': False, 'reason': f'{width}x{height}'}
+
+    result = {'keep': True, 'format': image_format, 'width': width, 'height': height}
+    if head.get('complete'):
+        result['content'] = head['content']
+    return result
+
+
+async def prefilter_images(candidates: List[Dict]) -> List[Dict]:
+    """
+    Keep only images worth downloading. Candidates carry 'url' and optional declared_width,
+    declared_height and srcset_width; kept ones gain probe results ('content' when fully fetched).
+    """
+    semaphore = asyncio.Semaphore(IMAGE_PROBE_CONCURRENCY)
+
+    async def _decide(candidate: Dict) -> Optional[Dict]:
+        decision = declared_decision(candidate)
+        if decision is not None:
+            return candidate if decision else None
+        async with semaphore:
+            probe = await probe_image(candidate['url'])
+        if not probe.pop('keep'):
+            logging.info(f"🔍 Dropped image before download ({probe.get('reason')}): {candidate['url']}")
+            return None
+        return {**candidate, **{f"probe_{key}": value for key, value in probe.items()}}
+
+    results = await asyncio.gather(*(_decide(candidate) for candidate in candidates))
+    kept = [result for result in results if result is not None]
+    if len(kept) < len(candidates):
+        logging.info(f"🔍 Image prefilter kept {len(kept)}/{len(candidates)} images")
+    return kept
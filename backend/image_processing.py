@@ -0,0 +1,232 @@
+"""Image validation, metadata stripping and responsive WebP/AVIF variants, run in a process pool"""
+import io
+import os
+import asyncio
+import functools
+import logging
+import warnings
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional
+
+from PIL import Image, ImageOps, UnidentifiedImageError, features
+
+# Widths generated for srcset; only widths smaller than the original are produced
+VARIANT_WIDTHS = tuple(int(w) for w in os.environ.get('IMAGE_VARIANT_WIDTHS', '480,960,1600').split(','))
+WEBP_QUALITY = int(os.environ.get('IMAGE_WEBP_QUALITY', 80))
+AVIF_QUALITY = int(os.environ.get('IMAGE_AVIF_QUALITY', 60))
+IMAGE_PROCESS_WORKERS = int(os.environ.get('IMAGE_PROCESS_WORKERS', min(4, os.cpu_count() or 1)))
+# Pixel cap against decompression bombs (PIL warns above this and fails at twice it)
+MAX_IMAGE_PIXELS = int(os.environ.get('IMAGE_MAX_PIXELS', 50_000_000))
+# SVGs are parsed in full, so they get a byte cap instead
+MAX_SVG_BYTES = int(os.environ.get('IMAGE_MAX_SVG_BYTES', 2 * 1024 * 1024))
+
+SVG_NAMESPACE = 'http://www.w3.org/2000/svg'
+XLINK_NAMESPACE = 'http://www.w3.org/1999/xlink'
+XHTML_NAMESPACE = 'http://www.w3.org/1999/xhtml'
+# Elements that run script or embed active documents; removed with their content
+SVG_DROP_ELEMENTS = ('script', 'foreignobject', 'iframe', 'embed', 'object', 'handler', 'listener')
+# Animations can rewrite an href to javascript: after sanitising
+SVG_ANIMATION_ELEMENTS = ('set', 'animate', 'animatetransform', 'animatemotion')
+# Only in-document references and embedded raster images survive in href values
+_SVG_SAFE_HREF_PREFIXES = ('#', 'data:image/png', 'data:image/jpeg', 'data:image/gif', 'data:image/webp')
+
+ET.register_namespace('', SVG_NAMESPACE)
+ET.register_namespace('xlink', XLINK_NAMESPACE)
+
+# PIL format name -> store extension
+FORMAT_EXTENSIONS = {'JPEG': 'jpg', 'PNG': 'png', 'GIF': 'gif', 'WEBP': 'webp', 'AVIF': 'avif'}
+EXIF_ORIENTATION_TAG = 0x0112
+
+
+class ImageProcessingError(Exception):
+    """Raised when downloaded bytes are not a usable image (HTML error pages, truncated files, bombs)"""
+
+
+def _encode(image: Image.Image, image_format: str, **params) -> bytes:
+    buffer = io.BytesIO()
+    image.save(buffer, format=image_format, **params)
+    return buffer.getvalue()
+
+
+def _is_svg(content: bytes) -> bool:
+    head = content[:1024].lstrip().lower()
+    return head.startswith((b'<?xml', b'<svg')) and b'<svg' in head
+
+
+def _split_name(name: str):
+    """(namespace, lowercase local name) of an ElementTree tag or attribute name"""
+    if name.startswith('{'):
+        namespace, local = name[1:].split('}', 1)
+        return namespace, local.lower()
+    return None, name.lower()
+
+
+def _is_unsafe_svg_element(element) -> bool:
+    namespace, local = _split_name(element.tag)
+    if namespace == XHTML_NAMESPACE or local in SVG_DROP_ELEMENTS:
+        return True
+    if local in SVG_ANIMATION_ELEMENTS:
+        target = element.get('attributeName', '').lower()
+        return target.endswith('href') or target.startswith('on')
+    return False
+
+
+def sanitize_svg(content: bytes) -> bytes:
+    """
+    Strip everything that can run script from an SVG: <script>, <foreignObject> and other
+    embedding elements, XHTML content, on* handlers, href animations and hrefs other than
+    fragments or raster data URIs. Comments and processing instructions are dropped by the parser.
+    Raises ImageProcessingError for oversized or unparsable SVGs and any entity declaration.
+    """
+    if len(content) > MAX_SVG_BYTES:
+        raise ImageProcessingError(f"SVG larger than {MAX_SVG_BYTES} bytes")
+    if b'<!entity' in content.lower():
+        # Entity expansion is how XML bombs work; real-world SVGs don't need it
+        raise ImageProcessingError("SVG declares entities")
+    try:
+        root = ET.fromstring(content)
+    except ET.ParseError as e:
+        raise ImageProcessingError(f"Not a valid SVG: {e}")
+    if _split_name(root.tag)[1] != 'svg':
+        raise ImageProcessingError("Not an SVG document")
+
+    for element in root.iter():
+        for child in [child for child in element if _is_unsafe_svg_element(child)]:
+            element.remove(child)
+        for name in list(element.attrib):
+            local = _split_name(name)[1]
+            if local.startswith('on'):
+                del element.attrib[name]
+            elif local == 'href':
+                # Browsers ignore whitespace and control characters in the scheme
+                value = ''.join(element.attrib[name].split()).lower()
+                if not value.startswith(_SVG_SAFE_HREF_PREFIXES):
+                    del element.attrib[name]
+    return ET.tostring(root, encoding='utf-8')
+
+
+def _strip_metadata(image: Image.Image, image_format: str, oriented: bool) -> bytes:
+    """Re-encode without EXIF/XMP/text chunks, keeping the ICC profile for correct colours"""
+    params = {}
+    icc_profile = image.info.get('icc_profile')
+    if icc_profile:
+        params['icc_profile'] = icc_profile
+    if image_format == 'JPEG':
+        # Reuse the source quantisation tables so the re-encode is visually lossless
+        params['quality'] = 'keep' if not oriented else 92
+        if oriented and image.mode not in ('RGB', 'L', 'CMYK'):
+            image = image.convert('RGB')
+    elif image_format == 'WEBP':
+        params['quality'] = 90
+    elif image_format == 'PNG':
+        params['optimize'] = True
+    return _encode(image, image_format, **params)
+
+
+def _variant_source(image: Image.Image) -> Image.Image:
+    """RGB/RGBA copy suitable for WebP/AVIF encoding"""
+    has_alpha = image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info)
+    return image.convert('RGBA' if has_alpha else 'RGB')
+
+
+def process_image(content: bytes, avif: Optional[bool] = None, make_variants: bool = True) -> Dict:
+    """
+    Validate an image and prepare what gets stored. Runs in a worker process.
+    Returns the metadata-free original plus resized WebP (and AVIF when supported) variants.
+    Raises ImageProcessingError for anything that isn't a decodable raster image or a safe-to-clean SVG.
+    """
+    if _is_svg(content):
+        # Vector images have nothing to resize; they are stored sanitised
+        return {'format': 'svg', 'width': None, 'height': None, 'original': sanitize_svg(content), 'variants': []}
+
+    if avif is None:
+        avif = features.check('avif')
+
+    Image.MAX_IMAGE_PIXELS = MAX_IMAGE_PIXELS
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter('error', Image.DecompressionBombWarning)
+            # verify() catches truncated/corrupt files but leaves the image unusable, so reopen after
+            with Image.open(io.BytesIO(content)) as probe:
+                probe.verify()
+            image = Image.open(io.BytesIO(content))
+            image.load()
+    except (UnidentifiedImageError, Image.DecompressionBombError, Image.DecompressionBombWarning, OSError, SyntaxError) as e:
+        raise ImageProcessingError(f"Not a valid image: {e}")
+
+    image_format = image.format
+    if image_format not in FORMAT_EXTENSIONS:
+        raise ImageProcessingError(f"Unsupported image format: {image_format}")
+
+    # Animated GIF/WebP: keep the original bytes, resizing would drop the animation
+    if getattr(image, 'n_frames', 1) > 1:
+        return {
+            'format': FORMAT_EXTENSIONS[image_format],
+            'width': image.width,
+            'height': image.height,
+            'original': content,
+            'variants': []
+        }
+
+    # Apply EXIF rotation before the EXIF block is dropped
+    oriented = image.getexif().get(EXIF_ORIENTATION_TAG, 1) != 1
+    if oriented:
+        image = ImageOps.exif_transpose(image)
+
+    original = _strip_metadata(image, image_format, oriented)
+
+    source = _variant_source(image) if make_variants else None
+    widths = [w for w in VARIANT_WIDTHS if w < image.width] + [image.width] if make_variants else []
+    variants: List[Dict] = []
+    for width in widths:
+        height = max(1, round(image.height * width / image.width))
+        resized = source if width == image.width else source.resize((width, height), Image.LANCZOS)
+        variants.append({
+            'width': width, 'height': height, 'format': 'webp',
+            'content': _encode(resized, 'WEBP', quality=WEBP_QUALITY, method=4)
+        })
+        if avif:
+            variants.append({
+                'width': width, 'height': height, 'format': 'avif',
+                'content': _encode(resized, 'AVIF', quality=AVIF_QUALITY)
+            })
+
+    return {
+        'format': FORMAT_EXTENSIONS[image_format],
+        'width': image.width,
+        'height': image.height,
+        'original': original,
+        'variants': variants
+    }
+
+
+class ImageProcessor:
+    """Runs process_image in a process pool so decoding/encoding never blocks the event loop"""
+
+    def __init__(self, max_workers: int = IMAGE_PROCESS_WORKERS):
+        self.max_workers = max_workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    async def process(self, content: bytes, make_variants: bool = True) -> Dict:
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(
+                self._get_executor(), functools.partial(process_image, content, make_variants=make_variants)
+            )
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM on a huge image); start a fresh pool for the next call
+            logging.error("❌ Image process pool broke, restarting it")
+            self._executor = None
+            raise ImageProcessingError("Image processing worker crashed")
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,187 @@
+"""Content-addressed image store shared by all projects"""
+import os
+import gzip
+import uuid
+import hashlib
+import logging
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+import aiofiles
+from pymongo.errors import DuplicateKeyError
+
+# Stored blobs live under <images_dir>/store/ab/cd/<sha256>.<ext>
+STORE_DIR_NAME = 'store'
+IMAGE_EXTENSIONS = ('jpg', 'png', 'gif', 'webp', 'avif', 'svg')
+DEFAULT_IMAGE_EXTENSION = 'jpg'
+PRECOMPRESS_EXTENSIONS = ('svg',)
+
+
+def detect_image_extension(content: bytes) -> Optional[str]:
+    """File extension from the image's magic bytes, or None if unrecognised"""
+    if content.startswith(b'\xff\xd8\xff'):
+        return 'jpg'
+    if content.startswith(b'\x89PNG\r\n\x1a\n'):
+        return 'png'
+    if content.startswith((b'GIF87a', b'GIF89a')):
+        return 'gif'
+    if content[:4] == b'RIFF' and content[8:12] == b'WEBP':
+        return 'webp'
+    if content[4:8] == b'ftyp' and content[8:12] in (b'avif', b'avis'):
+        return 'avif'
+    head = content[:1024].lstrip().lower()
+    if head.startswith((b'<?xml', b'<svg')) and b'<svg' in head:
+        return 'svg'
+    return None
+
+
+def extension_from_url(url: str) -> Optional[str]:
+    suffix = Path(urlparse(url).path).suffix.lower().lstrip('.')
+    if suffix == 'jpeg':
+        suffix = 'jpg'
+    return suffix if suffix in IMAGE_EXTENSIONS else None
+
+
+def content_hash(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+def blob_relative_path(sha256: str, ext: str) -> str:
+    """Two levels of hash-prefix sharding keep directory sizes small"""
+    return f"{STORE_DIR_NAME}/{sha256[:2]}/{sha256[2:4]}/{sha256}.{ext}"
+
+
+async def write_blob(images_dir: Path, content: bytes, ext: str, overwrite: bool = False) -> Dict:
+    """
+    Write content under its hash unless an identical blob already exists (or overwrite is set).
+    Writes go to a temp file renamed into place, so readers never see partial files.
+    """
+    sha256 = content_hash(content)
+    relative_path = blob_relative_path(sha256, ext)
+    path = images_dir / relative_path
+    created = False
+    if overwrite or not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex[:8]}.tmp")
+        async with aiofiles.open(temp_path, 'wb') as f:
+            await f.write(content)
+        os.replace(temp_path, path)
+        created = True
+        if ext in PRECOMPRESS_EXTENSIONS:
+            # Text-based images get a .gz sibling served to clients that accept gzip
+            compressed_path = path.with_name(path.name + '.gz')
+            async with aiofiles.open(compressed_path, 'wb') as f:
+                await f.write(gzip.compress(content, compresslevel=9, mtime=0))
+    return {'sha256': sha256, 'ext': ext, 'size': len(content), 'relative_path': relative_path, 'created': created}
+
+
+class ImageStore:
+    """
+    Images stored once per distinct content (SHA-256), with per-project references.
+    image_objects: one document per blob with a refcount of referencing projects.
+    image_refs: the per-project manifest, one document per (project, blob).
+    """
+
+    def __init__(self, db, images_dir: Path, url_prefix: str = '/static/images'):
+        self.db = db
+        self.images_dir = images_dir
+        self.url_prefix = url_prefix
+
+    def url_for(self, relative_path: str) -> str:
+        return f"{self.url_prefix}/{relative_path}"
+
+    def path_for(self, relative_path: str) -> Path:
+        return self.images_dir / relative_path
+
+    def path_from_url(self, url: Optional[str]) -> Optional[Path]:
+        """Disk path of a /static/images/... URL, or None if it isn't a local image that exists"""
+        prefix = f"{self.url_prefix}/"
+        if not url or not url.startswith(prefix):
+            return None
+        root = self.images_dir.resolve()
+        path = (root / url[len(prefix):]).resolve()
+        if root not in path.parents or not path.is_file():
+            return None
+        return path
+
+    async def put(self, content: bytes, source_url: Optional[str] = None) -> Dict:
+        """Store an image (no-op on disk if already present) and record where it came from"""
+        ext = detect_image_extension(content) or (source_url and extension_from_url(source_url)) or DEFAULT_IMAGE_EXTENSION
+        blob = await write_blob(self.images_dir, content, ext)
+
+        update = {
+            "$setOnInsert": {
+                "sha256": blob['sha256'],
+                "ext": ext,
+                "size": blob['size'],
+                "path": blob['relative_path'],
+                "refcount": 0,
+                "created_at": datetime.now(timezone.utc)
+            },
+            # Keeps the sweeper off blobs that are about to be referenced again
+            "$set": {"last_seen_at": datetime.now(timezone.utc)}
+        }
+        if source_url:
+            update["$addToSet"] = {"source_urls": source_url}
+        try:
+            result = await self.db.image_objects.update_one({"sha256": blob['sha256']}, update, upsert=True)
+        except DuplicateKeyError:
+            # Concurrent first insert of the same blob; the other upsert won, just record the URL
+            if source_url:
+                await self.db.image_objects.update_one({"sha256": blob['sha256']}, {"$addToSet": {"source_urls": source_url}})
+        else:
+            if result.upserted_id is not None and not blob['created']:
+                # The sweeper may have just deleted the old record and is removing the file we found
+                await write_blob(self.images_dir, content, ext, overwrite=True)
+
+        if blob['created']:
+            logging.info(f"💾 Stored new image {blob['relative_path']} ({blob['size']} bytes)")
+        blob['url'] = self.url_for(blob['relative_path'])
+        return blob
+
+    async def add_reference(self, project_id: str, sha256: str, source_url: Optional[str] = None):
+        """Add a blob to a project's manifest; the blob refcount counts projects, not images"""
+        try:
+            result = await self.db.image_refs.update_one(
+                {"project_id": project_id, "sha256": sha256},
+                {
+                    "$setOnInsert": {
+                        "project_id": project_id,
+                        "sha256": sha256,
+                        "source_url": source_url,
+                        "created_at": datetime.now(timezone.utc)
+                    },
+                    # Lets a refresh release only the references it didn't make again
+                    "$set": {"referenced_at": datetime.now(timezone.utc)}
+                },
+                upsert=True
+            )
+        except DuplicateKeyError:
+            return
+        if result.upserted_id is not None:
+            await self.db.image_objects.update_one({"sha256": sha256}, {"$inc": {"refcount": 1}})
+
+    async def release_project(self, project_id: str, referenced_before: Optional[datetime] = None) -> int:
+        """
+        Drop a project's manifest (or, with referenced_before, the entries not referenced
+        again since then) and decrement the refcount of each blob it referenced.
+        Blobs left at refcount 0 are deleted later by the sweeper, after its grace period.
+        """
+        query = {"project_id": project_id}
+        if referenced_before is not None:
+            # References written before referenced_at existed count as old
+            query["$or"] = [{"referenced_at": {"$lt": referenced_before}}, {"referenced_at": {"$exists": False}}]
+        released = 0
+        async for ref in self.db.image_refs.find(query, {"_id": 0, "sha256": 1}):
+            # Delete first so a concurrent release of the same ref can't decrement twice
+            result = await self.db.image_refs.delete_one({**query, "sha256": ref['sha256']})
+            if result.deleted_count:
+                await self.db.image_objects.update_one({"sha256": ref['sha256']}, {"$inc": {"refcount": -1}})
+                released += 1
+        return released
+
+    async def find_by_source_url(self, source_url: str) -> Optional[Dict]:
+        """Stored blob previously downloaded from this URL, if any"""
+        return await self.db.image_objects.find_one({"source_urls": source_url}, {"_id": 0, "source_urls": 0})
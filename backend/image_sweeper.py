@@ -0,0 +1,217 @@
+"""Reconcile stored images on disk against Mongo and reclaim what nothing references"""
+import os
+import re
+import time
+import uuid
+import shutil
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+from image_store import ImageStore, STORE_DIR_NAME
+
+# Files younger than this are never touched: a scrape may have written them but not yet referenced them
+IMAGE_SWEEP_GRACE = int(os.environ.get('IMAGE_SWEEP_GRACE', 24 * 3600))
+IMAGE_SWEEP_INTERVAL = int(os.environ.get('IMAGE_SWEEP_INTERVAL', 6 * 3600))
+# Store files checked against image_objects per query
+SWEEP_BATCH_SIZE = 500
+
+_BLOB_NAME_PATTERN = re.compile(r'^([0-9a-f]{64})\.\w+(\.gz)?$')
+_TEMP_NAME_PATTERN = re.compile(r'^\..+\.tmp$')
+
+
+def _remove_file(path: Path) -> int:
+    """Delete a file and return the bytes reclaimed (0 if it was already gone)"""
+    try:
+        size = path.stat().st_size
+        path.unlink()
+        return size
+    except FileNotFoundError:
+        return 0
+
+
+def _stash_file(path: Path) -> Optional[Path]:
+    """
+    Move a blob aside under a temp name (a later sweep removes it if we crash).
+    Readers stop seeing it at once, while it can still be put back.
+    """
+    stash = path.with_name(f".{path.name}.{uuid.uuid4().hex[:8]}.tmp")
+    try:
+        os.rename(path, stash)
+    except FileNotFoundError:
+        return None
+    return stash
+
+
+def _restore_file(stash: Path, path: Path):
+    """Put a stashed blob back; blobs are content-addressed, so replacing a fresh copy is harmless"""
+    os.replace(stash, path)
+
+
+def _remove_tree(path: Path) -> int:
+    size = sum(f.stat().st_size for f in path.rglob('*') if f.is_file())
+    shutil.rmtree(path, ignore_errors=True)
+    return size
+
+
+def scan_store(store_dir: Path, cutoff: float) -> Dict[str, List[Path]]:
+    """
+    Files in the store older than cutoff (mtime), grouped by blob hash.
+    Stale temp files from interrupted writes are grouped under ''.
+    """
+    files: Dict[str, List[Path]] = {}
+    if not store_dir.is_dir():
+        return files
+    for path in store_dir.rglob('*'):
+        if not path.is_file() or path.stat().st_mtime > cutoff:
+            continue
+        if _TEMP_NAME_PATTERN.match(path.name):
+            files.setdefault('', []).append(path)
+            continue
+        match = _BLOB_NAME_PATTERN.match(path.name)
+        if match:
+            files.setdefault(match.group(1), []).append(path)
+    return files
+
+
+def scan_legacy_dirs(images_dir: Path, cutoff: float) -> Dict[str, Path]:
+    """Old per-project folders (static/images/<project_id>) not modified since cutoff"""
+    return {
+        path.name: path
+        for path in images_dir.iterdir()
+        if path.is_dir() and path.name != STORE_DIR_NAME and path.stat().st_mtime <= cutoff
+    }
+
+
+class ImageSweeper:
+    """
+    Reclaims image storage in four passes:
+    manifests of projects that no longer exist, blobs nobody references, store files
+    with no image_objects record, and legacy project folders without a project.
+    Everything newer than the grace period is left alone.
+    """
+
+    def __init__(self, db, image_store: ImageStore, grace_seconds: int = IMAGE_SWEEP_GRACE):
+        self.db = db
+        self.image_store = image_store
+        self.grace_seconds = grace_seconds
+
+    async def _existing_project_ids(self, project_ids: Set[str]) -> Set[str]:
+        existing = set()
+        async for project in self.db.projects.find({"id": {"$in": list(project_ids)}}, {"_id": 0, "id": 1}):
+            existing.add(project['id'])
+        return existing
+
+    async def _release_dangling_refs(self, cutoff: datetime) -> int:
+        """Manifests left by deleted projects or creations that failed after downloading images"""
+        project_ids = set(await self.db.image_refs.distinct("project_id", {"created_at": {"$lt": cutoff}}))
+        if not project_ids:
+            return 0
+        released = 0
+        for project_id in project_ids - await self._existing_project_ids(project_ids):
+            released += await self.image_store.release_project(project_id)
+        return released
+
+    async def _remove_unreferenced_blobs(self, cutoff: datetime) -> Dict:
+        removed = 0
+        reclaimed = 0
+        cursor = self.db.image_objects.find(
+            {"refcount": {"$lte": 0}, "last_seen_at": {"$lt": cutoff}},
+            {"_id": 0, "sha256": 1, "path": 1}
+        )
+        async for blob in cursor:
+            # Files go aside before the record is deleted: a put() that lands after the delete
+            # inserts a fresh record and rewrites the file, one that lands before it wins and
+            # the files are put back
+            path = self.image_store.path_for(blob['path'])
+            paths = [path, path.with_name(path.name + '.gz')]
+            stashed = [(await asyncio.to_thread(_stash_file, p), p) for p in paths]
+            stashed = [(stash, p) for stash, p in stashed if stash is not None]
+
+            # Conditional delete: a scrape may have stored or referenced the blob since the query ran
+            result = await self.db.image_objects.delete_one(
+                {"sha256": blob['sha256'], "refcount": {"$lte": 0}, "last_seen_at": {"$lt": cutoff}}
+            )
+            if not result.deleted_count:
+                for stash, original in stashed:
+                    await asyncio.to_thread(_restore_file, stash, original)
+                continue
+            for stash, _ in stashed:
+                reclaimed += await asyncio.to_thread(_remove_file, stash)
+            removed += 1
+        return {"blobs_removed": removed, "bytes_reclaimed": reclaimed}
+
+    async def _remove_untracked_files(self, cutoff: float) -> Dict:
+        """Store files whose image_objects record never got written (crash between write and upsert)"""
+        files = await asyncio.to_thread(scan_store, self.image_store.images_dir / STORE_DIR_NAME, cutoff)
+        stale_temp = files.pop('', [])
+        removed = len(stale_temp)
+        reclaimed = 0
+        for path in stale_temp:
+            reclaimed += await asyncio.to_thread(_remove_file, path)
+
+        hashes = list(files)
+        for start in range(0, len(hashes), SWEEP_BATCH_SIZE):
+            batch = hashes[start:start + SWEEP_BATCH_SIZE]
+            known = set(await self.db.image_objects.distinct("sha256", {"sha256": {"$in": batch}}))
+            for sha256 in batch:
+                if sha256 in known:
+                    continue
+                for path in files[sha256]:
+                    reclaimed += await asyncio.to_thread(_remove_file, path)
+                    removed += 1
+        return {"untracked_files_removed": removed, "bytes_reclaimed": reclaimed}
+
+    async def _remove_legacy_dirs(self, cutoff: float) -> Dict:
+        folders = await asyncio.to_thread(scan_legacy_dirs, self.image_store.images_dir, cutoff)
+        if not folders:
+            return {"legacy_dirs_removed": 0, "bytes_reclaimed": 0}
+        existing = await self._existing_project_ids(set(folders))
+        removed = 0
+        reclaimed = 0
+        for project_id, path in folders.items():
+            if project_id in existing:
+                continue
+            reclaimed += await asyncio.to_thread(_remove_tree, path)
+            removed += 1
+        return {"legacy_dirs_removed": removed, "bytes_reclaimed": reclaimed}
+
+    async def sweep(self) -> Dict:
+        """Run all passes once and report what was reclaimed"""
+        started = time.monotonic()
+        cutoff_time = time.time() - self.grace_seconds
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=self.grace_seconds)
+
+        report = {"refs_released": await self._release_dangling_refs(cutoff)}
+        for result in (
+            await self._remove_unreferenced_blobs(cutoff),
+            await self._remove_untracked_files(cutoff_time),
+            await self._remove_legacy_dirs(cutoff_time)
+        ):
+            for key, value in result.items():
+                report[key] = report.get(key, 0) + value
+        report["duration_seconds"] = round(time.monotonic() - started, 2)
+
+        logging.info(f"🧹 Image sweep: {report}")
+        return report
+
+    async def run_forever(self, interval: int = IMAGE_SWEEP_INTERVAL):
+        """Background loop started at app startup"""
+        while True:
+            try:
+                await self.sweep()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logging.error(f"❌ Image sweep failed: {e}")
+            await asyncio.sleep(interval)
+
+
+async def remove_legacy_project_dir(images_dir: Path, project_id: str) -> int:
+    """Delete static/images/<project_id> written before the content store existed"""
+    path = images_dir / project_id
+    if project_id in ('', '.', '..', STORE_DIR_NAME) or Path(project_id).name != project_id or not path.is_dir():
+        return 0
+    return await asyncio.to_thread(_remove_tree, path)
@@ -0,0 +1,296 @@
+"""Data migrations run in the background at startup; each one is idempotent and resumes where it stopped"""
+import os
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Dict, Optional, Tuple
+
+from pymongo import UpdateOne
+
+from content_codec import COMPRESSED_FIELDS, is_encoded, spill_id
+from fingerprint import compute_fingerprint
+from summaries import PROJECT_EXCERPT_FIELDS, excerpt_from
+
+MIGRATION_BATCH_SIZE = int(os.environ.get('MIGRATION_BATCH_SIZE', 500))
+
+# Timestamp fields that older code wrote as ISO strings
+DATETIME_FIELDS: Dict[str, Tuple[str, ...]] = {
+    "projects": ("created_at", "updated_at"),
+    "kol_posts": ("created_at", "updated_at"),
+    "news_articles": ("created_at", "updated_at"),
+    "social_posts": ("created_at", "updated_at"),
+}
+
+# Fields list excerpts are made from; once a body is compressed the list can't fall back to it
+EXCERPT_FIELDS: Dict[str, Tuple[str, ...]] = {
+    "projects": PROJECT_EXCERPT_FIELDS,
+}
+
+# Documents per batch when rewriting article bodies (each can be hundreds of KB)
+CONTENT_MIGRATION_BATCH_SIZE = int(os.environ.get('CONTENT_MIGRATION_BATCH_SIZE', 50))
+
+# Field each collection was fingerprinted from, and the source types whose stored value is
+# exactly that text (URL sources were fingerprinted from scraped text, which isn't stored)
+FINGERPRINT_SOURCES: Dict[str, Tuple[str, Optional[str]]] = {
+    "projects": ("original_content", None),
+    "kol_posts": ("information_source", "text"),
+    "news_articles": ("source_content", "text"),
+}
+
+NATIVE_DATETIMES = "native_datetimes"
+COMPRESSED_CONTENT = "compressed_content"
+COMPRESSED_EXCERPTS = "compressed_excerpts"
+SOURCE_FINGERPRINTS = "source_fingerprints"
+
+
+def parse_legacy_datetime(value: str) -> Optional[datetime]:
+    """ISO string as written by datetime.isoformat(); naive values were UTC. None if unparseable"""
+    try:
+        parsed = datetime.fromisoformat(value.strip().replace('Z', '+00:00'))
+    except (AttributeError, ValueError):
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+async def convert_string_datetimes(db, collection: str, field: str, batch_size: int = MIGRATION_BATCH_SIZE) -> Dict:
+    """
+    Rewrite string values of one field as BSON dates, batch by batch in _id order.
+    Converted documents drop out of the {$type: string} query, so an interrupted run
+    simply continues with what is left. Unparseable values are skipped and counted.
+    """
+    converted = 0
+    skipped = 0
+    last_id = None
+    while True:
+        query = {field: {"$type": "string"}}
+        if last_id is not None:
+            query["_id"] = {"$gt": last_id}
+        batch = await db[collection].find(query, {field: 1}).sort("_id", 1).limit(batch_size).to_list(batch_size)
+        if not batch:
+            break
+        last_id = batch[-1]['_id']
+
+        operations = []
+        for document in batch:
+            parsed = parse_legacy_datetime(document[field])
+            if parsed is None:
+                skipped += 1
+                continue
+            # Matching on the old value leaves concurrent edits alone
+            operations.append(UpdateOne({"_id": document['_id'], field: document[field]}, {"$set": {field: parsed}}))
+        if operations:
+            result = await db[collection].bulk_write(operations, ordered=False)
+            converted += result.modified_count
+        # Yield between batches so request handling isn't starved
+        await asyncio.sleep(0)
+
+    if skipped:
+        logging.warning(f"⚠️ {skipped} unparseable {collection}.{field} values left as strings")
+    return {"converted": converted, "skipped": skipped}
+
+
+async def _start(db, name: str) -> bool:
+    """False when the migration already completed"""
+    if await db.migrations.find_one({"name": name, "completed_at": {"$ne": None}}):
+        return False
+    await db.migrations.update_one(
+        {"name": name},
+        {"$set": {"started_at": datetime.now(timezone.utc), "completed_at": None}},
+        upsert=True
+    )
+    return True
+
+
+async def _complete(db, name: str, report: Dict):
+    await db.migrations.update_one(
+        {"name": name},
+        {"$set": {"completed_at": datetime.now(timezone.utc), "report": report}}
+    )
+
+
+async def migrate_native_datetimes(db, batch_size: int = MIGRATION_BATCH_SIZE) -> Optional[Dict]:
+    """
+    Convert every ISO-string timestamp in DATETIME_FIELDS to a native datetime.
+    Completion is recorded in the migrations collection so later startups skip the scan;
+    returns None when it already ran.
+    """
+    if not await _start(db, NATIVE_DATETIMES):
+        return None
+
+    report = {}
+    for collection, fields in DATETIME_FIELDS.items():
+        for field in fields:
+            report[f"{collection}.{field}"] = await convert_string_datetimes(db, collection, field, batch_size)
+
+    await _complete(db, NATIVE_DATETIMES, report)
+    converted = sum(result['converted'] for result in report.values())
+    logging.info(f"🗓️ Converted {converted} ISO-string timestamps to native datetimes")
+    return report
+
+
+def missing_excerpt(document: Dict, excerpt_fields: Tuple[str, ...]) -> Dict:
+    """{'excerpt': ...} for a document that has none yet (bodies are still strings here), else {}"""
+    if not excerpt_fields or isinstance(document.get('excerpt'), str):
+        return {}
+    return {'excerpt': excerpt_from(document, *excerpt_fields)}
+
+
+async def compress_string_content(db, codec, collection: str, field: str,
+                                  batch_size: int = CONTENT_MIGRATION_BATCH_SIZE) -> Dict:
+    """
+    Encode plain-string bodies written before compression existed; small ones stay strings.
+    Documents without a stored excerpt get one in the same write, since the list view's
+    fallback only reads string bodies.
+    """
+    excerpt_fields = EXCERPT_FIELDS.get(collection, ())
+    projection = {"id": 1, "excerpt": 1, field: 1, **{name: 1 for name in excerpt_fields}}
+    compressed = 0
+    last_id = None
+    while True:
+        query = {field: {"$type": "string"}}
+        if last_id is not None:
+            query["_id"] = {"$gt": last_id}
+        batch = await db[collection].find(query, projection).sort("_id", 1).limit(batch_size).to_list(batch_size)
+        if not batch:
+            break
+        last_id = batch[-1]['_id']
+
+        operations = []
+        for document in batch:
+            encoded = await codec.encode(collection, document['id'], field, document[field])
+            if not is_encoded(encoded):
+                continue
+            # Matching on the old value leaves concurrent edits alone
+            match = {"_id": document['_id'], field: document[field]}
+            changes = {field: encoded, **missing_excerpt(document, excerpt_fields)}
+            if spill_id(encoded) is None:
+                operations.append(UpdateOne(match, {"$set": changes}))
+                continue
+            # Spilled bodies are written one by one so a lost race can delete its upload
+            result = await db[collection].update_one(match, {"$set": changes})
+            if result.modified_count:
+                compressed += 1
+            else:
+                await codec.discard(encoded)
+        if operations:
+            result = await db[collection].bulk_write(operations, ordered=False)
+            compressed += result.modified_count
+        await asyncio.sleep(0)
+    return {"compressed": compressed}
+
+
+async def migrate_compressed_content(db, codec) -> Optional[Dict]:
+    """Compress existing large bodies in COMPRESSED_FIELDS; returns None when it already ran"""
+    if not await _start(db, COMPRESSED_CONTENT):
+        return None
+
+    report = {}
+    for collection, fields in COMPRESSED_FIELDS.items():
+        for field in fields:
+            report[f"{collection}.{field}"] = await compress_string_content(db, codec, collection, field)
+
+    await _complete(db, COMPRESSED_CONTENT, report)
+    compressed = sum(result['compressed'] for result in report.values())
+    logging.info(f"🗜️ Compressed {compressed} stored article bodies")
+    return report
+
+
+async def fill_compressed_excerpts(db, codec, collection: str,
+                                   batch_size: int = CONTENT_MIGRATION_BATCH_SIZE) -> Dict:
+    """Excerpts for documents whose bodies an earlier compressed_content run encoded without one"""
+    fields = EXCERPT_FIELDS[collection]
+    without_excerpt = {"excerpt": {"$not": {"$type": "string"}}}
+    filled = 0
+    last_id = None
+    while True:
+        query = {**without_excerpt, "$or": [{field: {"$type": "object"}} for field in fields]}
+        if last_id is not None:
+            query["_id"] = {"$gt": last_id}
+        batch = await db[collection].find(query, {"id": 1, **{field: 1 for field in fields}}).sort("_id", 1).limit(batch_size).to_list(batch_size)
+        if not batch:
+            break
+        last_id = batch[-1]['_id']
+
+        for document in batch:
+            decoded = await codec.decode_fields(collection, document)
+            result = await db[collection].update_one(
+                {"_id": document['_id'], **without_excerpt},
+                {"$set": missing_excerpt(decoded, fields)}
+            )
+            filled += result.modified_count
+        await asyncio.sleep(0)
+    return {"filled": filled}
+
+
+async def migrate_compressed_excerpts(db, codec) -> Optional[Dict]:
+    """Repair list excerpts lost to compression on deployments that already ran it; None when done"""
+    if not await _start(db, COMPRESSED_EXCERPTS):
+        return None
+
+    report = {collection: await fill_compressed_excerpts(db, codec, collection) for collection in EXCERPT_FIELDS}
+
+    await _complete(db, COMPRESSED_EXCERPTS, report)
+    filled = sum(result['filled'] for result in report.values())
+    logging.info(f"📝 Filled {filled} missing excerpts of compressed documents")
+    return report
+
+
+async def fingerprint_collection(db, codec, fingerprints, collection: str,
+                                 batch_size: int = CONTENT_MIGRATION_BATCH_SIZE) -> Dict:
+    """Index source fingerprints of documents created before near-duplicate detection"""
+    field, source_type = FINGERPRINT_SOURCES[collection]
+    indexed = 0
+    last_id = None
+    while True:
+        query = {}
+        if source_type:
+            query["source_type"] = source_type
+        if last_id is not None:
+            query["_id"] = {"$gt": last_id}
+        batch = await db[collection].find(query, {"id": 1, field: 1}).sort("_id", 1).limit(batch_size).to_list(batch_size)
+        if not batch:
+            break
+        last_id = batch[-1]['_id']
+
+        already = set(await db.fingerprints.distinct(
+            "doc_id", {"collection": collection, "doc_id": {"$in": [document['id'] for document in batch]}}
+        ))
+        for document in batch:
+            if document['id'] in already:
+                continue
+            # Spilled project bodies are read back from GridFS
+            document = await codec.decode_fields(collection, document)
+            fingerprint = await asyncio.to_thread(compute_fingerprint, document.get(field) or "")
+            if fingerprint is not None:
+                await fingerprints.add(collection, document['id'], fingerprint)
+                indexed += 1
+        await asyncio.sleep(0)
+    return {"indexed": indexed}
+
+
+async def migrate_source_fingerprints(db, codec, fingerprints) -> Optional[Dict]:
+    """Backfill the fingerprints collection for FINGERPRINT_SOURCES; returns None when it already ran"""
+    if not await _start(db, SOURCE_FINGERPRINTS):
+        return None
+
+    report = {}
+    for collection in FINGERPRINT_SOURCES:
+        report[collection] = await fingerprint_collection(db, codec, fingerprints, collection)
+
+    await _complete(db, SOURCE_FINGERPRINTS, report)
+    indexed = sum(result['indexed'] for result in report.values())
+    logging.info(f"🧬 Fingerprinted {indexed} existing sources")
+    return report
+
+
+async def run_migrations(db, codec, fingerprints):
+    """Background task started at app startup; a failure is logged and retried on the next start"""
+    try:
+        await migrate_native_datetimes(db)
+        await migrate_compressed_content(db, codec)
+        await migrate_compressed_excerpts(db, codec)
+        await migrate_source_fingerprints(db, codec, fingerprints)
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        logging.error(f"❌ Migration failed: {e}")
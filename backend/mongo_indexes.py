@@ -0,0 +1,207 @@
+"""Every Mongo index the app relies on, declared in one place and applied at startup"""
+import time
+import logging
+from typing import Dict, List, Optional, Tuple
+
+from pymongo.errors import OperationFailure
+
+# Options that change what an index means; an existing index differing in any of these is a conflict
+SEMANTIC_OPTIONS = ('unique', 'sparse', 'partialFilterExpression', 'expireAfterSeconds', 'collation')
+# Server error codes for an index that exists with other options or another name
+CONFLICT_CODES = {85, 86}
+
+# (created_at, id) serves both the newest-first sort and keyset pagination (see pagination.PAGE_SORT)
+INDEX_SPECS: Dict[str, List[Dict]] = {
+    "projects": [
+        {"keys": [("id", 1)], "unique": True},
+        {"keys": [("created_at", -1), ("id", -1)]},
+    ],
+    "kol_posts": [
+        {"keys": [("id", 1)], "unique": True},
+        {"keys": [("created_at", -1), ("id", -1)]},
+    ],
+    "news_articles": [
+        {"keys": [("id", 1)], "unique": True},
+        {"keys": [("created_at", -1), ("id", -1)]},
+    ],
+    "social_posts": [
+        {"keys": [("id", 1)], "unique": True},
+        {"keys": [("created_at", -1), ("id", -1)]},
+    ],
+    "feeds": [
+        {"keys": [("id", 1)], "unique": True},
+        {"keys": [("created_at", -1)]},
+        # Duplicate-feed check on create
+        {"keys": [("url", 1), ("target", 1)]},
+    ],
+    # Seen-entry checks
+    "feed_entries": [
+        {"keys": [("feed_id", 1), ("url", 1)], "unique": True},
+    ],
+    # Band lookup and one fingerprint per document
+    "fingerprints": [
+        {"keys": [("collection", 1), ("bands", 1)]},
+        {"keys": [("collection", 1), ("doc_id", 1)], "unique": True},
+    ],
+    # One object per hash, URL and sweeper lookups
+    "image_objects": [
+        {"keys": [("sha256", 1)], "unique": True},
+        {"keys": [("source_urls", 1)]},
+        {"keys": [("refcount", 1), ("last_seen_at", 1)]},
+    ],
+    # One manifest entry per project and blob
+    "image_refs": [
+        {"keys": [("project_id", 1), ("sha256", 1)], "unique": True},
+        {"keys": [("sha256", 1)]},
+    ],
+    "slug_cache": [
+        {"keys": [("key", 1)], "unique": True},
+    ],
+    # Spilled article bodies, released per document and field
+    "content.files": [
+        {"keys": [("metadata.collection", 1), ("metadata.doc_id", 1), ("metadata.field", 1)]},
+    ],
+}
+
+
+class IndexConflictError(RuntimeError):
+    """An existing index disagrees with INDEX_SPECS; startup stops until it is fixed by hand"""
+
+
+def index_name(keys: List[Tuple[str, int]]) -> str:
+    """Mongo's default name ('created_at_-1'), so indexes created before this module are recognised"""
+    return '_'.join(f"{field}_{direction}" for field, direction in keys)
+
+
+def _key_tuple(keys) -> Tuple:
+    """Hashable key pattern; old servers report directions as floats (1.0)"""
+    return tuple(
+        (field, int(direction) if isinstance(direction, float) else direction) for field, direction in keys
+    )
+
+
+def _options(definition: Dict) -> Dict:
+    return {option: definition[option] for option in SEMANTIC_OPTIONS if definition.get(option)}
+
+
+def _describe(keys, options: Dict) -> str:
+    return f"{dict(keys)}{' ' + str(options) if options else ''}"
+
+
+def plan_indexes(specs: List[Dict], existing: Dict[str, Dict]) -> Dict:
+    """
+    Compare declared specs with index_information() of one collection.
+    Returns {'present': [...], 'missing': [...], 'conflicts': [...], 'unmanaged': [...]}: specs
+    already satisfied, specs to create, human-readable conflicts, and extra index names.
+    """
+    by_keys = {_key_tuple(info['key']): name for name, info in existing.items()}
+    plan = {'present': [], 'missing': [], 'conflicts': [], 'unmanaged': []}
+    managed = {'_id_'}
+
+    for spec in specs:
+        keys = _key_tuple(spec['keys'])
+        name = spec.get('name') or index_name(spec['keys'])
+        wanted = _options(spec)
+        existing_name = by_keys.get(keys)
+
+        if existing_name is None:
+            if name in existing:
+                plan['conflicts'].append(
+                    f"index {name} exists on {_describe(existing[name]['key'], {})}, declared on {_describe(keys, {})}"
+                )
+                managed.add(name)
+            else:
+                plan['missing'].append(spec)
+            continue
+
+        managed.add(existing_name)
+        actual = _options(existing[existing_name])
+        if actual != wanted:
+            plan['conflicts'].append(
+                f"index {existing_name} is {_describe(keys, actual)}, declared {_describe(keys, wanted)}"
+            )
+        else:
+            plan['present'].append(existing_name)
+
+    plan['unmanaged'] = sorted(name for name in existing if name not in managed)
+    return plan
+
+
+async def ensure_indexes(db, specs: Optional[Dict[str, List[Dict]]] = None) -> Dict:
+    """
+    Create every missing declared index and report per collection what was there, what was built
+    and how long it took. Conflicting definitions raise IndexConflictError after all collections
+    were checked, so one startup shows every problem. Builds failing on existing data (duplicate
+    ids under a new unique index) are reported and logged without blocking startup.
+    """
+    specs = specs or INDEX_SPECS
+    report = {}
+    conflicts = []
+
+    for collection_name, collection_specs in specs.items():
+        collection = db[collection_name]
+        plan = plan_indexes(collection_specs, await collection.index_information())
+        entry = {
+            "present": plan['present'],
+            "created": [],
+            "failed": [],
+            "conflicts": plan['conflicts'],
+            "unmanaged": plan['unmanaged'],
+        }
+        conflicts.extend(f"{collection_name}: {conflict}" for conflict in plan['conflicts'])
+
+        for spec in plan['missing']:
+            options = {key: value for key, value in spec.items() if key != 'keys'}
+            name = options.pop('name', None) or index_name(spec['keys'])
+            started = time.monotonic()
+            try:
+                await collection.create_index(spec['keys'], name=name, **options)
+            except OperationFailure as e:
+                if e.code in CONFLICT_CODES:
+                    entry['conflicts'].append(f"index {name}: {e}")
+                    conflicts.append(f"{collection_name}: index {name}: {e}")
+                else:
+                    logging.error(f"❌ Index build failed on {collection_name}.{name}: {e}")
+                    entry['failed'].append({"name": name, "error": str(e)})
+                continue
+            duration_ms = round((time.monotonic() - started) * 1000)
+            logging.info(f"🗂️ Built index {collection_name}.{name} in {duration_ms} ms")
+            entry['created'].append({"name": name, "duration_ms": duration_ms})
+
+        report[collection_name] = entry
+
+    if conflicts:
+        for conflict in conflicts:
+            logging.error(f"❌ Index conflict on {conflict}")
+        raise IndexConflictError("Conflicting index definitions: " + "; ".join(conflicts))
+    return report
+
+
+async def index_status(db, specs: Optional[Dict[str, List[Dict]]] = None) -> Dict:
+    """Current state of the declared indexes without changing anything, plus builds still running"""
+    specs = specs or INDEX_SPECS
+    collections = {}
+    for collection_name, collection_specs in specs.items():
+        plan = plan_indexes(collection_specs, await db[collection_name].index_information())
+        collections[collection_name] = {
+            "present": plan['present'],
+            "missing": [index_name(spec['keys']) for spec in plan['missing']],
+            "conflicts": plan['conflicts'],
+            "unmanaged": plan['unmanaged'],
+        }
+
+    # Needs the inprog privilege; not every deployment grants it
+    in_progress = None
+    try:
+        cursor = db.client.admin.aggregate([
+            {"$currentOp": {"allUsers": True}},
+            {"$match": {"command.createIndexes": {"$in": list(specs)}, "ns": {"$regex": f"^{db.name}\\."}}},
+        ])
+        in_progress = [
+            {"collection": op['command']['createIndexes'], "message": op.get('msg'), "progress": op.get('progress')}
+            async for op in cursor
+        ]
+    except OperationFailure as e:
+        logging.debug(f"Index build progress unavailable: {e}")
+
+    return {"collections": collections, "in_progress": in_progress}
@@ -0,0 +1,88 @@
+"""Keyset pagination over (created_at, id), newest first"""
+import os
+import json
+import base64
+import binascii
+from datetime import datetime
+from typing import Dict, Generic, List, Optional, Tuple, TypeVar, Union
+
+from pydantic import BaseModel
+
+PAGE_SIZE_DEFAULT = int(os.environ.get('PAGE_SIZE_DEFAULT', 50))
+PAGE_SIZE_MAX = int(os.environ.get('PAGE_SIZE_MAX', 200))
+
+# Matches the (created_at -1, id -1) index of every paginated collection
+PAGE_SORT = [("created_at", -1), ("id", -1)]
+
+T = TypeVar('T')
+
+
+class Page(BaseModel, Generic[T]):
+    items: List[T]
+    # Pass back as ?cursor= for the next page; None on the last page
+    next_cursor: Optional[str] = None
+
+
+def encode_cursor(document: Dict) -> str:
+    """Opaque cursor pointing just past this document"""
+    created_at = document.get('created_at')
+    payload = {
+        "c": created_at.isoformat() if isinstance(created_at, datetime) else created_at,
+        # Legacy rows hold ISO strings; the cursor keeps the BSON type so the next query compares like with like
+        "d": isinstance(created_at, datetime),
+        "i": document['id'],
+    }
+    raw = json.dumps(payload, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[Union[datetime, str, None], str]:
+    """(created_at, id) from a cursor; ValueError if it was not produced by encode_cursor"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        created_at, doc_id = payload['c'], payload['i']
+        if payload.get('d'):
+            created_at = datetime.fromisoformat(created_at)
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError, KeyError, TypeError, ValueError):
+        raise ValueError("Invalid cursor")
+    if not isinstance(doc_id, str) or not (created_at is None or isinstance(created_at, (datetime, str))):
+        raise ValueError("Invalid cursor")
+    return created_at, doc_id
+
+
+def keyset_filter(cursor: Optional[str]) -> Dict:
+    """
+    Documents strictly after the cursor in PAGE_SORT order.
+    $lt only compares within one BSON type, but the sort runs across types (dates, then
+    legacy strings, then missing), so the types sorting after the cursor's are added whole.
+    """
+    if not cursor:
+        return {}
+    created_at, doc_id = decode_cursor(cursor)
+    branches = [{"created_at": created_at, "id": {"$lt": doc_id}}]
+    if created_at is not None:
+        branches.insert(0, {"created_at": {"$lt": created_at}})
+        # null also matches a missing field
+        branches.append({"created_at": None})
+    if isinstance(created_at, datetime):
+        branches.insert(2, {"created_at": {"$type": "string"}})
+    return {"$or": branches}
+
+
+async def paginate(collection, query: Dict, projection: Dict, limit: int, cursor: Optional[str] = None) -> Dict:
+    """
+    One page of documents plus the cursor for the next one.
+    Reads limit + 1 documents so the last page is known without a count.
+    """
+    after = keyset_filter(cursor)
+    if after:
+        query = {"$and": [query, after]} if query else after
+    projection = {**projection, "_id": 0}
+    if any(projection.values()):
+        # Inclusion projections still need the cursor fields
+        projection.update({"id": 1, "created_at": 1})
+
+    documents = await collection.find(query, projection).sort(PAGE_SORT).limit(limit + 1).to_list(limit + 1)
+    next_cursor = encode_cursor(documents[limit - 1]) if len(documents) > limit else None
+    return {"items": documents[:limit], "next_cursor": next_cursor}
@@ -1,33 +1,60 @@
-from fastapi import FastAPI, APIRouter, HTTPException, UploadFile, File
-from fastapi.staticfiles import StaticFiles
+from fastapi import FastAPI, APIRouter, HTTPException, Request, Query, UploadFile, File
 from fastapi.responses import FileResponse, StreamingResponse
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ReturnDocument
 import os
 import logging
 from pathlib import Path
 from pydantic import BaseModel, Field, ConfigDict
-from typing import List, Optional, Dict
+from typing import List, Literal, Optional, Dict
 import uuid
 from datetime import datetime, timezone
-import requests
 from bs4 import BeautifulSoup
-import aiofiles
-from PIL import Image
 import io
 import asyncio
-from urllib.parse import urljoin, urlparse
+from urllib.parse import urljoin
 from emergentintegrations.llm.chat import LlmChat, UserMessage
-import unicodedata
-import re
+from html_extract import (
+    build_excluded_regions, is_in_excluded_region, get_image_source,
+    is_tracking_pixel, is_unwanted_image, get_declared_size, srcset_max_width, compact_html,
+    compact_source, abbreviate_image_sources, restore_image_sources, extract_main_text
+)
+from fetcher import fetch_page, fetch_image, close_http_client
+from feeds import FeedIngestor, FEED_TARGETS
+from fingerprint import FingerprintIndex, compute_fingerprint
+from image_store import ImageStore
+from image_processing import ImageProcessor, ImageProcessingError
+from image_probe import prefilter_images
+from slugs import slugify, unique_slugs
+from slug_protocol import (
+    build_translation_prompt, parse_translation_response, chunked,
+    SLUG_TRANSLATION_CHUNK_SIZE, SLUG_TRANSLATION_RETRIES
+)
+from slug_cache import SlugCache, normalize_alt_text, placeholder_slug
+from image_sweeper import ImageSweeper, IMAGE_SWEEP_INTERVAL, remove_legacy_project_dir
+from mongo_indexes import ensure_indexes, index_status
+from migrations import run_migrations
+from content_codec import ContentCodec
+from pagination import Page, paginate, PAGE_SIZE_DEFAULT, PAGE_SIZE_MAX
+from summaries import (
+    make_excerpt, PROJECT_SUMMARY_PROJECTION, KOL_POST_SUMMARY_PROJECTION,
+    NEWS_SUMMARY_PROJECTION, SOCIAL_POST_SUMMARY_PROJECTION
+)
+from static_files import CachedStaticFiles, file_response
+from zip_stream import stream_zip, unique_archive_names
+from content_selection import (
+    select_passages, SOCIAL_POST_TOKEN_BUDGET, KOL_POST_TOKEN_BUDGET, NEWS_TOKEN_BUDGET
+)
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
 # MongoDB connection
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
+# tz_aware: stored datetimes come back as UTC-aware, matching what the app writes
+client = AsyncIOMotorClient(mongo_url, tz_aware=True)
 db = client[os.environ['DB_NAME']]
 
 # LLM API Keys
@@ -138,13 +165,14 @@ class APIKeyManager:
         # Try all keys (will automatically skip cooldown keys)
         for attempt in range(len(self.keys)):
             current_key = self.get_current_key()
+            # Advance before awaiting so concurrent calls (e.g. parallel chunks) start on different keys
+            self.get_next_key()
             
             # Skip if key is in cooldown
             if self.is_key_in_cooldown(current_key):
                 time_remaining = self.cooldown_seconds - (datetime.now(timezone.utc).timestamp() - self.rate_limited_keys[current_key])
                 skipped_keys.append(current_key[-4:])
                 logging.info(f"⏭️ Skipping key ...{current_key[-4:]} (cooldown: {int(time_remaining)}s remaining)")
-                self.get_next_key()
                 continue
             
             attempted_keys.append(current_key[-4:])
@@ -153,8 +181,7 @@ class APIKeyManager:
                 logging.info(f"🔄 Attempting API call with key ...{current_key[-4:]} (attempt {len(attempted_keys)}/{len(available_keys)})")
                 result = await func(current_key, *args, **kwargs)
                 logging.info(f"✅ Success with key ...{current_key[-4:]}")
-                # Success! Rotate to next key for next call (round-robin)
-                self.get_next_key()
+                # Success! The next call already starts on the next key (round-robin)
                 return result
                 
             except Exception as e:
@@ -167,7 +194,6 @@ class APIKeyManager:
                     # Mark key as rate limited
                     self.mark_key_rate_limited(current_key)
                     # Try next key
-                    self.get_next_key()
                     continue
                 else:
                     # For other errors, don't try other keys (likely a code/input issue)
@@ -191,15 +217,33 @@ api_key_manager = APIKeyManager(GOOGLE_API_KEYS)
 IMAGES_DIR = ROOT_DIR / 'static' / 'images'
 IMAGES_DIR.mkdir(parents=True, exist_ok=True)
 
+# Content-addressed image store: identical images are stored once, projects hold references
+image_store = ImageStore(db, IMAGES_DIR)
+# Validation, metadata stripping and WebP/AVIF variants run in worker processes
+image_processor = ImageProcessor()
+# English alt text -> Vietnamese slug, so repeated alt texts never reach the LLM twice
+slug_cache = SlugCache(db)
+# Reclaims blobs no project references and folders of deleted projects
+image_sweeper = ImageSweeper(db, image_store)
+
+# Image downloads per scrape run in parallel, bounded so one article can't open hundreds of connections
+IMAGE_DOWNLOAD_CONCURRENCY = int(os.environ.get('IMAGE_DOWNLOAD_CONCURRENCY', 8))
+# Per-image cap (including host-scheduler queueing) so one slow CDN can't stall project creation
+IMAGE_DOWNLOAD_TIMEOUT = float(os.environ.get('IMAGE_DOWNLOAD_TIMEOUT', 20))
+
 # Create the main app
 app = FastAPI()
 
 # Mount static files
-app.mount("/static", StaticFiles(directory=str(ROOT_DIR / "static")), name="static")
+# Content-addressed images get immutable caching and strong ETags; legacy project paths keep working
+app.mount("/static", CachedStaticFiles(directory=str(ROOT_DIR / "static")), name="static")
 
 # Create API router
 api_router = APIRouter(prefix="/api")
 
+# What to do when a new source is a near-duplicate of a stored one
+DuplicatePolicy = Literal["reject", "reuse", "allow"]
+
 # Models
 class SocialContent(BaseModel):
     model_config = ConfigDict(extra="ignore")
@@ -207,11 +251,22 @@ class SocialContent(BaseModel):
     twitter: Optional[str] = None
     hashtags: Optional[str] = None
 
+class ImageVariant(BaseModel):
+    url: str
+    width: int
+    height: int
+    format: str
+
 class ImageMetadata(BaseModel):
     model_config = ConfigDict(extra="ignore")
     url: str
     alt_text: str
     filename: str
+    local_path: Optional[str] = None  # /static/images/store/... copy, if the download succeeded
+    width: Optional[int] = None
+    height: Optional[int] = None
+    format: Optional[str] = None  # "jpg", "png", "gif", "webp", "avif" or "svg"
+    variants: List[ImageVariant] = Field(default_factory=list)  # Resized WebP/AVIF copies for srcset
 
 class Project(BaseModel):
     model_config = ConfigDict(extra="ignore")
@@ -223,12 +278,26 @@ class Project(BaseModel):
     social_content: Optional[SocialContent] = None
     images: List[str] = Field(default_factory=list)  # Keep for backward compatibility
     image_metadata: List[ImageMetadata] = Field(default_factory=list)  # New field for image details
+    excerpt: Optional[str] = None  # Plain-text opening of translated (else original) content, for lists
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
+class ProjectSummary(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    id: str
+    title: str
+    source_url: Optional[str] = None
+    excerpt: Optional[str] = None
+    has_translation: bool = False
+    has_social: bool = False
+    image_count: int = 0
+    created_at: datetime
+    updated_at: datetime
+
 class ProjectCreate(BaseModel):
     source_url: Optional[str] = None
     raw_text: Optional[str] = None
+    on_duplicate: DuplicatePolicy = "reject"  # What to do with a near-duplicate source
 
 class ProjectUpdate(BaseModel):
     translated_content: str
@@ -248,9 +317,18 @@ class KOLPost(BaseModel):
     insight_required: str
     generated_content: Optional[str] = None
     source_type: str = "text"  # "text" or "url"
+    excerpt: Optional[str] = None  # Plain-text opening of generated_content, for lists
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
+class KOLPostSummary(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    id: str
+    source_type: str = "text"
+    excerpt: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+
 class KOLPostCreate(BaseModel):
     information_source: str
     insight_required: str
@@ -260,6 +338,7 @@ class KOLPostGenerate(BaseModel):
     information_source: str
     insight_required: str
     source_type: str = "text"
+    on_duplicate: DuplicatePolicy = "reject"  # What to do with a near-duplicate source
 
 class NewsArticle(BaseModel):
     model_config = ConfigDict(extra="ignore")
@@ -269,14 +348,25 @@ class NewsArticle(BaseModel):
     style_choice: str = "auto"  # "auto", "style1", "style2"
     generated_content: Optional[str] = None
     source_type: str = "text"  # "text" or "url"
+    excerpt: Optional[str] = None  # Plain-text opening of generated_content, for lists
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
+class NewsArticleSummary(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    id: str
+    source_type: str = "text"
+    style_choice: str = "auto"
+    excerpt: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+
 class NewsArticleGenerate(BaseModel):
     source_content: str
     opinion: Optional[str] = None
     style_choice: str = "auto"
     source_type: str = "text"
+    on_duplicate: DuplicatePolicy = "reject"  # What to do with a near-duplicate source
 
 class NewsArticleUpdate(BaseModel):
     generated_content: str
@@ -291,9 +381,20 @@ class SocialPost(BaseModel):
     introduction: Optional[str] = None  # Optional - AI will generate if empty
     highlight: Optional[str] = None  # Optional - AI will generate if empty
     generated_content: Optional[str] = None  # Final generated social post
+    excerpt: Optional[str] = None  # Plain-text opening of generated_content, for lists
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
+class SocialPostSummary(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    id: str
+    title: Optional[str] = None
+    website_link: Optional[str] = None
+    source_type: str = "url"
+    excerpt: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+
 class SocialPostGenerate(BaseModel):
     website_link: Optional[str] = None
     website_content: Optional[str] = None
@@ -305,134 +406,192 @@ class SocialPostGenerate(BaseModel):
 class SocialPostUpdate(BaseModel):
     generated_content: str
 
+class Feed(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    url: str  # RSS/Atom feed, sitemap or sitemap index
+    target: str = "project"  # "project" or "news"
+    enabled: bool = True
+    backfill: bool = False  # Ingest entries already in the feed on the first poll
+    kind: Optional[str] = None  # Detected on first poll: "rss", "atom", "sitemap", "sitemapindex"
+    last_polled_at: Optional[datetime] = None
+    last_error: Optional[str] = None
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+class FeedCreate(BaseModel):
+    url: str
+    target: str = "project"
+    backfill: bool = False
+
 # Helper functions
-async def download_image(image_url: str, project_id: str) -> Optional[str]:
-    """Download image and return local path"""
+async def acquire_image(image_url: str, make_variants: bool = True, content: Optional[bytes] = None) -> Optional[Dict]:
+    """Fetch (unless the prefilter probe already got the whole file), validate and store an image and its variants"""
+    if content is None:
+        content = (await fetch_image(image_url))['content']
+    
+    # Reject HTML error pages and corrupt files, drop EXIF, build resized variants
     try:
-        response = requests.get(image_url, timeout=10, headers={
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
-        response.raise_for_status()
-        
-        # Create project directory
-        project_dir = IMAGES_DIR / project_id
-        project_dir.mkdir(exist_ok=True)
-        
-        # Generate filename
-        parsed_url = urlparse(image_url)
-        filename = Path(parsed_url.path).name or f"image_{uuid.uuid4().hex[:8]}.jpg"
-        if not filename.lower().endswith(('.jpg', '.jpeg', '.png', '.gif', '.webp')):
-            filename += '.jpg'
-        
-        filepath = project_dir / filename
-        
-        # Save image
-        async with aiofiles.open(filepath, 'wb') as f:
-            await f.write(response.content)
+        processed = await image_processor.process(content, make_variants=make_variants)
+    except ImageProcessingError as e:
+        logging.warning(f"⚠️ Skipping image {image_url}: {e}")
+        return None
+    
+    processed['original'] = await image_store.put(processed['original'], source_url=image_url)
+    for variant in processed['variants']:
+        variant['blob'] = await image_store.put(variant.pop('content'))
+    return processed
+
+async def download_image(image_url: str, project_id: str, content: Optional[bytes] = None) -> Optional[Dict]:
+    """Download, validate and store an image with its variants; returns local path and dimensions"""
+    try:
+        processed = await acquire_image(image_url, content=content)
+        if not processed:
+            return None
+        
+        # Stored once per distinct content; the project only gets manifest references
+        stored = processed['original']
+        await image_store.add_reference(project_id, stored['sha256'], image_url)
+        
+        variants = []
+        for variant in processed['variants']:
+            blob = variant['blob']
+            await image_store.add_reference(project_id, blob['sha256'])
+            variants.append({
+                'url': blob['url'],
+                'width': variant['width'],
+                'height': variant['height'],
+                'format': variant['format']
+            })
         
-        # Return relative path for URL
-        return f"/static/images/{project_id}/{filename}"
+        return {
+            'url': stored['url'],
+            'width': processed['width'],
+            'height': processed['height'],
+            'format': processed['format'],
+            'variants': variants
+        }
     except Exception as e:
         logging.error(f"Error downloading image {image_url}: {e}")
         return None
 
-def remove_vietnamese_accents(text: str) -> str:
-    """Remove Vietnamese accents from text"""
-    # Normalize unicode characters
-    text = unicodedata.normalize('NFD', text)
-    # Remove combining characters (accents)
-    text = ''.join(char for char in text if unicodedata.category(char) != 'Mn')
-    return text
-
-async def batch_translate_to_vietnamese_slugs(texts: List[str]) -> List[str]:
-    """Batch translate multiple English texts to Vietnamese slug format in one API call"""
-    if not texts:
-        return []
+async def download_images(images: List[Dict], project_id: str) -> List[Optional[Dict]]:
+    """Download images ({'url', optional 'probe_content'}) concurrently; results in input order (None for failures/timeouts)"""
+    semaphore = asyncio.Semaphore(IMAGE_DOWNLOAD_CONCURRENCY)
     
+    async def _download(image: Dict) -> Optional[Dict]:
+        async with semaphore:
+            try:
+                return await asyncio.wait_for(
+                    download_image(image['url'], project_id, content=image.get('probe_content')),
+                    IMAGE_DOWNLOAD_TIMEOUT
+                )
+            except asyncio.TimeoutError:
+                logging.warning(f"⏱️ Image download timed out after {IMAGE_DOWNLOAD_TIMEOUT}s: {image['url']}")
+                return None
+    
+    return await asyncio.gather(*(_download(image) for image in images))
+
+async def _translate_chunk(texts: Dict[str, str]) -> Dict[str, str]:
+    """One LLM call for {id: english_text}; returns the valid translations by id"""
     # Define the translation function that will be tried with multiple keys
     async def _translate_with_key(api_key: str):
         llm = LlmChat(
             api_key=api_key,
             session_id=f"batch_translate_{uuid.uuid4().hex[:8]}",
-            system_message="You are a translator. Translate English to simple, natural Vietnamese."
+            system_message="You are a translator. Translate English to simple, natural Vietnamese. Answer in JSON only."
         ).with_model("gemini", "gemini-2.0-flash-exp")
         
-        # Create numbered list for batch translation
-        numbered_texts = "\n".join([f"{i+1}. {text}" for i, text in enumerate(texts)])
-        
-        prompt = f"""Translate these {len(texts)} English texts to Vietnamese (simple, natural translation).
-Return ONLY the Vietnamese translations, one per line, numbered 1-{len(texts)}.
-Do NOT add explanations or extra text.
-
-{numbered_texts}"""
-        
-        user_message = UserMessage(text=prompt)
+        user_message = UserMessage(text=build_translation_prompt(texts))
         response_obj = await llm.send_message(user_message)
         return response_obj.strip()
     
+    # Try with all available API keys
+    response_text = await api_key_manager.try_with_all_keys(_translate_with_key)
+    return parse_translation_response(response_text, list(texts))
+
+async def translate_texts_to_vietnamese(texts: List[str]) -> List[Optional[str]]:
+    """
+    Translate English texts to Vietnamese; None where no valid translation came back.
+    Large lists are split into chunks translated in parallel (spread across API keys),
+    and only the items missing or invalid in a response are retried.
+    """
+    pending = {str(i): text for i, text in enumerate(texts)}
+    translations: Dict[str, str] = {}
+    
+    for attempt in range(1 + SLUG_TRANSLATION_RETRIES):
+        ids = list(pending)
+        chunks = [{item_id: pending[item_id] for item_id in chunk} for chunk in chunked(ids, SLUG_TRANSLATION_CHUNK_SIZE)]
+        results = await asyncio.gather(*(_translate_chunk(chunk) for chunk in chunks), return_exceptions=True)
+        
+        errors = [result for result in results if isinstance(result, Exception)]
+        for result in results:
+            if not isinstance(result, Exception):
+                translations.update(result)
+        pending = {item_id: text for item_id, text in pending.items() if item_id not in translations}
+        
+        if errors and len(errors) == len(results) and not translations:
+            # Nothing worked (e.g. every key rate limited): let the caller fall back
+            raise errors[0]
+        if not pending:
+            break
+        logging.warning(f"⚠️ {len(pending)} alt text translations missing or invalid (attempt {attempt + 1}), retrying only those")
+    
+    return [translations.get(str(i)) for i in range(len(texts))]
+
+async def batch_translate_to_vietnamese_slugs(texts: List[str]) -> List[str]:
+    """
+    Vietnamese slugs for image alt texts. Placeholders ("image-3", "IMG_1234") are slugged locally,
+    repeated texts are translated once, and only strings missing from the slug cache reach the LLM.
+    """
+    if not texts:
+        return []
+    
+    keys = [normalize_alt_text(text) for text in texts]
+    slugs_by_key: Dict[str, str] = {}
+    originals: Dict[str, str] = {}
+    for key, text in zip(keys, texts):
+        placeholder = placeholder_slug(key)
+        if placeholder:
+            slugs_by_key[key] = placeholder
+        else:
+            # In-batch de-duplication: each distinct text is looked up / translated once
+            originals.setdefault(key, text)
+    
+    slugs_by_key.update(await slug_cache.get_many(originals))
+    missing = [key for key in originals if key not in slugs_by_key]
+    
+    if not missing:
+        logging.info(f"✅ All {len(texts)} image slugs resolved from cache, skipping LLM call")
+    else:
+        logging.info(f"🔤 Translating {len(missing)}/{len(texts)} alt texts ({len(texts) - len(missing)} cached or placeholders)")
+        try:
+            translations = await translate_texts_to_vietnamese([originals[key] for key in missing])
+            translated = {}
+            for key, translation in zip(missing, translations):
+                if translation:
+                    translated[key] = slugify(translation)
+                else:
+                    # Model skipped this one: English slug now, retried on a later project
+                    slugs_by_key[key] = slugify(originals[key])
+            slugs_by_key.update(translated)
+            await slug_cache.set_many(translated)
+        except Exception as e:
+            logging.error(f"Error batch translating texts: {e}")
+            # Fallback: convert English to slugs (not cached)
+            for key in missing:
+                slugs_by_key[key] = slugify(originals[key])
+    
+    return [slugs_by_key[key] for key in keys]
+
+async def scrape_page(url: str) -> Dict:
+    """
+    Fetch a page and extract its title, compact content and image candidates.
+    No downloads or LLM calls happen here, so the near-duplicate check can run first.
+    """
     try:
-        # Try with all available API keys
-        response_text = await api_key_manager.try_with_all_keys(_translate_with_key)
-        
-        # Parse response - extract translations
-        translations = []
-        lines = response_text.split('\n')
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-            # Remove numbering (e.g., "1. ", "2. ", etc.)
-            translation = re.sub(r'^\d+\.\s*', '', line)
-            if translation:
-                translations.append(translation)
-        
-        # If we didn't get enough translations, pad with originals
-        while len(translations) < len(texts):
-            translations.append(texts[len(translations)])
-        
-        # Convert each translation to slug
-        slugs = []
-        for vietnamese_text in translations[:len(texts)]:
-            # Remove accents
-            no_accent = remove_vietnamese_accents(vietnamese_text)
-            
-            # Convert to lowercase
-            no_accent = no_accent.lower()
-            
-            # Replace spaces and special characters with hyphens
-            slug = re.sub(r'[^a-z0-9]+', '-', no_accent)
-            
-            # Remove leading/trailing hyphens
-            slug = slug.strip('-')
-            
-            # Remove consecutive hyphens
-            slug = re.sub(r'-+', '-', slug)
-            
-            slugs.append(slug)
-        
-        return slugs
-    except Exception as e:
-        logging.error(f"Error batch translating texts: {e}")
-        # Fallback: convert English to slugs
-        slugs = []
-        for text in texts:
-            no_accent = text.lower()
-            slug = re.sub(r'[^a-z0-9]+', '-', no_accent)
-            slug = slug.strip('-')
-            slug = re.sub(r'-+', '-', slug)
-            slugs.append(slug)
-        return slugs
-
-async def scrape_content(url: str, project_id: str) -> Dict:
-    """Scrape content from URL and download images"""
-    try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        response = requests.get(url, headers=headers, timeout=15)
-        response.raise_for_status()
+        page = await fetch_page(url)
         
-        soup = BeautifulSoup(response.content, 'html.parser')
+        soup = BeautifulSoup(page['content'], 'html.parser', from_encoding=page['encoding'])
         
         # Extract title
         title = soup.find('title')
@@ -440,51 +599,24 @@ async def scrape_content(url: str, project_id: str) -> Dict:
         
         # FIRST: Extract images BEFORE removing elements
         image_data_list = []  # Store temp image data
-        images_downloaded = []
         
         # Find all images in the page
         all_imgs = soup.find_all('img')
         
+        # Precompute nav/menu/footer/sidebar regions once so each image check is O(1)
+        excluded_regions = build_excluded_regions(soup)
+        
         for idx, img in enumerate(all_imgs):
-            src = img.get('src') or img.get('data-src')
+            src = get_image_source(img)
             if not src:
                 continue
             
-            # Filter out unwanted images by checking parent containers and classes
-            skip = False
-            
             # Skip if in navigation, menu, footer, sidebar
-            for parent in img.parents:
-                parent_class = ' '.join(parent.get('class', [])).lower() if parent.get('class') else ''
-                parent_tag = parent.name if parent.name else ''
-                parent_id = (parent.get('id') or '').lower()
-                
-                # Skip these containers
-                if any(term in parent_class for term in ['navigation', 'menu', 'footer', 'sidebar', 'widget', 'related']):
-                    skip = True
-                    break
-                if any(term in parent_id for term in ['nav', 'menu', 'footer', 'sidebar', 'widget']):
-                    skip = True
-                    break
-                if parent_tag == 'footer':
-                    skip = True
-                    break
-                # Keep header images if they're featured/article images
-                if parent_tag in ['nav']:
-                    skip = True
-                    break
-            
-            # Skip author/profile/avatar images (usually small)
-            img_class = ' '.join(img.get('class', [])).lower() if img.get('class') else ''
-            if any(term in img_class for term in ['avatar', 'profile', 'author-image', 'author-profile']):
-                skip = True
-            
-            # Skip logo images
-            alt_text_check = (img.get('alt') or '').lower()
-            if 'logo' in alt_text_check and len(alt_text_check) < 20:  # Short alt text with "logo" is usually a logo
-                skip = True
+            if is_in_excluded_region(img, excluded_regions):
+                continue
             
-            if skip:
+            # Skip tracking pixels, avatars and logos
+            if is_tracking_pixel(img, src) or is_unwanted_image(img):
                 continue
                 
             # Make absolute URL
@@ -497,32 +629,15 @@ async def scrape_content(url: str, project_id: str) -> Dict:
             if not alt_text:
                 alt_text = f"image-{len(image_data_list)+1}"
             
-            # Store temp data
+            # Store temp data, with declared sizes for the prefilter
+            declared_width, declared_height = get_declared_size(img)
             image_data_list.append({
                 'url': absolute_url,
-                'alt_text': alt_text
-            })
-        
-        # BATCH TRANSLATE all alt texts at once (much faster!)
-        alt_texts = [img['alt_text'] for img in image_data_list]
-        vietnamese_slugs = await batch_translate_to_vietnamese_slugs(alt_texts)
-        
-        # Now create final metadata with translated filenames
-        image_metadata = []
-        for i, img_data in enumerate(image_data_list):
-            vietnamese_slug = vietnamese_slugs[i] if i < len(vietnamese_slugs) else img_data['alt_text'].lower()
-            filename = f"{vietnamese_slug}.jpg"
-            
-            image_metadata.append({
-                'url': img_data['url'],
-                'alt_text': img_data['alt_text'],
-                'filename': filename
+                'alt_text': alt_text,
+                'declared_width': declared_width,
+                'declared_height': declared_height,
+                'srcset_width': srcset_max_width(img)
             })
-            
-            # Download image for preview
-            local_path = await download_image(img_data['url'], project_id)
-            if local_path:
-                images_downloaded.append(local_path)
         
         # NOW: Remove script and style elements from soup copy for content extraction
         soup_copy = BeautifulSoup(str(soup), 'html.parser')
@@ -539,19 +654,104 @@ async def scrape_content(url: str, project_id: str) -> Dict:
         if not content:
             content = soup_copy.find('body')
         
-        # Get HTML content
-        html_content = str(content) if content else ""
+        # Get HTML content as compact semantic markup (no classes, styles or wrapper divs)
+        html_content = compact_html(content, base_url=url) if content else ""
         
         return {
             'title': title_text,
             'content': html_content,
+            'image_candidates': image_data_list
+        }
+    except Exception as e:
+        logging.error(f"Error scraping {url}: {e}")
+        raise HTTPException(status_code=400, detail=f"Failed to scrape URL: {str(e)}")
+
+async def collect_images(image_data_list: List[Dict], project_id: str) -> Dict:
+    """Prefilter, download and name a page's image candidates (from scrape_page)"""
+    try:
+        # Drop icons and trackers (by attributes, or by probing the first KB) before downloads and the slug call
+        image_data_list = await prefilter_images(image_data_list)
+        
+        # BATCH TRANSLATE all alt texts at once, overlapped with the image downloads:
+        # latency is max(slug call, slowest image) instead of their sum
+        alt_texts = [img['alt_text'] for img in image_data_list]
+        vietnamese_slugs, downloads = await asyncio.gather(
+            batch_translate_to_vietnamese_slugs(alt_texts),
+            download_images(image_data_list, project_id)
+        )
+        images_downloaded = [download['url'] for download in downloads if download]
+        
+        # Two images with the same alt text must not share a filename: -2, -3 suffixes
+        vietnamese_slugs = unique_slugs(vietnamese_slugs)
+        
+        # Now create final metadata with translated filenames
+        image_metadata = []
+        for i, img_data in enumerate(image_data_list):
+            vietnamese_slug = vietnamese_slugs[i]
+            download = downloads[i] or {}
+            # Extension follows the real image format, not the URL
+            filename = f"{vietnamese_slug}.{download.get('format') or 'jpg'}"
+            
+            image_metadata.append({
+                'url': img_data['url'],
+                'alt_text': img_data['alt_text'],
+                'filename': filename,
+                'local_path': download.get('url'),
+                'width': download.get('width'),
+                'height': download.get('height'),
+                'format': download.get('format'),
+                'variants': download.get('variants', [])
+            })
+        
+        return {
             'images': images_downloaded,
             'image_metadata': image_metadata
         }
     except Exception as e:
-        logging.error(f"Error scraping {url}: {e}")
+        logging.error(f"Error collecting images for project {project_id}: {e}")
         raise HTTPException(status_code=400, detail=f"Failed to scrape URL: {str(e)}")
 
+# Near-duplicate source detection
+fingerprint_index = FingerprintIndex(db)
+
+# Compressed storage for large project bodies
+content_codec = ContentCodec(db)
+
+async def check_near_duplicate(collection: str, fingerprint: Optional[int], policy: DuplicatePolicy, message: str) -> Optional[Dict]:
+    """
+    Look up a near-duplicate source before spending LLM calls.
+    Returns the existing document when the policy is "reuse", raises 409 when it is "reject".
+    """
+    if policy == "allow":
+        return None
+    
+    duplicate = await fingerprint_index.find_near_duplicate(collection, fingerprint)
+    if not duplicate:
+        return None
+    
+    existing = await db[collection].find_one({"id": duplicate['doc_id']}, {"_id": 0})
+    if not existing:
+        # Stale index entry for a deleted document
+        await fingerprint_index.remove(collection, duplicate['doc_id'])
+        return None
+    
+    logging.info(f"♻️ Near-duplicate source in {collection}: {duplicate['doc_id']} (distance {duplicate['distance']})")
+    if policy == "reuse":
+        return existing
+    raise HTTPException(
+        status_code=409,
+        detail=f"{message} (ID: {duplicate['doc_id']})",
+        headers={"X-Duplicate-Of": duplicate['doc_id']}
+    )
+
+# List pagination
+async def paginate_or_400(collection, limit: int, cursor: Optional[str], projection: Optional[Dict] = None) -> Dict:
+    """One page of a list endpoint (summary projection); a malformed cursor is the client's error"""
+    try:
+        return await paginate(collection, {}, projection or {}, limit, cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
 # API Routes
 @api_router.get("/")
 async def root():
@@ -563,15 +763,16 @@ async def create_project(input: ProjectCreate):
     project_id = str(uuid.uuid4())
     
     if input.source_url:
-        # Scrape content from URL
-        scraped_data = await scrape_content(input.source_url, project_id)
+        # Scrape content from URL; images are collected after the duplicate check
+        scraped_data = await scrape_page(input.source_url)
         project_data = {
             'id': project_id,
             'title': scraped_data['title'],
             'source_url': input.source_url,
             'original_content': scraped_data['content'],
-            'images': scraped_data['images'],
-            'image_metadata': scraped_data.get('image_metadata', []),
+            'excerpt': make_excerpt(scraped_data['content']),
+            'images': [],
+            'image_metadata': [],
             'created_at': datetime.now(timezone.utc),
             'updated_at': datetime.now(timezone.utc)
         }
@@ -581,6 +782,7 @@ async def create_project(input: ProjectCreate):
             'id': project_id,
             'title': 'Untitled Project',
             'original_content': input.raw_text,
+            'excerpt': make_excerpt(input.raw_text),
             'images': [],
             'image_metadata': [],
             'created_at': datetime.now(timezone.utc),
@@ -589,28 +791,32 @@ async def create_project(input: ProjectCreate):
     else:
         raise HTTPException(status_code=400, detail="Either source_url or raw_text must be provided")
     
-    # Save to database
-    doc = project_data.copy()
-    doc['created_at'] = doc['created_at'].isoformat()
-    doc['updated_at'] = doc['updated_at'].isoformat()
+    # Skip near-duplicates of an existing project (same announcement from another outlet)
+    # before any image download or slug LLM call
+    fingerprint = compute_fingerprint(project_data['original_content'])
+    existing = await check_near_duplicate(
+        "projects", fingerprint, input.on_duplicate,
+        "Content is a near-duplicate of an existing project"
+    )
+    if existing:
+        return Project(**await content_codec.decode_fields("projects", existing))
     
-    await db.projects.insert_one(doc)
+    if input.source_url:
+        project_data.update(await collect_images(scraped_data['image_candidates'], project_id))
+    
+    # Save to database; large bodies are stored compressed
+    await db.projects.insert_one(await content_codec.encode_fields("projects", project_data))
+    await fingerprint_index.add("projects", project_id, fingerprint)
     
     return Project(**project_data)
 
-@api_router.get("/projects", response_model=List[Project])
-async def get_projects():
-    """Get all projects"""
-    projects = await db.projects.find({}, {"_id": 0}).sort('created_at', -1).to_list(1000)
-    
-    # Convert ISO strings to datetime
-    for project in projects:
-        if isinstance(project.get('created_at'), str):
-            project['created_at'] = datetime.fromisoformat(project['created_at'])
-        if isinstance(project.get('updated_at'), str):
-            project['updated_at'] = datetime.fromisoformat(project['updated_at'])
-    
-    return projects
+@api_router.get("/projects", response_model=Page[ProjectSummary])
+async def get_projects(
+    limit: int = Query(PAGE_SIZE_DEFAULT, ge=1, le=PAGE_SIZE_MAX),
+    cursor: Optional[str] = None
+):
+    """Get projects, newest first, one page at a time"""
+    return await paginate_or_400(db.projects, limit, cursor, PROJECT_SUMMARY_PROJECTION)
 
 @api_router.get("/projects/{project_id}", response_model=Project)
 async def get_project(project_id: str):
@@ -620,31 +826,48 @@ async def get_project(project_id: str):
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     
-    # Convert ISO strings to datetime
-    if isinstance(project.get('created_at'), str):
-        project['created_at'] = datetime.fromisoformat(project['created_at'])
-    if isinstance(project.get('updated_at'), str):
-        project['updated_at'] = datetime.fromisoformat(project['updated_at'])
+    return Project(**await content_codec.decode_fields("projects", project))
+
+async def store_translated_content(project_id: str, text: str, projection: Dict) -> Optional[Dict]:
+    """
+    Write a project's translation and drop the spilled body it replaced.
+    Returns the project (fields in projection, which must include translated_content)
+    as it is after the write, or None when the project doesn't exist.
+    """
+    translated = await content_codec.encode("projects", project_id, "translated_content", text)
+    changes = {
+        "translated_content": translated,
+        "excerpt": make_excerpt(text),
+        "updated_at": datetime.now(timezone.utc)
+    }
+    try:
+        # The pre-image names the exact spill this write replaces
+        previous = await db.projects.find_one_and_update(
+            {"id": project_id},
+            {"$set": changes},
+            projection=projection,
+            return_document=ReturnDocument.BEFORE
+        )
+    except Exception:
+        await content_codec.discard(translated)
+        raise
     
-    return Project(**project)
+    if not previous:
+        await content_codec.discard(translated)
+        return None
+    
+    await content_codec.discard(previous.get('translated_content'))
+    return {**previous, **changes, "translated_content": text}
 
 @api_router.put("/projects/{project_id}", response_model=Project)
 async def update_project(project_id: str, update: ProjectUpdate):
     """Update project's translated content"""
-    result = await db.projects.update_one(
-        {"id": project_id},
-        {
-            "$set": {
-                "translated_content": update.translated_content,
-                "updated_at": datetime.now(timezone.utc).isoformat()
-            }
-        }
-    )
+    project = await store_translated_content(project_id, update.translated_content, {"_id": 0})
     
-    if result.matched_count == 0:
+    if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     
-    return await get_project(project_id)
+    return await content_codec.decode_fields("projects", project)
 
 @api_router.delete("/projects/{project_id}")
 async def delete_project(project_id: str):
@@ -654,44 +877,83 @@ async def delete_project(project_id: str):
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Project not found")
     
+    await fingerprint_index.remove("projects", project_id)
+    await content_codec.release("projects", project_id)
+    
+    # Release the project's image references; unreferenced blobs are reclaimed by the sweeper
+    await image_store.release_project(project_id)
+    await remove_legacy_project_dir(IMAGES_DIR, project_id)
+    
     return {"message": "Project deleted successfully", "id": project_id}
 
 @api_router.get("/download-image")
-async def download_image_proxy(url: str, filename: str):
-    """Proxy endpoint to download images from external URLs with custom filename"""
-    try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        response = requests.get(url, headers=headers, timeout=15, stream=True)
-        response.raise_for_status()
-        
-        # Get content type
-        content_type = response.headers.get('content-type', 'image/jpeg')
-        
-        # Return streaming response with custom filename
-        from fastapi.responses import StreamingResponse
-        
-        def iterfile():
-            for chunk in response.iter_content(chunk_size=8192):
-                yield chunk
-        
-        return StreamingResponse(
-            iterfile(),
-            media_type=content_type,
-            headers={
-                "Content-Disposition": f'attachment; filename="{filename}"'
-            }
-        )
-    except Exception as e:
-        logging.error(f"Error downloading image from {url}: {e}")
-        raise HTTPException(status_code=400, detail=f"Failed to download image: {str(e)}")
+async def download_image_proxy(request: Request, url: str, filename: str):
+    """Download an image with a custom filename, served from the local image store when possible"""
+    headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
+    
+    # Images scraped into a project (or proxied before) are already on disk
+    stored = await image_store.find_by_source_url(url)
+    relative_path = stored['path'] if stored else None
+    
+    if not relative_path or not image_store.path_for(relative_path).exists():
+        # Not stored yet: fetch asynchronously and keep a copy for the next download
+        try:
+            processed = await acquire_image(url, make_variants=False)
+        except Exception as e:
+            logging.error(f"Error downloading image from {url}: {e}")
+            raise HTTPException(status_code=400, detail=f"Failed to download image: {str(e)}")
+        if not processed:
+            raise HTTPException(status_code=400, detail="Failed to download image: URL did not return a valid image")
+        relative_path = processed['original']['relative_path']
+    
+    return file_response(image_store.path_for(relative_path), request, headers=headers)
 
 
+@api_router.get("/projects/{project_id}/images.zip")
+async def download_project_images_zip(project_id: str):
+    """All stored images of a project in one ZIP, named by their slug filenames and streamed as it is built"""
+    project = await db.projects.find_one({"id": project_id}, {"_id": 0, "image_metadata": 1, "images": 1})
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+    
+    names = []
+    paths = []
+    for img in project.get('image_metadata') or []:
+        path = image_store.path_from_url(img.get('local_path'))
+        if not path:
+            # Projects scraped before local_path was recorded: look the source URL up in the store
+            stored = await image_store.find_by_source_url(img.get('url', ''))
+            if stored and image_store.path_for(stored['path']).is_file():
+                path = image_store.path_for(stored['path'])
+        if path:
+            names.append(img.get('filename') or path.name)
+            paths.append(path)
+    
+    # Older projects only have the local image list
+    if not project.get('image_metadata'):
+        for local_url in project.get('images') or []:
+            path = image_store.path_from_url(local_url)
+            if path:
+                names.append(path.name)
+                paths.append(path)
+    
+    if not paths:
+        raise HTTPException(status_code=404, detail="Project không có hình ảnh đã lưu để tải")
+    
+    entries = list(zip(unique_archive_names(names), paths))
+    return StreamingResponse(
+        stream_zip(entries),
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="{project_id}-images.zip"'}
+    )
+
 @api_router.post("/projects/{project_id}/translate")
 async def translate_content(project_id: str, request: TranslateRequest):
     """Translate and restructure content using Gemini with user's preset prompt"""
     
+    # Normalize HTML to compact markup (plain text is kept as is) and shorten image URLs to refs to cut prompt tokens
+    source_markup, image_refs = abbreviate_image_sources(compact_source(request.content))
+    
     # Define the translation function that will be tried with multiple keys
     async def _translate_with_key(api_key: str):
         chat = LlmChat(
@@ -778,7 +1040,7 @@ QUAN TRỌNG - FORMAT OUTPUT:
 - Meta description phải NGẮN GỌN, chỉ 2-3 lần độ dài của title
 
 Nội dung:
-{request.content}"""
+{source_markup}"""
         
         user_message = UserMessage(text=prompt)
         response = await chat.send_message(user_message)
@@ -798,20 +1060,17 @@ Nội dung:
     try:
         # Try with all available API keys
         cleaned_response = await api_key_manager.try_with_all_keys(_translate_with_key)
+        cleaned_response = restore_image_sources(cleaned_response, image_refs)
         
-        # Update database
-        await db.projects.update_one(
-            {"id": project_id},
-            {
-                "$set": {
-                    "translated_content": cleaned_response,
-                    "updated_at": datetime.now(timezone.utc).isoformat()
-                }
-            }
-        )
+        # Update database and return what was stored
+        stored = await store_translated_content(project_id, cleaned_response, {"_id": 0, "translated_content": 1})
+        if not stored:
+            raise HTTPException(status_code=404, detail="Project not found")
         
-        return {"translated_content": cleaned_response}
+        return {"translated_content": stored['translated_content']}
     
+    except HTTPException:
+        raise
     except Exception as e:
         logging.error(f"Translation error: {e}")
         raise HTTPException(status_code=500, detail=f"Translation failed: {str(e)}")
@@ -820,6 +1079,9 @@ Nội dung:
 async def generate_social_content(project_id: str, request: SocialGenerateRequest):
     """Generate social media content using Gemini with user's preset prompt"""
     
+    # Images don't matter for the post; send compact markup only
+    source_markup, _ = abbreviate_image_sources(compact_source(request.content))
+    
     # Define the generation function that will be tried with multiple keys
     async def _generate_with_key(api_key: str):
         chat = LlmChat(
@@ -890,7 +1152,7 @@ Cùng GFI tìm hiểu chi tiết về hướng tiếp cận kĩ thuật của Su
 ---
 
 BÀI VIẾT CẦN TẠO SOCIAL POST:
-{request.content}"""
+{source_markup}"""
         
         user_message = UserMessage(text=prompt)
         response = await chat.send_message(user_message)
@@ -908,19 +1170,25 @@ BÀI VIẾT CẦN TẠO SOCIAL POST:
         # Try with all available API keys
         social_content = await api_key_manager.try_with_all_keys(_generate_with_key)
         
-        # Update database
-        await db.projects.update_one(
+        # Update database and return what was stored
+        stored = await db.projects.find_one_and_update(
             {"id": project_id},
             {
                 "$set": {
                     "social_content": social_content,
-                    "updated_at": datetime.now(timezone.utc).isoformat()
+                    "updated_at": datetime.now(timezone.utc)
                 }
-            }
+            },
+            projection={"_id": 0, "social_content": 1},
+            return_document=ReturnDocument.AFTER
         )
+        if not stored:
+            raise HTTPException(status_code=404, detail="Project not found")
         
-        return social_content
+        return stored['social_content']
     
+    except HTTPException:
+        raise
     except Exception as e:
         logging.error(f"Social content generation error: {e}")
         raise HTTPException(status_code=500, detail=f"Social content generation failed: {str(e)}")
@@ -933,11 +1201,13 @@ async def create_kol_post(post_data: KOLPostCreate):
     await db.kol_posts.insert_one(post.dict())
     return post
 
-@api_router.get("/kol-posts", response_model=List[KOLPost])
-async def get_kol_posts():
-    """Get all KOL posts"""
-    posts = await db.kol_posts.find().sort("created_at", -1).to_list(100)
-    return posts
+@api_router.get("/kol-posts", response_model=Page[KOLPostSummary])
+async def get_kol_posts(
+    limit: int = Query(PAGE_SIZE_DEFAULT, ge=1, le=PAGE_SIZE_MAX),
+    cursor: Optional[str] = None
+):
+    """Get KOL posts, newest first, one page at a time"""
+    return await paginate_or_400(db.kol_posts, limit, cursor, KOL_POST_SUMMARY_PROJECTION)
 
 @api_router.get("/kol-posts/{post_id}", response_model=KOLPost)
 async def get_kol_post(post_id: str):
@@ -953,6 +1223,7 @@ async def delete_kol_post(post_id: str):
     result = await db.kol_posts.delete_one({"id": post_id})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="KOL post not found")
+    await fingerprint_index.remove("kol_posts", post_id)
     return {"message": "KOL post deleted successfully"}
 
 @api_router.post("/kol-posts/generate")
@@ -965,11 +1236,8 @@ async def generate_kol_post(request: KOLPostGenerate):
         # If source is URL, scrape the content
         if request.source_type == "url":
             try:
-                response = requests.get(request.information_source, timeout=15, headers={
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-                })
-                response.raise_for_status()
-                soup = BeautifulSoup(response.content, 'html.parser')
+                page = await fetch_page(request.information_source)
+                soup = BeautifulSoup(page['content'], 'html.parser', from_encoding=page['encoding'])
                 
                 # Remove script and style elements
                 for script in soup(["script", "style", "nav", "footer", "header", "aside"]):
@@ -979,22 +1247,25 @@ async def generate_kol_post(request: KOLPostGenerate):
                 title = soup.find('title')
                 title_text = title.get_text().strip() if title else ""
                 
-                # Get main content
-                main_content = ""
-                # Try to find main content areas
-                content_areas = soup.find_all(['article', 'main', 'div'], class_=lambda x: x and any(c in str(x).lower() for c in ['content', 'article', 'post', 'entry']))
-                if content_areas:
-                    main_content = ' '.join([area.get_text(separator=' ', strip=True) for area in content_areas])
-                else:
-                    # Fallback to all paragraph text
-                    paragraphs = soup.find_all('p')
-                    main_content = ' '.join([p.get_text(separator=' ', strip=True) for p in paragraphs])
+                # Get main content: outermost content areas only, boilerplate and repeated lines removed
+                main_content = extract_main_text(soup)
+                # Keep the most relevant passages within the prompt budget
+                main_content = select_passages(main_content, title_text, KOL_POST_TOKEN_BUDGET)
                 
                 information_content = f"Tiêu đề: {title_text}\n\nNội dung:\n{main_content}"
                 
             except Exception as e:
                 raise HTTPException(status_code=400, detail=f"Không thể cào nội dung từ URL: {str(e)}")
         
+        # Check for a near-duplicate source before spending an LLM call
+        fingerprint = compute_fingerprint(information_content)
+        existing = await check_near_duplicate(
+            "kol_posts", fingerprint, request.on_duplicate,
+            "Thông tin nguồn gần trùng với một bài KOL đã tạo trước đó"
+        )
+        if existing and existing.get('generated_content'):
+            return KOLPost(**existing)
+        
         # DQ Writing Style from PDF - Complete examples
         writing_style_examples = """
 Bài 1:
@@ -1114,13 +1385,17 @@ Hãy viết 1 bài post theo phong cách của bạn, kết hợp thông tin tr
             information_source=request.information_source,
             insight_required=request.insight_required,
             generated_content=generated_content,
-            source_type=request.source_type
+            source_type=request.source_type,
+            excerpt=make_excerpt(generated_content)
         )
         
         await db.kol_posts.insert_one(kol_post.dict())
+        await fingerprint_index.add("kol_posts", kol_post.id, fingerprint)
         
         return kol_post
     
+    except HTTPException:
+        raise
     except Exception as e:
         logging.error(f"KOL post generation error: {e}")
         raise HTTPException(status_code=500, detail=f"KOL post generation failed: {str(e)}")
@@ -1133,11 +1408,13 @@ async def create_news_article(news_data: NewsArticleGenerate):
     await db.news_articles.insert_one(news.dict())
     return news
 
-@api_router.get("/news", response_model=List[NewsArticle])
-async def get_news_articles():
-    """Get all news articles"""
-    articles = await db.news_articles.find().sort("created_at", -1).to_list(100)
-    return articles
+@api_router.get("/news", response_model=Page[NewsArticleSummary])
+async def get_news_articles(
+    limit: int = Query(PAGE_SIZE_DEFAULT, ge=1, le=PAGE_SIZE_MAX),
+    cursor: Optional[str] = None
+):
+    """Get news articles, newest first, one page at a time"""
+    return await paginate_or_400(db.news_articles, limit, cursor, NEWS_SUMMARY_PROJECTION)
 
 @api_router.get("/news/{news_id}", response_model=NewsArticle)
 async def get_news_article(news_id: str):
@@ -1150,19 +1427,21 @@ async def get_news_article(news_id: str):
 @api_router.put("/news/{news_id}", response_model=NewsArticle)
 async def update_news_article(news_id: str, update: NewsArticleUpdate):
     """Update news article content"""
-    result = await db.news_articles.update_one(
+    article = await db.news_articles.find_one_and_update(
         {"id": news_id},
         {
             "$set": {
                 "generated_content": update.generated_content,
-                "updated_at": datetime.now(timezone.utc).isoformat()
+                "excerpt": make_excerpt(update.generated_content),
+                "updated_at": datetime.now(timezone.utc)
             }
-        }
+        },
+        projection={"_id": 0},
+        return_document=ReturnDocument.AFTER
     )
-    if result.matched_count == 0:
+    if not article:
         raise HTTPException(status_code=404, detail="News article not found")
     
-    article = await db.news_articles.find_one({"id": news_id})
     return article
 
 @api_router.delete("/news/{news_id}")
@@ -1171,6 +1450,7 @@ async def delete_news_article(news_id: str):
     result = await db.news_articles.delete_one({"id": news_id})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="News article not found")
+    await fingerprint_index.remove("news_articles", news_id)
     return {"message": "News article deleted successfully"}
 
 @api_router.post("/news/generate")
@@ -1183,11 +1463,8 @@ async def generate_news_article(request: NewsArticleGenerate):
         # If source is URL, scrape the content
         if request.source_type == "url":
             try:
-                response = requests.get(request.source_content, timeout=15, headers={
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-                })
-                response.raise_for_status()
-                soup = BeautifulSoup(response.content, 'html.parser')
+                page = await fetch_page(request.source_content)
+                soup = BeautifulSoup(page['content'], 'html.parser', from_encoding=page['encoding'])
                 
                 # Remove script and style elements
                 for script in soup(["script", "style", "nav", "footer", "header", "aside"]):
@@ -1197,20 +1474,25 @@ async def generate_news_article(request: NewsArticleGenerate):
                 title = soup.find('title')
                 title_text = title.get_text().strip() if title else ""
                 
-                # Get main content
-                main_content = ""
-                content_areas = soup.find_all(['article', 'main', 'div'], class_=lambda x: x and any(c in str(x).lower() for c in ['content', 'article', 'post', 'entry']))
-                if content_areas:
-                    main_content = ' '.join([area.get_text(separator=' ', strip=True) for area in content_areas])
-                else:
-                    paragraphs = soup.find_all('p')
-                    main_content = ' '.join([p.get_text(separator=' ', strip=True) for p in paragraphs])
+                # Get main content: outermost content areas only, boilerplate and repeated lines removed
+                main_content = extract_main_text(soup)
+                # Keep the most relevant passages within the prompt budget
+                main_content = select_passages(main_content, title_text, NEWS_TOKEN_BUDGET)
                 
                 source_content = f"Title: {title_text}\n\nContent:\n{main_content}"
                 
             except Exception as e:
                 raise HTTPException(status_code=400, detail=f"Không thể cào nội dung từ URL: {str(e)}")
         
+        # Check for a near-duplicate source before spending an LLM call
+        fingerprint = compute_fingerprint(source_content)
+        existing = await check_near_duplicate(
+            "news_articles", fingerprint, request.on_duplicate,
+            "Nội dung nguồn gần trùng với một bản tin đã tạo trước đó"
+        )
+        if existing and existing.get('generated_content'):
+            return NewsArticle(**existing)
+        
         # Determine style based on choice
         style_instruction = ""
         if request.style_choice == "style1":
@@ -1337,13 +1619,17 @@ Nhận xét/Opinion từ người dùng:
             opinion=request.opinion,
             style_choice=request.style_choice,
             generated_content=generated_content,
-            source_type=request.source_type
+            source_type=request.source_type,
+            excerpt=make_excerpt(generated_content)
         )
         
         await db.news_articles.insert_one(news_article.dict())
+        await fingerprint_index.add("news_articles", news_article.id, fingerprint)
         
         return news_article
     
+    except HTTPException:
+        raise
     except Exception as e:
         logging.error(f"News generation error: {e}")
         raise HTTPException(status_code=500, detail=f"News generation failed: {str(e)}")
@@ -1356,11 +1642,13 @@ async def create_social_post(post_data: SocialPostGenerate):
     await db.social_posts.insert_one(post.dict())
     return post
 
-@api_router.get("/social-posts", response_model=List[SocialPost])
-async def get_social_posts():
-    """Get all social posts"""
-    posts = await db.social_posts.find().sort("created_at", -1).to_list(length=100)
-    return posts
+@api_router.get("/social-posts", response_model=Page[SocialPostSummary])
+async def get_social_posts(
+    limit: int = Query(PAGE_SIZE_DEFAULT, ge=1, le=PAGE_SIZE_MAX),
+    cursor: Optional[str] = None
+):
+    """Get social posts, newest first, one page at a time"""
+    return await paginate_or_400(db.social_posts, limit, cursor, SOCIAL_POST_SUMMARY_PROJECTION)
 
 @api_router.get("/social-posts/{post_id}", response_model=SocialPost)
 async def get_social_post(post_id: str):
@@ -1373,20 +1661,22 @@ async def get_social_post(post_id: str):
 @api_router.put("/social-posts/{post_id}", response_model=SocialPost)
 async def update_social_post(post_id: str, update: SocialPostUpdate):
     """Update social post content"""
-    result = await db.social_posts.update_one(
+    post = await db.social_posts.find_one_and_update(
         {"id": post_id},
         {
             "$set": {
                 "generated_content": update.generated_content,
+                "excerpt": make_excerpt(update.generated_content),
                 "updated_at": datetime.now(timezone.utc)
             }
-        }
+        },
+        projection={"_id": 0},
+        return_document=ReturnDocument.AFTER
     )
     
-    if result.matched_count == 0:
+    if not post:
         raise HTTPException(status_code=404, detail="Social post not found")
     
-    post = await db.social_posts.find_one({"id": post_id})
     return post
 
 @api_router.delete("/social-posts/{post_id}")
@@ -1407,27 +1697,28 @@ async def generate_social_post(request: SocialPostGenerate):
         if request.source_type == "url" and request.website_link:
             # Scrape website content from URL
             try:
-                response = requests.get(request.website_link, timeout=15, headers={
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-                })
-                soup = BeautifulSoup(response.content, 'html.parser')
+                page = await fetch_page(request.website_link)
+                soup = BeautifulSoup(page['content'], 'html.parser', from_encoding=page['encoding'])
                 
                 # Remove script and style elements
                 for script in soup(["script", "style"]):
                     script.decompose()
                 
-                # Get text content
-                website_content = soup.get_text(separator=' ', strip=True)
-                # Limit content length
-                website_content = website_content[:5000]
+                title = soup.find('title')
+                page_title = title.get_text().strip() if title else ""
+                
+                # Main article text, one block per line; whole-page text if no blocks were found
+                website_content = extract_main_text(soup) or soup.get_text(separator='\n', strip=True)
+                # Rank passages by relevance instead of cutting the page at a fixed length
+                website_content = select_passages(website_content, request.title or page_title, SOCIAL_POST_TOKEN_BUDGET)
                 
             except Exception as e:
                 logging.error(f"Error scraping website: {e}")
                 raise HTTPException(status_code=400, detail=f"Không thể cào nội dung từ URL: {str(e)}")
         
         elif request.source_type == "text" and request.website_content:
-            # Use provided text content
-            website_content = request.website_content[:5000]
+            # Use provided text content, ranked by relevance when it exceeds the budget
+            website_content = select_passages(request.website_content, request.title or "", SOCIAL_POST_TOKEN_BUDGET)
         
         if not website_content:
             raise HTTPException(status_code=400, detail="Vui lòng cung cấp URL hoặc nội dung website")
@@ -1494,7 +1785,7 @@ Hãy tạo bài viết social post theo đúng cấu trúc và tone đã chỉ 
         
         # Add website content
         if website_content:
-            user_message_parts.append(f"NỘI DUNG TỪ WEBSITE:\n{website_content[:3000]}")
+            user_message_parts.append(f"NỘI DUNG TỪ WEBSITE:\n{website_content}")
         
         # Add link if provided
         if request.website_link:
@@ -1544,7 +1835,8 @@ Hãy tạo bài viết social post theo đúng cấu trúc và tone đã chỉ 
             title=request.title,
             introduction=request.introduction,
             highlight=request.highlight,
-            generated_content=generated_content
+            generated_content=generated_content,
+            excerpt=make_excerpt(generated_content)
         )
         
         await db.social_posts.insert_one(social_post.dict())
@@ -1555,6 +1847,120 @@ Hãy tạo bài viết social post theo đúng cấu trúc và tone đã chỉ 
         logging.error(f"Social post generation error: {e}")
         raise HTTPException(status_code=500, detail=f"Social post generation failed: {str(e)}")
 
+# Feed ingestion endpoints
+async def refresh_project_from_url(project_id: str, url: str) -> bool:
+    """Re-scrape a changed feed entry into the project it created; False when that project is gone"""
+    current = await db.projects.find_one({"id": project_id}, {"_id": 0, "translated_content": 1})
+    if current is None:
+        return False
+    
+    started = datetime.now(timezone.utc)
+    scraped_data = await scrape_page(url)
+    images = await collect_images(scraped_data['image_candidates'], project_id)
+    changes = {
+        'title': scraped_data['title'],
+        'original_content': await content_codec.encode("projects", project_id, "original_content", scraped_data['content']),
+        'updated_at': datetime.now(timezone.utc),
+        **images
+    }
+    if not current.get('translated_content'):
+        # List excerpts come from the translation once there is one
+        changes['excerpt'] = make_excerpt(scraped_data['content'])
+    
+    previous = await db.projects.find_one_and_update(
+        {"id": project_id},
+        {"$set": changes},
+        projection={"_id": 0, "original_content": 1},
+        return_document=ReturnDocument.BEFORE
+    )
+    if not previous:
+        # Deleted while we scraped
+        await content_codec.discard(changes['original_content'])
+        await image_store.release_project(project_id)
+        return False
+    
+    await content_codec.discard(previous.get('original_content'))
+    # Images the page no longer uses; the ones it still uses were referenced again above
+    await image_store.release_project(project_id, referenced_before=started)
+    await fingerprint_index.add("projects", project_id, compute_fingerprint(scraped_data['content']))
+    logging.info(f"🔄 Refreshed project {project_id} from changed feed entry {url}")
+    return True
+
+async def ingest_project_from_url(url: str, target_id: Optional[str] = None) -> str:
+    """Feed handler: create a project from an entry URL, or refresh the one an earlier poll created"""
+    if target_id and await refresh_project_from_url(target_id, url):
+        return target_id
+    project = await create_project(ProjectCreate(source_url=url, on_duplicate="reuse"))
+    return project.id
+
+async def queue_news_from_url(url: str, target_id: Optional[str] = None) -> str:
+    """Feed handler: queue a news article (generated later from the editor); a changed entry bumps the queued one"""
+    if target_id:
+        queued = await db.news_articles.update_one(
+            {"id": target_id},
+            {"$set": {"updated_at": datetime.now(timezone.utc)}}
+        )
+        if queued.matched_count:
+            return target_id
+    news = await create_news_article(NewsArticleGenerate(source_content=url, source_type="url"))
+    return news.id
+
+feed_ingestor = FeedIngestor(db, {
+    "project": ingest_project_from_url,
+    "news": queue_news_from_url
+})
+
+# Seconds between background polls of all feeds (0 disables the poller)
+FEED_POLL_INTERVAL = int(os.environ.get('FEED_POLL_INTERVAL', 1800))
+
+@api_router.post("/feeds", response_model=Feed)
+async def create_feed(feed_data: FeedCreate):
+    """Register an RSS/Atom feed or sitemap to watch"""
+    if feed_data.target not in FEED_TARGETS:
+        raise HTTPException(status_code=400, detail=f"target must be one of: {', '.join(FEED_TARGETS)}")
+    if await db.feeds.find_one({"url": feed_data.url, "target": feed_data.target}, {"_id": 1}):
+        raise HTTPException(status_code=400, detail="Feed already registered")
+    
+    feed = Feed(**feed_data.dict())
+    await db.feeds.insert_one(feed.dict())
+    return feed
+
+@api_router.get("/feeds", response_model=List[Feed])
+async def get_feeds():
+    """Get all registered feeds"""
+    feeds = await db.feeds.find({}, {"_id": 0}).sort("created_at", -1).to_list(1000)
+    return feeds
+
+@api_router.delete("/feeds/{feed_id}")
+async def delete_feed(feed_id: str):
+    """Delete a feed and its seen-entry history"""
+    result = await db.feeds.delete_one({"id": feed_id})
+    if result.deleted_count == 0:
+        raise HTTPException(status_code=404, detail="Feed not found")
+    await db.feed_entries.delete_many({"feed_id": feed_id})
+    return {"message": "Feed deleted successfully"}
+
+@api_router.post("/feeds/{feed_id}/poll")
+async def poll_feed(feed_id: str):
+    """Poll a feed now and ingest its new/changed entries"""
+    feed = await db.feeds.find_one({"id": feed_id}, {"_id": 0})
+    if not feed:
+        raise HTTPException(status_code=404, detail="Feed not found")
+    return await feed_ingestor.poll_feed(feed)
+
+# Maintenance
+@api_router.post("/maintenance/sweep-images")
+async def sweep_images():
+    """Reclaim image storage nothing references any more and report what was freed"""
+    return await image_sweeper.sweep()
+
+@api_router.get("/maintenance/indexes")
+async def get_index_status():
+    """Declared Mongo indexes: present, missing or conflicting, builds in progress, and what startup built"""
+    status = await index_status(db)
+    status["startup"] = getattr(app.state, 'index_report', None)
+    return status
+
 # Include router
 app.include_router(api_router)
 
@@ -1565,6 +1971,7 @@ app.add_middleware(
     allow_origins=os.environ.get('CORS_ORIGINS', '*').split(','),
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Duplicate-Of"],
 )
 
 # Logging
@@ -1574,6 +1981,23 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+@app.on_event("startup")
+async def startup_tasks():
+    # Raises IndexConflictError on conflicting definitions, which aborts startup
+    app.state.index_report = await ensure_indexes(db)
+    # ISO-string timestamps from older releases are converted in the background
+    app.state.migrations = asyncio.create_task(run_migrations(db, content_codec, fingerprint_index))
+    if FEED_POLL_INTERVAL > 0:
+        app.state.feed_poller = asyncio.create_task(feed_ingestor.run_forever(FEED_POLL_INTERVAL))
+    if IMAGE_SWEEP_INTERVAL > 0:
+        app.state.image_sweeper = asyncio.create_task(image_sweeper.run_forever(IMAGE_SWEEP_INTERVAL))
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
-    client.close()
\ No newline at end of file
+    for task_name in ('feed_poller', 'image_sweeper', 'migrations'):
+        task = getattr(app.state, task_name, None)
+        if task:
+            task.cancel()
+    client.close()
+    await close_http_client()
+    image_processor.shutdown()
\ No newline at end of file
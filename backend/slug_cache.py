@@ -0,0 +1,68 @@
+"""Persistent English alt text -> Vietnamese slug cache for image filenames"""
+import re
+import unicodedata
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Optional
+
+from pymongo import UpdateOne
+
+# Alt texts that carry no meaning: "image-3", "IMG_1234.jpg", "DSC0042", "12", "photo"
+PLACEHOLDER_PATTERN = re.compile(
+    r'^(?:(?:image|img|photo|picture|pic|screenshot|screen shot|untitled|dsc|dscn|dcim|hinh|anh)'
+    r'[\s_\-]*(\d*)|(\d+))(?:\.(?:jpe?g|png|gif|webp|avif|svg))?$'
+)
+PLACEHOLDER_SLUG = 'hinh-anh'
+
+_WHITESPACE_PATTERN = re.compile(r'\s+')
+
+
+def normalize_alt_text(text: str) -> str:
+    """Cache key: width/case folded, whitespace collapsed, surrounding punctuation dropped"""
+    text = unicodedata.normalize('NFKC', text or '').lower()
+    text = _WHITESPACE_PATTERN.sub(' ', text)
+    return text.strip(' .,:;!?"\'()[]{}-_|')
+
+
+def placeholder_slug(key: str) -> Optional[str]:
+    """Slug for a placeholder alt text (no translation needed), or None if the text is meaningful"""
+    if not key:
+        return PLACEHOLDER_SLUG
+    match = PLACEHOLDER_PATTERN.match(key)
+    if not match:
+        return None
+    number = match.group(1) or match.group(2)
+    return f"{PLACEHOLDER_SLUG}-{number}" if number else PLACEHOLDER_SLUG
+
+
+class SlugCache:
+    """slug_cache collection: {key: normalized alt text, slug, created_at, last_used_at}"""
+
+    def __init__(self, db):
+        self.db = db
+
+    async def get_many(self, keys: Iterable[str]) -> Dict[str, str]:
+        keys = list(keys)
+        if not keys:
+            return {}
+        found = {}
+        async for entry in self.db.slug_cache.find({"key": {"$in": keys}}, {"_id": 0, "key": 1, "slug": 1}):
+            found[entry['key']] = entry['slug']
+        if found:
+            await self.db.slug_cache.update_many(
+                {"key": {"$in": list(found)}},
+                {"$set": {"last_used_at": datetime.now(timezone.utc)}}
+            )
+        return found
+
+    async def set_many(self, slugs: Dict[str, str]):
+        if not slugs:
+            return
+        now = datetime.now(timezone.utc)
+        await self.db.slug_cache.bulk_write([
+            UpdateOne(
+                {"key": key},
+                {"$set": {"slug": slug, "last_used_at": now}, "$setOnInsert": {"created_at": now}},
+                upsert=True
+            )
+            for key, slug in slugs.items()
+        ], ordered=False)
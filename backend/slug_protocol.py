@@ -0,0 +1,63 @@
+"""JSON request/response protocol for batch alt-text translation"""
+import os
+import re
+import json
+from typing import Dict, List, Sequence
+
+# Alt texts per LLM call; larger lists are split and translated in parallel
+SLUG_TRANSLATION_CHUNK_SIZE = int(os.environ.get('SLUG_TRANSLATION_CHUNK_SIZE', 25))
+# Follow-up calls for items that came back missing or invalid
+SLUG_TRANSLATION_RETRIES = int(os.environ.get('SLUG_TRANSLATION_RETRIES', 1))
+MAX_TRANSLATION_LENGTH = 200
+
+_CODE_FENCE_PATTERN = re.compile(r'^```(?:json)?\s*|\s*```$', re.MULTILINE)
+
+
+def chunked(items: Sequence, size: int) -> List[Sequence]:
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def build_translation_prompt(texts: Dict[str, str]) -> str:
+    """Prompt for {id: english_text}; the ids are echoed back so answers can't shift position"""
+    payload = json.dumps([{"id": item_id, "text": text} for item_id, text in texts.items()], ensure_ascii=False)
+    return f"""Translate the "text" of each item from English to simple, natural Vietnamese (used as image file names).
+Keep brand, product and token names unchanged.
+Return ONLY a JSON array with exactly one object per input item: [{{"id": "<same id>", "vi": "<Vietnamese translation>"}}]
+No explanations, no markdown.
+
+{payload}"""
+
+
+def _is_valid_translation(value) -> bool:
+    if not isinstance(value, str):
+        return False
+    value = value.strip()
+    return bool(value) and len(value) <= MAX_TRANSLATION_LENGTH and '\n' not in value and bool(re.search(r'\w', value))
+
+
+def parse_translation_response(response_text: str, expected_ids: Sequence[str]) -> Dict[str, str]:
+    """
+    Valid translations by id. Unknown ids, duplicates, empty or multi-line values are dropped,
+    so the caller can retry exactly the items that are missing from the result.
+    """
+    text = _CODE_FENCE_PATTERN.sub('', response_text.strip())
+    start, end = text.find('['), text.rfind(']')
+    if start == -1 or end < start:
+        return {}
+    try:
+        items = json.loads(text[start:end + 1])
+    except json.JSONDecodeError:
+        return {}
+    if not isinstance(items, list):
+        return {}
+
+    expected = set(expected_ids)
+    translations: Dict[str, str] = {}
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        item_id = str(item.get('id', ''))
+        value = item.get('vi')
+        if item_id in expected and item_id not in translations and _is_valid_translation(value):
+            translations[item_id] = value.strip()
+    return translations
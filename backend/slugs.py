@@ -0,0 +1,67 @@
+"""Vietnamese-aware slugs for image filenames"""
+import re
+import unicodedata
+from typing import Iterable, List, Optional, Set
+
+DEFAULT_SLUG = 'hinh-anh'
+MAX_SLUG_LENGTH = 80
+
+_NON_SLUG_PATTERN = re.compile(r'[^a-z0-9]+')
+
+
+def _build_accent_table() -> dict:
+    """
+    str.translate table folding every accented Latin letter (Vietnamese block included) to ASCII.
+    đ/Đ have no decomposition, so NFD alone misses them; they are mapped explicitly.
+    Stray combining marks (decomposed input) are deleted.
+    """
+    table = {}
+    for start, end in ((0x00C0, 0x024F), (0x1E00, 0x1EFF)):
+        for code_point in range(start, end + 1):
+            char = chr(code_point)
+            base = ''.join(c for c in unicodedata.normalize('NFD', char) if not unicodedata.combining(c))
+            if base != char and base.isascii() and base:
+                table[code_point] = base
+    table.update({ord('đ'): 'd', ord('Đ'): 'D', ord('ð'): 'd', ord('Ð'): 'D'})
+    for code_point in range(0x0300, 0x0370):
+        table[code_point] = None
+    return table
+
+
+_ACCENT_TABLE = _build_accent_table()
+
+
+def remove_accents(text: str) -> str:
+    """'Đường đi của Bitcoin' -> 'Duong di cua Bitcoin'"""
+    return text.translate(_ACCENT_TABLE)
+
+
+def slugify(text: str, max_length: int = MAX_SLUG_LENGTH) -> str:
+    """Lowercase ASCII slug with single hyphens; cut at a word boundary when longer than max_length"""
+    slug = _NON_SLUG_PATTERN.sub('-', remove_accents(text).lower()).strip('-')
+    if len(slug) > max_length:
+        slug = slug[:max_length + 1].rsplit('-', 1)[0] if '-' in slug[:max_length + 1] else slug[:max_length]
+    return slug
+
+
+def slugify_many(texts: Iterable[str], max_length: int = MAX_SLUG_LENGTH) -> List[str]:
+    return [slugify(text, max_length) for text in texts]
+
+
+def unique_slugs(slugs: Iterable[str], taken: Optional[Set[str]] = None, default: str = DEFAULT_SLUG) -> List[str]:
+    """
+    Make slugs unique within one project: repeats get -2, -3, ... suffixes.
+    Empty slugs fall back to default. taken holds slugs already used (updated in place).
+    """
+    used = taken if taken is not None else set()
+    unique = []
+    for slug in slugs:
+        slug = slug or default
+        candidate = slug
+        counter = 2
+        while candidate in used:
+            candidate = f"{slug}-{counter}"
+            counter += 1
+        used.add(candidate)
+        unique.append(candidate)
+    return unique
@@ -0,0 +1,146 @@
+"""File responses for stored images: HTTP Range support and cache headers on top of Starlette's static files"""
+import os
+import re
+import mimetypes
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import aiofiles
+from starlette.datastructures import Headers
+from starlette.requests import Request
+from starlette.responses import FileResponse, Response, StreamingResponse
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+
+RANGE_CHUNK_SIZE = 64 * 1024
+_RANGE_PATTERN = re.compile(r'^\s*bytes\s*=\s*(\d*)\s*-\s*(\d*)\s*$', re.IGNORECASE)
+
+# Content-addressed store paths never change content, so browsers may cache them forever
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+# Legacy per-project paths can be overwritten by a re-scrape, so they are revalidated
+MUTABLE_CACHE_CONTROL = os.environ.get('STATIC_CACHE_CONTROL', 'public, max-age=3600')
+_HASHED_PATH_PATTERN = re.compile(r'(?:^|/)store/[0-9a-f]{2}/[0-9a-f]{2}/([0-9a-f]{64})\.\w+$')
+
+# Scraped SVGs are served from our origin; opened directly they must not run scripts or
+# load anything, and navigating to one downloads it. <img> embedding is unaffected.
+SVG_HEADERS = {
+    'Content-Security-Policy': "default-src 'none'; style-src 'unsafe-inline'",
+    'Content-Disposition': 'attachment',
+    'X-Content-Type-Options': 'nosniff',
+}
+
+mimetypes.add_type('image/webp', '.webp')
+mimetypes.add_type('image/avif', '.avif')
+
+
+def parse_range_header(value: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single 'bytes=start-end' range into inclusive offsets.
+    Returns None when the header is absent, malformed or asks for several ranges (serve the whole file);
+    raises ValueError when the range cannot be satisfied.
+    """
+    match = _RANGE_PATTERN.match(value or '')
+    if not match or match.groups() == ('', ''):
+        return None
+    start_text, end_text = match.groups()
+    if not start_text:
+        # Suffix range: the last N bytes
+        length = int(end_text or 0)
+        if length == 0 or size == 0:
+            raise ValueError("Range not satisfiable")
+        return max(0, size - length), size - 1
+    start = int(start_text)
+    end = int(end_text) if end_text else size - 1
+    if start >= size or end < start:
+        raise ValueError("Range not satisfiable")
+    return start, min(end, size - 1)
+
+
+def accepts_encoding(accept_encoding: Optional[str], encoding: str) -> bool:
+    """True when an Accept-Encoding header allows the encoding (q=0 refuses it, '*' covers unlisted codings)"""
+    weights = {}
+    for part in (accept_encoding or '').split(','):
+        name, _, params = part.partition(';')
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        for param in params.split(';'):
+            key, _, value = param.partition('=')
+            if key.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        weights[name] = quality
+    return weights.get(encoding.lower(), weights.get('*', 0.0)) > 0
+
+
+async def _iter_file_range(path: Path, start: int, end: int):
+    async with aiofiles.open(path, 'rb') as f:
+        await f.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = await f.read(min(RANGE_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def file_response(path: Path, request: Request, media_type: Optional[str] = None,
+                  headers: Optional[Dict[str, str]] = None) -> Response:
+    """Serve a file from disk, answering Range requests with 206 Partial Content"""
+    stat = path.stat()
+    media_type = media_type or mimetypes.guess_type(path.name)[0] or 'application/octet-stream'
+    headers = {'Accept-Ranges': 'bytes', **(headers or {})}
+
+    try:
+        byte_range = parse_range_header(request.headers.get('range'), stat.st_size)
+    except ValueError:
+        return Response(status_code=416, headers={'Content-Range': f'bytes */{stat.st_size}'})
+
+    if byte_range is None:
+        return FileResponse(path, media_type=media_type, headers=headers, stat_result=stat)
+
+    start, end = byte_range
+    headers['Content-Range'] = f'bytes {start}-{end}/{stat.st_size}'
+    headers['Content-Length'] = str(end - start + 1)
+    return StreamingResponse(_iter_file_range(path, start, end), status_code=206, media_type=media_type, headers=headers)
+
+
+class CachedStaticFiles(StaticFiles):
+    """
+    StaticFiles with long-lived caching for content-addressed images: immutable Cache-Control,
+    the SHA-256 as a strong ETag, Range support, and precompressed .gz siblings when the client accepts gzip.
+    """
+
+    def file_response(self, full_path, stat_result: os.stat_result, scope, status_code: int = 200) -> Response:
+        request = Request(scope)
+        path = Path(full_path)
+        media_type = mimetypes.guess_type(path.name)[0] or 'application/octet-stream'
+
+        match = _HASHED_PATH_PATTERN.search(str(path).replace(os.sep, '/'))
+        sha256 = match.group(1) if match else None
+        headers = {'Cache-Control': IMMUTABLE_CACHE_CONTROL if sha256 else MUTABLE_CACHE_CONTROL}
+        if sha256:
+            headers['ETag'] = f'"{sha256}"'
+        if media_type == 'image/svg+xml':
+            headers.update(SVG_HEADERS)
+
+        compressed = path.with_name(path.name + '.gz')
+        if compressed.is_file():
+            headers['Vary'] = 'Accept-Encoding'
+        if compressed.is_file() and accepts_encoding(request.headers.get('accept-encoding'), 'gzip'):
+            headers['Content-Encoding'] = 'gzip'
+            if sha256:
+                # Strong ETags must differ between encodings of the same resource
+                headers['ETag'] = f'"{sha256}-gz"'
+            response = FileResponse(compressed, status_code=status_code, media_type=media_type, headers=headers)
+        elif status_code == 200:
+            response = file_response(path, request, media_type=media_type, headers=headers)
+        else:
+            response = FileResponse(path, status_code=status_code, media_type=media_type, headers=headers, stat_result=stat_result)
+
+        if response.status_code == 200 and self.is_not_modified(response.headers, Headers(scope=scope)):
+            return NotModifiedResponse(response.headers)
+        return response
@@ -0,0 +1,93 @@
+"""List-view summaries: short excerpts stored at write time and projections that leave bodies on the server"""
+import re
+from typing import Dict, Optional
+
+EXCERPT_LENGTH = 200
+
+_TAG_PATTERN = re.compile(r'<[^>]+>')
+# Markdown markers that would otherwise lead every excerpt: headings, emphasis, list bullets, images
+_MARKUP_PATTERN = re.compile(r'!\[[^\]]*\]\([^)]*\)|[#*_`>|]+|^\s*[-+]\s+', re.MULTILINE)
+_WHITESPACE_PATTERN = re.compile(r'\s+')
+
+
+def make_excerpt(text: Optional[str], length: int = EXCERPT_LENGTH) -> Optional[str]:
+    """Plain-text opening of an HTML or markdown body, cut at a word boundary"""
+    if not text:
+        return None
+    plain = _WHITESPACE_PATTERN.sub(' ', _MARKUP_PATTERN.sub(' ', _TAG_PATTERN.sub(' ', text))).strip()
+    if len(plain) <= length:
+        return plain or None
+    cut = plain[:length + 1].rsplit(' ', 1)[0] if ' ' in plain[:length + 1] else plain[:length]
+    return cut.rstrip(' ,.;:') + '…'
+
+
+def excerpt_from(document: Dict, *fields: str) -> Optional[str]:
+    """Excerpt of the first non-empty string field, the same order excerpt_expression falls back in"""
+    for field in fields:
+        value = document.get(field)
+        if isinstance(value, str) and value:
+            return make_excerpt(value)
+    return None
+
+
+def _is_string(field: str) -> Dict:
+    return {"$eq": [{"$type": f"${field}"}, "string"]}
+
+
+def excerpt_expression(*fields: str) -> Dict:
+    """
+    Stored excerpt, or for rows written before excerpts existed, the raw opening of the
+    first string field. $cond only evaluates the branch it takes, so non-string bodies are safe.
+    """
+    fallback = None
+    for field in reversed(fields):
+        fallback = {"$cond": [_is_string(field), {"$substrCP": [f"${field}", 0, EXCERPT_LENGTH]}, fallback]}
+    return {"$cond": [_is_string("excerpt"), "$excerpt", fallback]}
+
+
+def present_expression(field: str) -> Dict:
+    """True when the field is set and not an empty string"""
+    return {"$and": [{"$ifNull": [f"${field}", False]}, {"$ne": [f"${field}", ""]}]}
+
+
+# Project list excerpts come from the translation once there is one
+PROJECT_EXCERPT_FIELDS = ("translated_content", "original_content")
+
+PROJECT_SUMMARY_PROJECTION = {
+    "id": 1,
+    "title": 1,
+    "source_url": 1,
+    "created_at": 1,
+    "updated_at": 1,
+    "excerpt": excerpt_expression(*PROJECT_EXCERPT_FIELDS),
+    "has_translation": present_expression("translated_content"),
+    "has_social": present_expression("social_content.facebook"),
+    "image_count": {"$size": {"$ifNull": ["$image_metadata", []]}},
+}
+
+KOL_POST_SUMMARY_PROJECTION = {
+    "id": 1,
+    "source_type": 1,
+    "created_at": 1,
+    "updated_at": 1,
+    "excerpt": excerpt_expression("generated_content"),
+}
+
+NEWS_SUMMARY_PROJECTION = {
+    "id": 1,
+    "source_type": 1,
+    "style_choice": 1,
+    "created_at": 1,
+    "updated_at": 1,
+    "excerpt": excerpt_expression("generated_content"),
+}
+
+SOCIAL_POST_SUMMARY_PROJECTION = {
+    "id": 1,
+    "title": 1,
+    "website_link": 1,
+    "source_type": 1,
+    "created_at": 1,
+    "updated_at": 1,
+    "excerpt": excerpt_expression("generated_content"),
+}
@@ -15,6 +15,8 @@ const API = `${BACKEND_URL}/api`;
 
 const KOLPost = () => {
   const [posts, setPosts] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [loading, setLoading] = useState(false);
   const [generating, setGenerating] = useState(false);
   const [sourceType, setSourceType] = useState('text');
@@ -29,20 +31,39 @@ const KOLPost = () => {
     loadPosts();
   }, []);
 
-  const loadPosts = async () => {
-    setLoading(true);
+  // Without a cursor the list restarts from the newest; with one the next page is appended
+  const loadPosts = async (cursor = null) => {
+    if (cursor) {
+      setLoadingMore(true);
+    } else {
+      setLoading(true);
+    }
     try {
-      const response = await axios.get(`${API}/kol-posts`);
-      setPosts(response.data);
+      const response = await axios.get(`${API}/kol-posts`, { params: { cursor } });
+      setPosts((previous) => (cursor ? [...previous, ...response.data.items] : response.data.items));
+      setNextCursor(response.data.next_cursor);
     } catch (error) {
       console.error("Error loading posts:", error);
       toast.error("Không thể tải danh sách bài viết");
     } finally {
       setLoading(false);
+      setLoadingMore(false);
+    }
+  };
+
+  // List items are summaries; the full post is fetched when one is opened
+  const fetchPost = async (postId) => {
+    try {
+      const response = await axios.get(`${API}/kol-posts/${postId}`);
+      return response.data;
+    } catch (error) {
+      console.error("Error loading post:", error);
+      toast.error("Không thể tải bài viết");
+      return null;
     }
   };
 
-  const handleGenerate = async () => {
+  const handleGenerate = async (onDuplicate = 'reject') => {
     if (!informationSource.trim()) {
       toast.error('Vui lòng nhập thông tin nguồn');
       return;
@@ -57,7 +78,8 @@ const KOLPost = () => {
       const response = await axios.post(`${API}/kol-posts/generate`, {
         information_source: informationSource,
         insight_required: insightRequired,
-        source_type: sourceType
+        source_type: sourceType,
+        on_duplicate: onDuplicate
       });
       
       setGeneratedContent(response.data.generated_content);
@@ -72,6 +94,13 @@ const KOLPost = () => {
       setInformationSource('');
       setInsightRequired('');
     } catch (error) {
+      if (error.response?.status === 409 && onDuplicate === 'reject') {
+        // Near-duplicate source - let the editor decide whether to spend a generation
+        if (window.confirm(`${error.response.data.detail}\n\nVẫn tạo bài mới?`)) {
+          return await handleGenerate('allow');
+        }
+        return;
+      }
       console.error("Error generating post:", error);
       toast.error(error.response?.data?.detail || "Không thể tạo bài viết");
     } finally {
@@ -194,7 +223,7 @@ const KOLPost = () => {
 
               {/* Generate Button */}
               <Button
-                onClick={handleGenerate}
+                onClick={() => handleGenerate()}
                 disabled={generating}
                 className="w-full bg-[#E38400] hover:bg-[#c77200] text-white py-6 text-lg rounded-xl shadow-lg hover:shadow-xl transition-all"
               >
@@ -241,9 +270,11 @@ const KOLPost = () => {
                     <Card
                       key={post.id}
                       className="hover:shadow-lg transition-all cursor-pointer border-l-4 border-l-[#E38400]"
-                      onClick={() => {
-                        setCurrentPost(post);
-                        setGeneratedContent(post.generated_content);
+                      onClick={async () => {
+                        const full = await fetchPost(post.id);
+                        if (!full) return;
+                        setCurrentPost(full);
+                        setGeneratedContent(full.generated_content);
                         setShowPreview(true);
                       }}
                     >
@@ -264,7 +295,7 @@ const KOLPost = () => {
                               )}
                             </p>
                             <p className="text-sm font-medium text-gray-900 line-clamp-2 mb-2">
-                              {post.generated_content?.slice(0, 100)}...
+                              {post.excerpt}
                             </p>
                             <p className="text-xs text-gray-400">
                               {new Date(post.created_at).toLocaleString('vi-VN')}
@@ -285,6 +316,17 @@ const KOLPost = () => {
                       </CardContent>
                     </Card>
                   ))}
+                  {nextCursor && (
+                    <Button
+                      variant="outline"
+                      className="w-full"
+                      disabled={loadingMore}
+                      onClick={() => loadPosts(nextCursor)}
+                    >
+                      {loadingMore && <Loader2 className="mr-2 h-4 w-4 animate-spin" />}
+                      Xem thêm
+                    </Button>
+                  )}
                 </div>
               )}
             </CardContent>
@@ -16,6 +16,8 @@ const API = `${BACKEND_URL}/api`;
 
 const NewsGenerator = () => {
   const [articles, setArticles] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [loading, setLoading] = useState(false);
   const [generating, setGenerating] = useState(false);
   const [sourceType, setSourceType] = useState('text');
@@ -33,20 +35,39 @@ const NewsGenerator = () => {
     loadArticles();
   }, []);
 
-  const loadArticles = async () => {
-    setLoading(true);
+  // Without a cursor the list restarts from the newest; with one the next page is appended
+  const loadArticles = async (cursor = null) => {
+    if (cursor) {
+      setLoadingMore(true);
+    } else {
+      setLoading(true);
+    }
     try {
-      const response = await axios.get(`${API}/news`);
-      setArticles(response.data);
+      const response = await axios.get(`${API}/news`, { params: { cursor } });
+      setArticles((previous) => (cursor ? [...previous, ...response.data.items] : response.data.items));
+      setNextCursor(response.data.next_cursor);
     } catch (error) {
       console.error("Error loading articles:", error);
       toast.error("Không thể tải danh sách bài viết");
     } finally {
       setLoading(false);
+      setLoadingMore(false);
     }
   };
 
-  const handleGenerate = async () => {
+  // List items are summaries; the full article is fetched when one is opened
+  const fetchArticle = async (articleId) => {
+    try {
+      const response = await axios.get(`${API}/news/${articleId}`);
+      return response.data;
+    } catch (error) {
+      console.error("Error loading article:", error);
+      toast.error("Không thể tải bài viết");
+      return null;
+    }
+  };
+
+  const handleGenerate = async (onDuplicate = 'reject') => {
     if (!sourceContent.trim()) {
       toast.error('Vui lòng nhập nội dung nguồn');
       return;
@@ -58,7 +79,8 @@ const NewsGenerator = () => {
         source_content: sourceContent,
         opinion: opinion || null,
         style_choice: styleChoice,
-        source_type: sourceType
+        source_type: sourceType,
+        on_duplicate: onDuplicate
       });
       
       setGeneratedContent(response.data.generated_content);
@@ -74,6 +96,13 @@ const NewsGenerator = () => {
       setOpinion('');
       setStyleChoice('auto');
     } catch (error) {
+      if (error.response?.status === 409 && onDuplicate === 'reject') {
+        // Near-duplicate source - let the editor decide whether to spend a generation
+        if (window.confirm(`${error.response.data.detail}\n\nVẫn tạo bản tin mới?`)) {
+          return await handleGenerate('allow');
+        }
+        return;
+      }
       console.error("Error generating article:", error);
       toast.error(error.response?.data?.detail || "Không thể tạo tin tức");
     } finally {
@@ -265,7 +294,7 @@ const NewsGenerator = () => {
 
               {/* Generate Button */}
               <Button
-                onClick={handleGenerate}
+                onClick={() => handleGenerate()}
                 disabled={generating}
                 className="w-full bg-blue-600 hover:bg-blue-700 text-white py-6 text-lg rounded-xl shadow-lg hover:shadow-xl transition-all"
               >
@@ -312,9 +341,11 @@ const NewsGenerator = () => {
                     <Card
                       key={article.id}
                       className="hover:shadow-lg transition-all cursor-pointer border-l-4 border-l-blue-600"
-                      onClick={() => {
-                        setCurrentArticle(article);
-                        setGeneratedContent(article.generated_content);
+                      onClick={async () => {
+                        const full = await fetchArticle(article.id);
+                        if (!full) return;
+                        setCurrentArticle(full);
+                        setGeneratedContent(full.generated_content);
                         setShowPreview(true);
                       }}
                     >
@@ -340,7 +371,7 @@ const NewsGenerator = () => {
                               </span>
                             </div>
                             <p className="text-sm font-medium text-gray-900 line-clamp-2 mb-2">
-                              {article.generated_content?.slice(0, 100)}...
+                              {article.excerpt}
                             </p>
                             <p className="text-xs text-gray-400">
                               {new Date(article.created_at).toLocaleString('vi-VN')}
@@ -350,9 +381,10 @@ const NewsGenerator = () => {
                             <Button
                               variant="ghost"
                               size="sm"
-                              onClick={(e) => {
+                              onClick={async (e) => {
                                 e.stopPropagation();
-                                handleEditClick(article);
+                                const full = await fetchArticle(article.id);
+                                if (full) handleEditClick(full);
                               }}
                               className="text-blue-600 hover:text-blue-700 hover:bg-blue-50"
                             >
@@ -374,6 +406,17 @@ const NewsGenerator = () => {
                       </CardContent>
                     </Card>
                   ))}
+                  {nextCursor && (
+                    <Button
+                      variant="outline"
+                      className="w-full"
+                      disabled={loadingMore}
+                      onClick={() => loadArticles(nextCursor)}
+                    >
+                      {loadingMore && <Loader2 className="mr-2 h-4 w-4 animate-spin" />}
+                      Xem thêm
+                    </Button>
+                  )}
                 </div>
               )}
             </CardContent>
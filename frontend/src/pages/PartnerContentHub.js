@@ -18,21 +18,27 @@ const API = `${BACKEND_URL}/api`;
 const Dashboard = () => {
   const [projects, setProjects] = useState([]);
   const [loading, setLoading] = useState(true);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const navigate = useNavigate();
 
   useEffect(() => {
     loadProjects();
   }, []);
 
-  const loadProjects = async () => {
+  // Without a cursor the list restarts from the newest; with one the next page is appended
+  const loadProjects = async (cursor = null) => {
+    if (cursor) setLoadingMore(true);
     try {
-      const response = await axios.get(`${API}/projects`);
-      setProjects(response.data);
+      const response = await axios.get(`${API}/projects`, { params: { cursor } });
+      setProjects((previous) => (cursor ? [...previous, ...response.data.items] : response.data.items));
+      setNextCursor(response.data.next_cursor);
     } catch (error) {
       console.error("Error loading projects:", error);
       toast.error("Failed to load projects");
     } finally {
       setLoading(false);
+      setLoadingMore(false);
     }
   };
 
@@ -137,13 +143,13 @@ const Dashboard = () => {
                   </CardDescription>
                 </CardHeader>
                 <CardContent>
-                  <div className="space-y-2">{project.translated_content && (
+                  <div className="space-y-2">{project.has_translation && (
                       <div className="flex items-center text-xs text-green-600 bg-green-50 px-3 py-1 rounded-full w-fit">
                         <Sparkles className="h-3 w-3 mr-1" />
                         Translated
                       </div>
                     )}
-                    {project.social_content?.facebook && (
+                    {project.has_social && (
                       <div className="flex items-center text-xs text-blue-600 bg-blue-50 px-3 py-1 rounded-full w-fit">
                         <Share2 className="h-3 w-3 mr-1" />
                         Social Ready
@@ -155,6 +161,19 @@ const Dashboard = () => {
             ))}
           </div>
         )}
+
+        {nextCursor && (
+          <div className="flex justify-center mt-8">
+            <Button
+              onClick={() => loadProjects(nextCursor)}
+              disabled={loadingMore}
+              className="bg-white/10 hover:bg-white/20 text-white rounded-xl px-8"
+            >
+              {loadingMore && <Loader2 className="mr-2 h-4 w-4 animate-spin" />}
+              Xem thêm
+            </Button>
+          </div>
+        )}
       </div>
     </div>
   );
@@ -168,7 +187,7 @@ const CreateProject = () => {
   const [loading, setLoading] = useState(false);
   const navigate = useNavigate();
 
-  const handleSubmit = async () => {
+  const handleSubmit = async (onDuplicate = 'reject') => {
     if (!url && !rawText) {
       toast.error('Please provide a URL or text');
       return;
@@ -177,10 +196,22 @@ const CreateProject = () => {
     setLoading(true);
     try {
       const payload = inputType === 'url' ? { source_url: url } : { raw_text: rawText };
+      payload.on_duplicate = onDuplicate;
       const response = await axios.post(`${API}/projects`, payload);
       toast.success('Project created successfully!');
       navigate(`/partner-content-hub/workshop/${response.data.id}`);
     } catch (error) {
+      if (error.response?.status === 409 && onDuplicate === 'reject') {
+        // Near-duplicate source - open the existing project or create anyway
+        const duplicateId = error.response.headers?.['x-duplicate-of'];
+        if (window.confirm(`${error.response.data.detail}\n\nCreate a new project anyway? (Cancel opens the existing one)`)) {
+          return await handleSubmit('allow');
+        }
+        if (duplicateId) {
+          navigate(`/partner-content-hub/workshop/${duplicateId}`);
+        }
+        return;
+      }
       console.error('Error creating project:', error);
       toast.error(error.response?.data?.detail || 'Failed to create project');
     } finally {
@@ -254,7 +285,7 @@ const CreateProject = () => {
 
             <Button
               data-testid="submit-create-btn"
-              onClick={handleSubmit}
+              onClick={() => handleSubmit()}
               disabled={loading}
               className="w-full mt-6 h-12 text-base bg-[#E38400] hover:bg-[#C67300] text-white rounded-xl shadow-lg hover:shadow-xl transition-all"
             >
@@ -411,20 +442,15 @@ const Workshop = () => {
       return;
     }
 
-    toast.info(`Đang tải ${project.image_metadata.length} hình ảnh...`);
-    
-    // Download each image with a small delay to avoid overwhelming the browser
-    for (let i = 0; i < project.image_metadata.length; i++) {
-      const img = project.image_metadata[i];
-      await handleDownloadImage(img.url, img.filename);
-      
-      // Add delay between downloads
-      if (i < project.image_metadata.length - 1) {
-        await new Promise(resolve => setTimeout(resolve, 500));
-      }
-    }
-    
-    toast.success(`Đã tải xong ${project.image_metadata.length} hình ảnh!`);
+    // One ZIP streamed by the backend instead of one request per image
+    const link = document.createElement('a');
+    link.href = `${API}/projects/${project.id}/images.zip`;
+    link.download = `${project.id}-images.zip`;
+    document.body.appendChild(link);
+    link.click();
+    document.body.removeChild(link);
+
+    toast.success(`Đang tải ${project.image_metadata.length} hình ảnh (ZIP)...`);
   };
 
   const handleDeleteProject = async () => {
@@ -629,7 +655,9 @@ const Workshop = () => {
                       <div key={index} className="border border-slate-200 rounded-lg p-4 hover:border-[#E38400] transition-colors">
                         <div className="aspect-video bg-slate-100 rounded-md mb-3 flex items-center justify-center overflow-hidden">
                           <img 
-                            src={img.url} 
+                            src={img.local_path ? `${BACKEND_URL}${img.local_path}` : img.url} 
+                            srcSet={img.variants?.filter(v => v.format === 'webp').map(v => `${BACKEND_URL}${v.url} ${v.width}w`).join(', ') || undefined}
+                            sizes="(min-width: 1024px) 33vw, (min-width: 768px) 50vw, 100vw"
                             alt={img.alt_text}
                             className="w-full h-full object-cover"
                             onError={(e) => {
@@ -16,6 +16,8 @@ const API = `${BACKEND_URL}/api`;
 
 const SocialToWebsite = () => {
   const [posts, setPosts] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [loading, setLoading] = useState(false);
   const [generating, setGenerating] = useState(false);
   const [sourceType, setSourceType] = useState('url'); // 'url' or 'text'
@@ -35,16 +37,35 @@ const SocialToWebsite = () => {
     loadPosts();
   }, []);
 
-  const loadPosts = async () => {
-    setLoading(true);
+  // Without a cursor the list restarts from the newest; with one the next page is appended
+  const loadPosts = async (cursor = null) => {
+    if (cursor) {
+      setLoadingMore(true);
+    } else {
+      setLoading(true);
+    }
     try {
-      const response = await axios.get(`${API}/social-posts`);
-      setPosts(response.data);
+      const response = await axios.get(`${API}/social-posts`, { params: { cursor } });
+      setPosts((previous) => (cursor ? [...previous, ...response.data.items] : response.data.items));
+      setNextCursor(response.data.next_cursor);
     } catch (error) {
       console.error("Error loading posts:", error);
       toast.error("Không thể tải danh sách bài viết");
     } finally {
       setLoading(false);
+      setLoadingMore(false);
+    }
+  };
+
+  // List items are summaries; the full post is fetched when one is opened
+  const fetchPost = async (postId) => {
+    try {
+      const response = await axios.get(`${API}/social-posts/${postId}`);
+      return response.data;
+    } catch (error) {
+      console.error("Error loading post:", error);
+      toast.error("Không thể tải bài viết");
+      return null;
     }
   };
 
@@ -315,9 +336,11 @@ const SocialToWebsite = () => {
                     <Card
                       key={post.id}
                       className="hover:shadow-lg transition-all cursor-pointer border-l-4 border-l-green-600"
-                      onClick={() => {
-                        setCurrentPost(post);
-                        setGeneratedContent(post.generated_content);
+                      onClick={async () => {
+                        const full = await fetchPost(post.id);
+                        if (!full) return;
+                        setCurrentPost(full);
+                        setGeneratedContent(full.generated_content);
                         setShowPreview(true);
                       }}
                     >
@@ -325,7 +348,7 @@ const SocialToWebsite = () => {
                         <div className="flex justify-between items-start mb-2">
                           <div className="flex-1">
                             <p className="text-sm font-medium text-gray-900 line-clamp-2 mb-2">
-                              {post.generated_content?.slice(0, 100)}...
+                              {post.excerpt}
                             </p>
                             <p className="text-xs text-gray-400 truncate mb-1">
                               🌐 {post.website_link}
@@ -338,9 +361,10 @@ const SocialToWebsite = () => {
                             <Button
                               variant="ghost"
                               size="sm"
-                              onClick={(e) => {
+                              onClick={async (e) => {
                                 e.stopPropagation();
-                                handleEdit(post);
+                                const full = await fetchPost(post.id);
+                                if (full) handleEdit(full);
                               }}
                               className="hover:bg-blue-50"
                             >
@@ -349,9 +373,10 @@ const SocialToWebsite = () => {
                             <Button
                               variant="ghost"
                               size="sm"
-                              onClick={(e) => {
+                              onClick={async (e) => {
                                 e.stopPropagation();
-                                handleCopy(post.generated_content);
+                                const full = await fetchPost(post.id);
+                                if (full) handleCopy(full.generated_content);
                               }}
                               className="hover:bg-green-50"
                             >
@@ -373,6 +398,17 @@ const SocialToWebsite = () => {
                       </CardContent>
                     </Card>
                   ))}
+                  {nextCursor && (
+                    <Button
+                      variant="outline"
+                      className="w-full"
+                      disabled={loadingMore}
+                      onClick={() => loadPosts(nextCursor)}
+                    >
+                      {loadingMore && <Loader2 className="mr-2 h-4 w-4 animate-spin" />}
+                      Xem thêm
+                    </Button>
+                  )}
                 </div>
               )}
             </CardContent>
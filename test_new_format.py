@@ -41,12 +41,12 @@ def test_new_translation_format():
             print_error(f"Failed to get projects: {response.status_code}")
             return False
             
-        projects = response.json()
+        projects = response.json()['items']
         
         # Find a project with translated content
         test_project = None
         for project in projects:
-            if project.get('translated_content'):
+            if project.get('has_translation'):
                 test_project = project
                 break
         
@@ -55,6 +55,8 @@ def test_new_translation_format():
             return False
             
         project_id = test_project['id']
+        # The list returns summaries; the content comes from the project itself
+        test_project = requests.get(f"{BASE_URL}/projects/{project_id}", timeout=10).json()
         translated_content = test_project['translated_content']
         
         print_info(f"Testing project: {project_id}")
@@ -170,12 +172,12 @@ def test_social_content_format():
             print_error(f"Failed to get projects: {response.status_code}")
             return False
             
-        projects = response.json()
+        projects = response.json()['items']
         
         # Find a project with social content
         test_project = None
         for project in projects:
-            if project.get('social_content') and project.get('social_content', {}).get('facebook'):
+            if project.get('has_social'):
                 test_project = project
                 break
         
@@ -184,6 +186,7 @@ def test_social_content_format():
             return False
             
         project_id = test_project['id']
+        test_project = requests.get(f"{BASE_URL}/projects/{project_id}", timeout=10).json()
         social_content = test_project['social_content']['facebook']
         
         print_info(f"Testing social content from project: {project_id}")
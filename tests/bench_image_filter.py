@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-image ancestor walk (old scrape_content filter) vs precomputed exclusion map
+Run from the repo root: python tests/bench_image_filter.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'backend'))
+from html_extract import build_excluded_regions, is_in_excluded_region  # noqa: E402
+
+
+def legacy_is_excluded(img) -> bool:
+    """The filter scrape_content used before the exclusion map"""
+    for parent in img.parents:
+        parent_class = ' '.join(parent.get('class', [])).lower() if parent.get('class') else ''
+        parent_tag = parent.name if parent.name else ''
+        parent_id = (parent.get('id') or '').lower()
+        if any(term in parent_class for term in ['navigation', 'menu', 'footer', 'sidebar', 'widget', 'related']):
+            return True
+        if any(term in parent_id for term in ['nav', 'menu', 'footer', 'sidebar', 'widget']):
+            return True
+        if parent_tag == 'footer':
+            return True
+        if parent_tag in ['nav']:
+            return True
+    return False
+
+
+def build_gallery_page(images: int, depth: int) -> str:
+    """Gallery-heavy page: every image sits `depth` wrapper divs deep"""
+    opening = ''.join(f'<div class="wrapper level-{i}" id="w{i}">' for i in range(depth))
+    closing = '</div>' * depth
+    figures = ''.join(
+        f'<figure class="gallery-item"><img src="/img/{i}.jpg" alt="image {i}"></figure>'
+        for i in range(images)
+    )
+    sidebar = ''.join(f'<img src="/side/{i}.jpg">' for i in range(images // 10))
+    return (
+        f'<html><body><nav class="menu"><img src="/logo.png"></nav>'
+        f'<main>{opening}{figures}{closing}</main>'
+        f'<aside class="sidebar">{sidebar}</aside><footer><img src="/f.png"></footer></body></html>'
+    )
+
+
+def bench(label, func, repeat=5):
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    print(f"{label:<28} {best * 1000:8.2f} ms")
+    return result
+
+
+def main():
+    for images, depth in [(50, 10), (500, 20), (2000, 30)]:
+        soup = BeautifulSoup(build_gallery_page(images, depth), 'html.parser')
+        imgs = soup.find_all('img')
+        print(f"\n{len(imgs)} images, wrapper depth {depth}")
+
+        legacy = bench("legacy ancestor walk", lambda: [legacy_is_excluded(img) for img in imgs])
+
+        def precomputed():
+            excluded = build_excluded_regions(soup)
+            return [is_in_excluded_region(img, excluded) for img in imgs]
+
+        current = bench("precomputed exclusion map", precomputed)
+        assert legacy == current, "exclusion results differ"
+
+
+if __name__ == "__main__":
+    main()
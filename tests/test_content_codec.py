@@ -0,0 +1,47 @@
+import pytest
+from bson import BSON, Binary
+
+import content_codec
+from content_codec import ContentCodecError, decode_text, encode_text, is_encoded, spill_id
+
+ARTICLE = '<p>Succinct ra mắt mạng lưới prover phi tập trung cho SP1.</p>\n' * 2000
+
+
+def test_small_text_stays_a_string():
+    assert encode_text('short body') == ('short body', None)
+    assert encode_text(None) == (None, None)
+    assert decode_text('short body') == 'short body'
+
+
+def test_large_text_round_trips_through_zlib():
+    encoded, payload = encode_text(ARTICLE, 'zlib')
+    assert payload is None
+    assert is_encoded(encoded) and encoded['codec'] == 'zlib'
+    assert isinstance(encoded['data'], Binary)
+    assert encoded['size'] == len(ARTICLE.encode('utf-8'))
+    assert len(encoded['data']) < encoded['size'] // 10
+    assert decode_text(encoded) == ARTICLE
+
+
+def test_encoded_value_survives_bson():
+    encoded, _ = encode_text(ARTICLE, 'zlib')
+    stored = BSON.encode({'original_content': encoded}).decode()['original_content']
+    assert decode_text(stored) == ARTICLE
+
+
+def test_oversized_payload_spills_to_gridfs(monkeypatch):
+    monkeypatch.setattr(content_codec, 'CONTENT_GRIDFS_THRESHOLD', 100)
+    encoded, payload = encode_text(ARTICLE, 'zlib')
+    assert 'data' not in encoded and payload
+    with pytest.raises(ContentCodecError):
+        decode_text(encoded)
+    assert decode_text(encoded, payload) == ARTICLE
+    assert spill_id({**encoded, 'gridfs_id': 'abc'}) == 'abc'
+    assert spill_id('plain') is None
+
+
+def test_unknown_codec_is_an_error():
+    with pytest.raises(ContentCodecError):
+        encode_text(ARTICLE, 'brotli')
+    with pytest.raises(ContentCodecError):
+        decode_text({'codec': 'brotli', 'data': b'x'})
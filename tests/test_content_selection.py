@@ -0,0 +1,55 @@
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+from content_selection import estimate_tokens, select_passages, split_passages
+from html_extract import extract_main_text
+
+FIXTURES_DIR = Path(__file__).parent / 'fixtures'
+
+FILLER = "Unrelated background paragraph about market conditions and general crypto sentiment this week."
+
+
+def _article(relevant_position: int, total: int = 40) -> str:
+    blocks = [f"{FILLER} Paragraph {i}." for i in range(total)]
+    blocks[relevant_position] = (
+        "Hypercube proves Ethereum blocks in real time using multilinear polynomials, "
+        "the key result of the Succinct launch."
+    )
+    return '\n'.join(blocks)
+
+
+def test_text_within_budget_is_unchanged():
+    text = "Short intro.\nSecond line."
+    assert select_passages(text, "Title", 1000) is text
+
+
+def test_selection_respects_budget_and_keeps_order():
+    text = _article(25)
+    selected = select_passages(text, "Succinct Hypercube proves Ethereum in real time", 300)
+    assert estimate_tokens(selected) <= 300
+    lines = split_passages(selected)
+    original = split_passages(text)
+    assert [original.index(line) for line in lines] == sorted(original.index(line) for line in lines)
+
+
+def test_title_relevant_passage_survives_where_truncation_drops_it():
+    text = _article(30)
+    budget = 300
+    relevant = split_passages(text)[30]
+    assert relevant not in text[:budget * 4]
+    assert relevant in select_passages(text, "Succinct Hypercube real-time Ethereum proving", budget)
+
+
+def test_oversized_single_passage_is_cut():
+    text = "word " * 5000
+    selected = select_passages(text, "", 100)
+    assert 0 < len(selected) <= 400
+
+
+def test_fixture_article_prefers_body_over_short_fragments():
+    soup = BeautifulSoup((FIXTURES_DIR / 'article_page.html').read_text(encoding='utf-8'), 'html.parser')
+    text = extract_main_text(soup)
+    selected = select_passages(text, soup.title.get_text(), estimate_tokens(text) // 2)
+    assert selected
+    assert estimate_tokens(selected) <= estimate_tokens(text) // 2
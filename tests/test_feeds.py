@@ -0,0 +1,95 @@
+import gzip
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from feeds import FEED_MAX_ATTEMPTS, FeedParseError, is_entry_changed, parse_feed, parse_feed_date, retry_delay
+
+RSS = b"""<?xml version="1.0"?>
+<rss version="2.0"><channel><title>Blog</title>
+  <item><title>First</title><link>https://blog.example.com/first</link>
+    <pubDate>Mon, 06 Oct 2025 10:00:00 GMT</pubDate></item>
+  <item><title>Second</title><guid>https://blog.example.com/second</guid></item>
+</channel></rss>"""
+
+ATOM = b"""<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+  <entry><title>Launch</title>
+    <link rel="self" href="https://blog.example.com/launch.atom"/>
+    <link rel="alternate" href="https://blog.example.com/launch"/>
+    <updated>2025-10-07T08:30:00Z</updated></entry>
+</feed>"""
+
+SITEMAP = b"""<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <url><loc>https://blog.example.com/a</loc><lastmod>2025-10-01</lastmod></url>
+  <url><loc>https://blog.example.com/b</loc></url>
+</urlset>"""
+
+SITEMAP_INDEX = b"""<?xml version="1.0" encoding="UTF-8"?>
+<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <sitemap><loc>https://blog.example.com/post-sitemap.xml</loc><lastmod>2025-10-02T00:00:00+00:00</lastmod></sitemap>
+</sitemapindex>"""
+
+
+def test_parse_rss():
+    document = parse_feed(RSS)
+    assert document['kind'] == 'rss'
+    assert [e['url'] for e in document['entries']] == ['https://blog.example.com/first', 'https://blog.example.com/second']
+    assert document['entries'][0]['lastmod'] == datetime(2025, 10, 6, 10, 0, tzinfo=timezone.utc)
+    assert document['entries'][1]['lastmod'] is None
+
+
+def test_parse_atom_uses_alternate_link():
+    document = parse_feed(ATOM)
+    assert document['kind'] == 'atom'
+    assert document['entries'][0]['url'] == 'https://blog.example.com/launch'
+    assert document['entries'][0]['title'] == 'Launch'
+
+
+def test_parse_sitemap_and_gzip():
+    for content in (SITEMAP, gzip.compress(SITEMAP)):
+        document = parse_feed(content)
+        assert document['kind'] == 'sitemap'
+        assert [e['url'] for e in document['entries']] == ['https://blog.example.com/a', 'https://blog.example.com/b']
+
+
+def test_parse_sitemap_index():
+    document = parse_feed(SITEMAP_INDEX)
+    assert document['kind'] == 'sitemapindex'
+    assert document['entries'][0]['url'] == 'https://blog.example.com/post-sitemap.xml'
+
+
+def test_rejects_html():
+    with pytest.raises(FeedParseError):
+        parse_feed(b'<html><body>Not a feed</body></html>')
+
+
+def test_entry_change_detection():
+    old = parse_feed_date('2025-10-01T00:00:00Z')
+    new = parse_feed_date('2025-10-05T00:00:00Z')
+    assert is_entry_changed({'url': 'u', 'lastmod': old}, None)
+    assert not is_entry_changed({'url': 'u', 'lastmod': old}, {'lastmod': old, 'status': 'ingested'})
+    assert is_entry_changed({'url': 'u', 'lastmod': new}, {'lastmod': old, 'status': 'ingested'})
+    assert not is_entry_changed({'url': 'u', 'lastmod': None}, {'lastmod': old, 'status': 'baseline'})
+    assert is_entry_changed({'url': 'u', 'lastmod': None}, {'lastmod': None, 'status': 'failed'})
+    # Mongo returns naive UTC datetimes
+    assert is_entry_changed({'url': 'u', 'lastmod': new}, {'lastmod': old.replace(tzinfo=None), 'status': 'ingested'})
+
+
+def test_failed_entries_back_off_then_give_up():
+    now = parse_feed_date('2025-10-05T12:00:00Z')
+    entry = {'url': 'u', 'lastmod': None}
+    waiting = {'lastmod': None, 'status': 'failed', 'attempts': 2, 'next_attempt_at': now + timedelta(minutes=5)}
+    assert not is_entry_changed(entry, waiting, now)
+    assert is_entry_changed(entry, waiting, now + timedelta(minutes=5))
+    # Mongo returns naive UTC datetimes
+    assert is_entry_changed(entry, {**waiting, 'next_attempt_at': now.replace(tzinfo=None)}, now)
+    exhausted = {'lastmod': None, 'status': 'failed', 'attempts': FEED_MAX_ATTEMPTS, 'next_attempt_at': now}
+    assert not is_entry_changed(entry, exhausted, now + timedelta(days=30))
+
+
+def test_retry_delay_doubles_up_to_the_cap():
+    assert retry_delay(2) == 2 * retry_delay(1)
+    assert retry_delay(3) == 4 * retry_delay(1)
+    assert retry_delay(100) == retry_delay(101)
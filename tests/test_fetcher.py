@@ -0,0 +1,127 @@
+import asyncio
+
+import httpx
+import pytest
+
+import fetcher
+from fetcher import FetchError, HostScheduler, fetch_url, sniff_charset, charset_from_content_type
+
+
+@pytest.fixture(autouse=True)
+def fast_scheduler(monkeypatch):
+    """No politeness delay or real backoff sleeps in tests"""
+    scheduler = HostScheduler(max_per_host=2, min_interval=0, max_retries=2, base_backoff=0.001)
+    monkeypatch.setattr(fetcher, 'host_scheduler', scheduler)
+    return scheduler
+
+
+def run_with_transport(handler, coro_factory):
+    """Run a fetch against an httpx MockTransport instead of the network"""
+    async def runner():
+        fetcher._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        try:
+            return await coro_factory()
+        finally:
+            await fetcher.close_http_client()
+    return asyncio.run(runner())
+
+
+def test_rejects_wrong_content_type_before_body():
+    def handler(request):
+        return httpx.Response(200, headers={'content-type': 'application/zip'}, content=b'PK' * 10)
+
+    with pytest.raises(FetchError, match='Unsupported content type'):
+        run_with_transport(handler, lambda: fetch_url('https://example.com/file.zip'))
+
+
+def test_aborts_when_declared_length_exceeds_cap():
+    def handler(request):
+        return httpx.Response(200, headers={'content-type': 'text/html', 'content-length': '999999'}, content=b'x')
+
+    with pytest.raises(FetchError, match='too large'):
+        run_with_transport(handler, lambda: fetch_url('https://example.com/', max_bytes=1000))
+
+
+def test_aborts_streamed_body_over_cap():
+    async def body():
+        for _ in range(10):
+            yield b'a' * 512
+
+    def handler(request):
+        return httpx.Response(200, headers={'content-type': 'text/html'}, content=body())
+
+    with pytest.raises(FetchError, match='exceeded'):
+        run_with_transport(handler, lambda: fetch_url('https://example.com/', max_bytes=2000))
+
+
+def test_detects_charset_from_meta_tag():
+    html = '<html><head><meta charset="windows-1258"></head><body>Xin chào</body></html>'.encode('cp1258')
+
+    def handler(request):
+        return httpx.Response(200, headers={'content-type': 'text/html'}, content=html)
+
+    page = run_with_transport(handler, lambda: fetch_url('https://example.com/'))
+    assert page['encoding'] == 'cp1258'
+    assert page['content'] == html
+
+
+def test_charset_helpers():
+    assert charset_from_content_type('text/html; charset=UTF-8') == 'utf-8'
+    assert charset_from_content_type('text/html') is None
+    assert sniff_charset(b'\xef\xbb\xbf<html>') == 'utf-8'
+    assert sniff_charset(b'<meta http-equiv="Content-Type" content="text/html; charset=iso-8859-1">') == 'iso8859-1'
+
+
+def test_retries_server_errors_then_succeeds():
+    attempts = []
+
+    def handler(request):
+        attempts.append(request.url)
+        if len(attempts) < 3:
+            return httpx.Response(503)
+        return httpx.Response(200, headers={'content-type': 'text/html'}, content=b'<p>ok</p>')
+
+    page = run_with_transport(handler, lambda: fetch_url('https://example.com/'))
+    assert page['content'] == b'<p>ok</p>'
+    assert len(attempts) == 3
+
+
+def test_does_not_retry_client_errors():
+    attempts = []
+
+    def handler(request):
+        attempts.append(request.url)
+        return httpx.Response(404)
+
+    with pytest.raises(FetchError, match='HTTP 404'):
+        run_with_transport(handler, lambda: fetch_url('https://example.com/missing'))
+    assert len(attempts) == 1
+
+
+def test_limits_concurrency_per_host_only():
+    in_flight = {}
+    peak = {}
+
+    async def handler(request):
+        host = request.url.host
+        in_flight[host] = in_flight.get(host, 0) + 1
+        peak[host] = max(peak.get(host, 0), in_flight[host])
+        await asyncio.sleep(0.01)
+        in_flight[host] -= 1
+        return httpx.Response(200, headers={'content-type': 'text/html'}, content=b'ok')
+
+    async def fetch_many():
+        urls = [f'https://a.example/{i}' for i in range(6)] + [f'https://b.example/{i}' for i in range(6)]
+        return await asyncio.gather(*(fetch_url(url) for url in urls))
+
+    run_with_transport(handler, fetch_many)
+    assert peak == {'a.example': 2, 'b.example': 2}
+
+
+def test_adaptive_timeout_follows_host_latency():
+    scheduler = HostScheduler(min_timeout=5, max_timeout=30)
+    assert scheduler.get_timeout('slow.example', 15) == 15
+    scheduler.record_latency('slow.example', 4)
+    assert scheduler.get_timeout('slow.example', 15) == 16
+    scheduler.record_latency('fast.example', 0.1)
+    assert scheduler.get_timeout('fast.example', 15) == 5
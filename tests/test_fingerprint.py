@@ -0,0 +1,77 @@
+import random
+
+from fingerprint import (
+    compute_fingerprint, fingerprint_bands, hamming_distance, MAX_DUPLICATE_DISTANCE
+)
+
+ANNOUNCEMENT = (
+    "Succinct Labs today announced SP1 Hypercube, a zkVM that proves Ethereum blocks in real time. "
+    "The new prover uses multilinear polynomials instead of univariate polynomials and proves "
+    "ninety-three percent of mainnet blocks in under twelve seconds on a cluster of GPUs. "
+    "The team says real-time proving removes one of the biggest barriers for ZK rollups that want "
+    "Ethereum-level finality, and plans to open source the prover after a security audit later this year. "
+    "Developers can already try the testnet release and read the technical paper on the Succinct blog."
+)
+
+REWRITE = (
+    "<p>SUCCINCT LABS TODAY ANNOUNCED SP1 Hypercube, a zkVM that proves Ethereum blocks in real time!</p> "
+    "The new prover uses multilinear polynomials instead of univariate polynomials and proves "
+    "ninety-three percent of mainnet blocks in under twelve seconds on a cluster of GPUs. "
+    "The team says real-time proving removes one of the biggest barriers for ZK rollups that want "
+    "Ethereum-level finality, and plans to open source the prover after a security audit later this year. "
+    "Developers can already try the testnet release and read the technical paper on the Succinct blog. "
+    "Source: The Block."
+)
+
+UNRELATED = (
+    "Bitcoin ETFs recorded their largest weekly inflows since launch as institutional investors returned "
+    "to the market. Analysts at several trading desks pointed to falling real yields and a weaker dollar, "
+    "while on-chain data showed long-term holders continuing to accumulate. Trading volume on spot "
+    "exchanges rose sharply, and funding rates on perpetual futures stayed positive for most of the week, "
+    "suggesting leveraged traders are positioned for further upside in the coming sessions."
+)
+
+
+def test_rewrites_are_near_duplicates():
+    a = compute_fingerprint(ANNOUNCEMENT)
+    b = compute_fingerprint(REWRITE)
+    assert hamming_distance(a, b) <= MAX_DUPLICATE_DISTANCE
+
+
+def test_unrelated_texts_are_far_apart():
+    a = compute_fingerprint(ANNOUNCEMENT)
+    c = compute_fingerprint(UNRELATED)
+    assert hamming_distance(a, c) > MAX_DUPLICATE_DISTANCE * 3
+
+
+def test_short_texts_are_not_fingerprinted():
+    assert compute_fingerprint("Bitcoin hits $100k") is None
+    assert compute_fingerprint("") is None
+
+
+def test_near_duplicates_share_a_band():
+    a = compute_fingerprint(ANNOUNCEMENT)
+    rng = random.Random(7)
+    for _ in range(200):
+        flipped = a
+        for bit in rng.sample(range(64), MAX_DUPLICATE_DISTANCE):
+            flipped ^= 1 << bit
+        assert set(fingerprint_bands(a)) & set(fingerprint_bands(flipped))
+
+
+def test_banded_lookup_compares_few_candidates_over_large_index():
+    """Same candidate selection the Mongo band index does, over 50k documents"""
+    rng = random.Random(42)
+    fingerprints = [rng.getrandbits(64) for _ in range(50000)]
+    by_band = {}
+    for doc_id, fp in enumerate(fingerprints):
+        for band in fingerprint_bands(fp):
+            by_band.setdefault(band, []).append(doc_id)
+
+    target = fingerprints[12345] ^ 0b101  # distance 2
+    candidates = {doc_id for band in fingerprint_bands(target) for doc_id in by_band.get(band, [])}
+    matches = [doc_id for doc_id in candidates if hamming_distance(target, fingerprints[doc_id]) <= MAX_DUPLICATE_DISTANCE]
+
+    assert matches == [12345]
+    # Only documents sharing a band are compared, not the whole index
+    assert len(candidates) < 50
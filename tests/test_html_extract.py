@@ -0,0 +1,182 @@
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+from html_extract import (
+    build_excluded_regions, is_in_excluded_region, get_image_source,
+    is_tracking_pixel, is_unwanted_image, compact_html, compact_source,
+    abbreviate_image_sources, restore_image_sources, extract_main_text
+)
+
+FIXTURES_DIR = Path(__file__).parent / 'fixtures'
+
+
+def load_fixture_soup(name='article_page.html'):
+    return BeautifulSoup((FIXTURES_DIR / name).read_text(encoding='utf-8'), 'html.parser')
+
+
+def select_article_images(soup):
+    """Same filter chain as scrape_content"""
+    excluded = build_excluded_regions(soup)
+    selected = []
+    for img in soup.find_all('img'):
+        src = get_image_source(img)
+        if not src or is_in_excluded_region(img, excluded):
+            continue
+        if is_tracking_pixel(img, src) or is_unwanted_image(img):
+            continue
+        selected.append(src)
+    return selected
+
+
+def test_image_filter_keeps_only_article_images():
+    soup = load_fixture_soup()
+    assert select_article_images(soup) == [
+        '/images/blog-header-aspect.png',
+        '/images/benchmark-chart.png',
+    ]
+
+
+def test_excluded_regions_cover_nested_descendants():
+    soup = BeautifulSoup(
+        '<div id="sidebar-left"><section><div><p><img src="a.png"></p></div></section></div>'
+        '<div class="main"><img src="b.png"></div>',
+        'html.parser'
+    )
+    excluded = build_excluded_regions(soup)
+    nested, body = soup.find_all('img')
+    assert is_in_excluded_region(nested, excluded)
+    assert not is_in_excluded_region(body, excluded)
+
+
+def test_data_uri_only_images_have_no_source():
+    soup = BeautifulSoup('<img src="data:image/png;base64,AAAA">', 'html.parser')
+    assert get_image_source(soup.img) is None
+
+
+def test_tracking_pixel_detection():
+    soup = BeautifulSoup(
+        '<img src="/a.png" width="1" height="1">'
+        '<img src="https://stats.example.com/pixel.gif?u=1">'
+        '<img src="/chart.png" width="800">',
+        'html.parser'
+    )
+    pixel, beacon, chart = soup.find_all('img')
+    assert is_tracking_pixel(pixel, pixel['src'])
+    assert is_tracking_pixel(beacon, beacon['src'])
+    assert not is_tracking_pixel(chart, chart['src'])
+
+
+def test_compact_html_keeps_only_semantic_markup():
+    soup = load_fixture_soup()
+    article = soup.select_one('article')
+    compact = compact_html(article, base_url='https://blog.succinct.xyz/posts/sp1')
+
+    assert 'class=' not in compact and 'style=' not in compact and '<div' not in compact
+    assert '<h2>Multilinear polynomials</h2>' in compact
+    # Relative and lazy-loaded sources are resolved; trackers and avatars are dropped
+    assert '<img src="https://blog.succinct.xyz/images/benchmark-chart.png" alt="Benchmark chart">' in compact
+    assert 'facebook.com/tr' not in compact and 'spacer.png' not in compact and 'jane.jpg' not in compact
+    assert '<p>Proving times across block sizes</p>' in compact
+    assert len(compact) < len(str(article)) * 0.8
+
+
+def test_compact_html_is_idempotent():
+    compact = compact_html(load_fixture_soup().select_one('article'))
+    assert compact_html(compact) == compact
+
+
+def test_compact_html_strips_wrapper_noise():
+    noisy = (
+        '<div class="elementor-widget-container" data-id="8f2a" style="margin:0">'
+        '<div class="elementor-text-editor elementor-clearfix"><p class="has-text-align-left" '
+        'data-block="core/paragraph">Staking rewards <a class="link" href="/docs" target="_blank" '
+        'rel="noopener">are paid</a> every <span style="font-weight:700">epoch</span>.</p></div></div>'
+    )
+    compact = compact_html(noisy, base_url='https://example.com/blog/')
+    assert compact == '<p>Staking rewards <a href="https://example.com/docs">are paid</a> every epoch.</p>'
+
+
+def test_compact_source_leaves_plain_text_alone():
+    text = "Para one.\n\nPara two.\n## Heading\n- a\nUse a<b and x>y comparisons"
+    assert compact_source(text) == text
+
+
+def test_compact_source_compacts_html():
+    assert compact_source('<div class="x"><p>One</p><p>Two<br>lines</p></div>') == '<p>One</p>\n<p>Two<br>lines</p>'
+
+
+def test_compact_html_drops_doctype():
+    compact = compact_html('<!DOCTYPE html><html><body><p>Body</p></body></html>')
+    assert compact == '<p>Body</p>'
+
+
+def test_image_refs_round_trip():
+    compact = (
+        '<p>Intro</p>\n<img src="https://cdn.example.com/a.png?w=1200&amp;q=80" alt="A">\n'
+        '<img src="https://cdn.example.com/b.png" alt="B">\n<img src="https://cdn.example.com/a.png?w=1200&amp;q=80" alt="A again">'
+    )
+    short, mapping = abbreviate_image_sources(compact)
+    assert 'cdn.example.com' not in short
+    assert short.count('src="img-1"') == 2 and 'src="img-2"' in short
+    assert mapping['img-1'] == 'https://cdn.example.com/a.png?w=1200&q=80'
+
+    translated = short.replace('Intro', 'Giới thiệu')
+    assert restore_image_sources(translated, mapping) == compact.replace('Intro', 'Giới thiệu')
+
+
+def legacy_main_text(soup):
+    """KOL/news extraction before outermost-region selection"""
+    content_areas = soup.find_all(['article', 'main', 'div'], class_=lambda x: x and any(c in str(x).lower() for c in ['content', 'article', 'post', 'entry']))
+    return ' '.join([area.get_text(separator=' ', strip=True) for area in content_areas])
+
+
+def scraper_soup():
+    """Fixture after the KOL/news scrapers' element removal"""
+    soup = load_fixture_soup()
+    for tag in soup(["script", "style", "nav", "footer", "header", "aside"]):
+        tag.decompose()
+    return soup
+
+
+def test_main_text_has_no_nested_duplication():
+    text = extract_main_text(scraper_soup())
+    legacy = legacy_main_text(scraper_soup())
+
+    sentence = 'Instead of univariate polynomials, SP1 Hypercube uses multilinear polynomials to cut prover overhead.'
+    assert legacy.count(sentence) == 4
+    assert text.count(sentence) == 1
+    # The repeated closing paragraph is emitted once
+    assert text.count('Real-time proving removes one of the biggest barriers') == 1
+    # Share widget and cookie banner are gone
+    assert 'Share this post' not in text and 'cookies' not in text
+    # Prompt size reduction measured on the fixture
+    assert len(text) * 3 < len(legacy)
+
+
+def test_main_text_keeps_inline_markup_on_one_line():
+    soup = BeautifulSoup(
+        '<div class="post-content"><p>Staking rewards <a href="/x">are paid</a> every <b>epoch</b>.</p>'
+        '<ul><li>Low fees</li><li>Fast finality</li></ul></div>',
+        'html.parser'
+    )
+    assert extract_main_text(soup) == 'Staking rewards are paid every epoch .\nLow fees\nFast finality'
+
+
+def test_main_text_keeps_loose_text_next_to_paragraphs():
+    soup = BeautifulSoup(
+        '<div class="entry-content"><p>Mainnet launches in May.</p>'
+        '<div>Audits are done<br>Bug bounty is live</div>'
+        'Tokens unlock <span>after one year</span>'
+        '<table><tr><td><span>TVL</span></td><td>$12M</td></tr></table></div>',
+        'html.parser'
+    )
+    assert extract_main_text(soup) == (
+        'Mainnet launches in May.\nAudits are done\nBug bounty is live\n'
+        'Tokens unlock after one year\nTVL\n$12M'
+    )
+
+
+def test_main_text_falls_back_to_paragraphs():
+    soup = BeautifulSoup('<body><section><p>One</p><p>Two</p><p>One</p></section></body>', 'html.parser')
+    assert extract_main_text(soup) == 'One\nTwo'
@@ -0,0 +1,86 @@
+import asyncio
+import io
+
+import httpx
+import pytest
+from PIL import Image
+
+import fetcher
+from fetcher import HostScheduler
+from image_probe import declared_decision, dimensions_from_head, is_too_small, prefilter_images
+
+
+@pytest.fixture(autouse=True)
+def fast_scheduler(monkeypatch):
+    monkeypatch.setattr(fetcher, 'host_scheduler', HostScheduler(max_per_host=4, min_interval=0, max_retries=0))
+
+
+def _encode(width, height, image_format) -> bytes:
+    buffer = io.BytesIO()
+    Image.effect_noise((width, height), 64).convert('RGB').save(buffer, format=image_format)
+    return buffer.getvalue()
+
+
+def test_is_too_small():
+    assert is_too_small(1, 1)
+    assert is_too_small(600, 1)
+    assert is_too_small(32, 32)
+    assert is_too_small(48, None)
+    assert not is_too_small(728, 90)
+    assert not is_too_small(None, None)
+
+
+def test_dimensions_from_partial_jpeg():
+    jpeg = _encode(1200, 800, 'JPEG')
+    assert dimensions_from_head(jpeg[:2048]) == ('jpeg', 1200, 800)
+
+
+def test_dimensions_rejects_html():
+    assert dimensions_from_head(b'<!DOCTYPE html><html><body>Forbidden</body></html>') is None
+    assert dimensions_from_head(b'<svg xmlns="http://www.w3.org/2000/svg"></svg>') == ('svg', None, None)
+
+
+def test_declared_decision():
+    assert declared_decision({'declared_width': 1, 'declared_height': 1}) is False
+    assert declared_decision({'declared_width': 800, 'declared_height': 450}) is True
+    assert declared_decision({'srcset_width': 1024}) is True
+    assert declared_decision({}) is None
+
+
+def test_prefilter_probes_only_undeclared_images():
+    icon = _encode(24, 24, 'PNG')
+    photo = _encode(1600, 900, 'JPEG')
+    requested = []
+
+    def handler(request):
+        requested.append((request.url.path, request.headers.get('range')))
+        body = {'/icon.png': icon, '/photo.jpg': photo, '/error.jpg': b'<html>Not found</html>'}[request.url.path]
+        start, end = (int(x) for x in request.headers['range'][6:].split('-'))
+        chunk = body[start:end + 1]
+        return httpx.Response(206, headers={
+            'content-type': 'image/jpeg',
+            'content-range': f'bytes {start}-{start + len(chunk) - 1}/{len(body)}'
+        }, content=chunk)
+
+    candidates = [
+        {'url': 'https://cdn.example.com/icon.png'},
+        {'url': 'https://cdn.example.com/photo.jpg'},
+        {'url': 'https://cdn.example.com/error.jpg'},
+        {'url': 'https://cdn.example.com/declared.jpg', 'declared_width': 800, 'declared_height': 600},
+        {'url': 'https://cdn.example.com/pixel.gif', 'declared_width': 1, 'declared_height': 1},
+    ]
+
+    async def run():
+        fetcher._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        try:
+            return await prefilter_images(candidates)
+        finally:
+            await fetcher.close_http_client()
+
+    kept = asyncio.run(run())
+    assert [c['url'].rsplit('/', 1)[1] for c in kept] == ['photo.jpg', 'declared.jpg']
+    assert sorted(path for path, _ in requested) == ['/error.jpg', '/icon.png', '/photo.jpg']
+    assert all(range_header and range_header.startswith('bytes=0-') for _, range_header in requested)
+    assert kept[0]['probe_width'] == 1600
+    # The photo is larger than the probe, so it is downloaded in full later
+    assert 'probe_content' not in kept[0]
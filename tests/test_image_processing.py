@@ -0,0 +1,94 @@
+import asyncio
+import io
+
+import pytest
+from PIL import Image
+
+from image_processing import ImageProcessingError, ImageProcessor, process_image
+
+
+def _jpeg(width=2000, height=1000, exif_orientation=None) -> bytes:
+    image = Image.new('RGB', (width, height), (200, 120, 40))
+    exif = Image.Exif()
+    exif[0x010F] = 'ExampleCam'  # Make
+    if exif_orientation:
+        exif[0x0112] = exif_orientation
+    buffer = io.BytesIO()
+    image.save(buffer, format='JPEG', quality=90, exif=exif.tobytes())
+    return buffer.getvalue()
+
+
+def test_rejects_html_error_page():
+    with pytest.raises(ImageProcessingError):
+        process_image(b'<!DOCTYPE html><html><body>403 Forbidden</body></html>', avif=False)
+
+
+def test_rejects_truncated_image():
+    with pytest.raises(ImageProcessingError):
+        process_image(_jpeg()[:200], avif=False)
+
+
+def test_strips_exif_and_records_dimensions():
+    result = process_image(_jpeg(), avif=False)
+    assert (result['format'], result['width'], result['height']) == ('jpg', 2000, 1000)
+    with Image.open(io.BytesIO(result['original'])) as cleaned:
+        assert not cleaned.getexif()
+
+
+def test_exif_rotation_is_applied_before_stripping():
+    result = process_image(_jpeg(400, 200, exif_orientation=6), avif=False)
+    assert (result['width'], result['height']) == (200, 400)
+
+
+def test_webp_variants_never_upscale():
+    result = process_image(_jpeg(1200, 600), avif=False)
+    widths = [v['width'] for v in result['variants']]
+    assert widths == [480, 960, 1200]
+    assert all(v['format'] == 'webp' for v in result['variants'])
+    assert result['variants'][0]['height'] == 240
+    with Image.open(io.BytesIO(result['variants'][0]['content'])) as variant:
+        assert variant.format == 'WEBP' and variant.size == (480, 240)
+
+
+def test_clean_svg_keeps_its_drawing():
+    svg = b'<svg xmlns="http://www.w3.org/2000/svg" width="10" height="10"><rect width="5" height="5" fill="red"/></svg>'
+    result = process_image(svg)
+    assert result['format'] == 'svg' and not result['variants']
+    assert b'<rect width="5" height="5" fill="red"' in result['original']
+    assert b'ns0:' not in result['original']
+
+
+def test_svg_is_stripped_of_script():
+    svg = (
+        b'<?xml version="1.0"?><svg xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink"'
+        b' onload="alert(1)"><script>alert(2)</script>'
+        b'<a xlink:href=" java\tscript:alert(3)"><circle r="4" onclick="alert(4)"/></a>'
+        b'<a href="#part"><rect width="1" height="1"/></a>'
+        b'<foreignObject><body xmlns="http://www.w3.org/1999/xhtml"><img src="x" onerror="alert(5)"/></body></foreignObject>'
+        b'<set attributeName="href" to="javascript:alert(6)"/><animate attributeName="r" to="8"/>'
+        b'<image href="data:image/png;base64,iVBORw0KGgo="/></svg>'
+    )
+    sanitized = process_image(svg)['original']
+    for unsafe in (b'script', b'alert', b'onload', b'onclick', b'foreignObject', b'<set'):
+        assert unsafe not in sanitized
+    assert b'href="#part"' in sanitized
+    assert b'<animate attributeName="r"' in sanitized
+    assert b'data:image/png;base64' in sanitized
+
+
+@pytest.mark.parametrize('svg', [
+    b'<?xml version="1.0"?><!DOCTYPE svg [<!ENTITY a "aaaa">]><svg xmlns="http://www.w3.org/2000/svg">&a;</svg>',
+    b'<svg xmlns="http://www.w3.org/2000/svg"><rect></svg>',
+])
+def test_svg_bombs_and_broken_svgs_are_rejected(svg):
+    with pytest.raises(ImageProcessingError):
+        process_image(svg)
+
+
+def test_processor_runs_in_worker_process():
+    processor = ImageProcessor(max_workers=1)
+    try:
+        result = asyncio.run(processor.process(_jpeg(600, 300)))
+    finally:
+        processor.shutdown()
+    assert result['width'] == 600
@@ -0,0 +1,48 @@
+import asyncio
+
+from image_store import (
+    blob_relative_path, content_hash, detect_image_extension, extension_from_url, write_blob
+)
+
+PNG = b'\x89PNG\r\n\x1a\n' + b'\x00' * 32
+JPEG = b'\xff\xd8\xff\xe0' + b'\x00' * 32
+
+
+def test_detect_extension_from_magic_bytes():
+    assert detect_image_extension(PNG) == 'png'
+    assert detect_image_extension(JPEG) == 'jpg'
+    assert detect_image_extension(b'GIF89a...') == 'gif'
+    assert detect_image_extension(b'RIFF\x00\x00\x00\x00WEBPVP8 ') == 'webp'
+    assert detect_image_extension(b'  <?xml version="1.0"?><svg xmlns="http://www.w3.org/2000/svg"/>') == 'svg'
+    assert detect_image_extension(b'<!DOCTYPE html><html>Not found</html>') is None
+
+
+def test_extension_from_url():
+    assert extension_from_url('https://cdn.example.com/a/b/photo.JPEG?w=800') == 'jpg'
+    assert extension_from_url('https://cdn.example.com/a/b/render') is None
+
+
+def test_blob_paths_are_sharded_by_hash_prefix():
+    sha = content_hash(PNG)
+    assert blob_relative_path(sha, 'png') == f"store/{sha[:2]}/{sha[2:4]}/{sha}.png"
+
+
+def test_identical_content_is_written_once(tmp_path):
+    first = asyncio.run(write_blob(tmp_path, PNG, 'png'))
+    second = asyncio.run(write_blob(tmp_path, PNG, 'png'))
+    other = asyncio.run(write_blob(tmp_path, JPEG, 'jpg'))
+
+    assert first['created'] and not second['created']
+    assert first['relative_path'] == second['relative_path']
+    assert other['relative_path'] != first['relative_path']
+    assert (tmp_path / first['relative_path']).read_bytes() == PNG
+    stored = [p for p in tmp_path.rglob('*') if p.is_file()]
+    assert len(stored) == 2
+
+
+def test_overwrite_restores_a_removed_blob(tmp_path):
+    first = asyncio.run(write_blob(tmp_path, PNG, 'png'))
+    (tmp_path / first['relative_path']).unlink()
+    again = asyncio.run(write_blob(tmp_path, PNG, 'png', overwrite=True))
+    assert again['created']
+    assert (tmp_path / first['relative_path']).read_bytes() == PNG
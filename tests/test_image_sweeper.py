@@ -0,0 +1,67 @@
+import asyncio
+import os
+import time
+
+from image_sweeper import _restore_file, _stash_file, remove_legacy_project_dir, scan_legacy_dirs, scan_store
+
+SHA_A = 'a' * 64
+SHA_B = 'b' * 64
+
+
+def _age(path, seconds):
+    old = time.time() - seconds
+    os.utime(path, (old, old))
+
+
+def test_scan_store_groups_old_files_by_hash(tmp_path):
+    shard = tmp_path / 'store' / 'aa' / 'aa'
+    shard.mkdir(parents=True)
+    old_blob = shard / f'{SHA_A}.svg'
+    old_blob.write_bytes(b'<svg/>')
+    old_gz = shard / f'{SHA_A}.svg.gz'
+    old_gz.write_bytes(b'gz')
+    new_blob = shard / f'{SHA_B}.jpg'
+    new_blob.write_bytes(b'new')
+    temp = shard / f'.{SHA_A}.jpg.1234abcd.tmp'
+    temp.write_bytes(b'partial')
+    for path in (old_blob, old_gz, temp):
+        _age(path, 3600)
+
+    files = scan_store(tmp_path / 'store', cutoff=time.time() - 60)
+    assert sorted(p.name for p in files[SHA_A]) == sorted([old_blob.name, old_gz.name])
+    assert SHA_B not in files  # inside the grace period
+    assert files[''] == [temp]
+
+
+def test_scan_legacy_dirs_skips_store_and_recent(tmp_path):
+    for name in ('store', 'old-project', 'new-project'):
+        (tmp_path / name).mkdir()
+    _age(tmp_path / 'store', 3600)
+    _age(tmp_path / 'old-project', 3600)
+
+    assert list(scan_legacy_dirs(tmp_path, cutoff=time.time() - 60)) == ['old-project']
+
+
+def test_remove_legacy_project_dir(tmp_path):
+    project_dir = tmp_path / 'project-1'
+    project_dir.mkdir()
+    (project_dir / 'header.png').write_bytes(b'x' * 100)
+    (tmp_path / 'store').mkdir()
+
+    assert asyncio.run(remove_legacy_project_dir(tmp_path, 'project-1')) == 100
+    assert not project_dir.exists()
+    assert asyncio.run(remove_legacy_project_dir(tmp_path, 'store')) == 0
+    assert asyncio.run(remove_legacy_project_dir(tmp_path, '../' + tmp_path.name)) == 0
+    assert (tmp_path / 'store').exists()
+
+
+def test_stashed_blob_is_hidden_and_can_be_restored(tmp_path):
+    blob = tmp_path / f'{SHA_A}.png'
+    blob.write_bytes(b'png')
+    stash = _stash_file(blob)
+    assert not blob.exists()
+    assert scan_store(tmp_path, cutoff=time.time() + 60)[''] == [stash]
+
+    _restore_file(stash, blob)
+    assert blob.read_bytes() == b'png' and not stash.exists()
+    assert _stash_file(tmp_path / f'{SHA_B}.png') is None
@@ -0,0 +1,50 @@
+from datetime import datetime, timedelta, timezone
+
+from migrations import DATETIME_FIELDS, EXCERPT_FIELDS, FINGERPRINT_SOURCES, missing_excerpt, parse_legacy_datetime
+
+
+def test_parses_isoformat_output():
+    value = datetime(2025, 1, 2, 3, 4, 5, 678000, tzinfo=timezone.utc)
+    assert parse_legacy_datetime(value.isoformat()) == value
+
+
+def test_naive_and_zulu_strings_are_utc():
+    expected = datetime(2025, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+    assert parse_legacy_datetime('2025-01-02T03:04:05') == expected
+    assert parse_legacy_datetime('2025-01-02T03:04:05Z') == expected
+
+
+def test_offsets_are_kept():
+    parsed = parse_legacy_datetime('2025-01-02T10:04:05+07:00')
+    assert parsed.utcoffset() == timedelta(hours=7)
+    assert parsed == datetime(2025, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+
+
+def test_garbage_is_not_parsed():
+    assert parse_legacy_datetime('yesterday') is None
+    assert parse_legacy_datetime('') is None
+
+
+def test_every_paginated_collection_is_migrated():
+    for collection in ('projects', 'kol_posts', 'news_articles', 'social_posts'):
+        assert 'created_at' in DATETIME_FIELDS[collection]
+
+
+def test_fingerprint_backfill_reads_the_fingerprinted_fields():
+    assert FINGERPRINT_SOURCES['projects'] == ('original_content', None)
+    # URL sources were fingerprinted from scraped text, so only text sources can be rebuilt
+    assert FINGERPRINT_SOURCES['kol_posts'] == ('information_source', 'text')
+    assert FINGERPRINT_SOURCES['news_articles'] == ('source_content', 'text')
+
+
+def test_compression_writes_excerpts_for_legacy_projects():
+    fields = EXCERPT_FIELDS['projects']
+    legacy = {'original_content': '<p>Original body</p>', 'translated_content': '<p>Bản dịch</p>'}
+    # The translation wins, as in the list projection
+    assert missing_excerpt(legacy, fields) == {'excerpt': 'Bản dịch'}
+    assert missing_excerpt({'original_content': '<p>Original body</p>', 'translated_content': None}, fields) == {
+        'excerpt': 'Original body'
+    }
+    # Stored excerpts are left alone
+    assert missing_excerpt({**legacy, 'excerpt': 'Kept'}, fields) == {}
+    assert missing_excerpt(legacy, ()) == {}
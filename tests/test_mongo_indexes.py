@@ -0,0 +1,56 @@
+from mongo_indexes import INDEX_SPECS, index_name, plan_indexes
+
+
+PROJECT_SPECS = [
+    {"keys": [("id", 1)], "unique": True},
+    {"keys": [("created_at", -1)]},
+]
+
+
+def test_index_name_matches_mongo_default():
+    assert index_name([("id", 1)]) == 'id_1'
+    assert index_name([("feed_id", 1), ("url", 1)]) == 'feed_id_1_url_1'
+    assert index_name([("created_at", -1)]) == 'created_at_-1'
+
+
+def test_missing_indexes_are_planned():
+    plan = plan_indexes(PROJECT_SPECS, {'_id_': {'key': [('_id', 1)], 'v': 2}})
+    assert plan['missing'] == PROJECT_SPECS
+    assert plan['present'] == [] and plan['conflicts'] == [] and plan['unmanaged'] == []
+
+
+def test_existing_indexes_are_matched_by_keys():
+    existing = {
+        '_id_': {'key': [('_id', 1)], 'v': 2},
+        'id_1': {'key': [('id', 1.0)], 'unique': True, 'v': 2},
+        'by_date': {'key': [('created_at', -1)], 'v': 2},
+        'title_text': {'key': [('_fts', 'text'), ('_ftsx', 1)], 'v': 2},
+    }
+    plan = plan_indexes(PROJECT_SPECS, existing)
+    assert plan['present'] == ['id_1', 'by_date']
+    assert plan['missing'] == []
+    assert plan['conflicts'] == []
+    assert plan['unmanaged'] == ['title_text']
+
+
+def test_option_mismatch_is_a_conflict():
+    existing = {'id_1': {'key': [('id', 1)], 'v': 2}}
+    plan = plan_indexes(PROJECT_SPECS, existing)
+    assert len(plan['conflicts']) == 1
+    assert 'id_1' in plan['conflicts'][0] and 'unique' in plan['conflicts'][0]
+    assert plan['missing'] == [PROJECT_SPECS[1]]
+
+
+def test_name_taken_by_other_keys_is_a_conflict():
+    existing = {'created_at_-1': {'key': [('created_at', 1)], 'v': 2}}
+    plan = plan_indexes(PROJECT_SPECS, existing)
+    assert len(plan['conflicts']) == 1
+    assert plan['missing'] == [PROJECT_SPECS[0]]
+    assert plan['unmanaged'] == []
+
+
+def test_every_listed_collection_has_unique_id_and_date_indexes():
+    for collection in ('projects', 'kol_posts', 'news_articles', 'social_posts', 'feeds'):
+        keys = {tuple(spec['keys']): spec for spec in INDEX_SPECS[collection]}
+        assert keys[(("id", 1),)].get('unique') is True
+        assert any(spec_keys[0] == ("created_at", -1) for spec_keys in keys)
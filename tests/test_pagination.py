@@ -0,0 +1,44 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from pagination import decode_cursor, encode_cursor, keyset_filter
+
+
+def test_cursor_round_trip_keeps_datetime():
+    created_at = datetime(2025, 3, 1, 12, 30, 5, 123000, tzinfo=timezone.utc)
+    cursor = encode_cursor({"id": "abc", "created_at": created_at, "title": "ignored"})
+    assert '=' not in cursor
+    assert decode_cursor(cursor) == (created_at, "abc")
+
+
+def test_cursor_round_trip_keeps_legacy_iso_string():
+    cursor = encode_cursor({"id": "abc", "created_at": "2025-03-01T12:30:05+00:00"})
+    assert decode_cursor(cursor) == ("2025-03-01T12:30:05+00:00", "abc")
+
+
+@pytest.mark.parametrize('cursor', ['not-a-cursor', '', 'e30', 'W10', '!!!!'])
+def test_invalid_cursor_raises_value_error(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+def test_keyset_filter_continues_after_cursor():
+    created_at = datetime(2025, 3, 1, tzinfo=timezone.utc)
+    assert keyset_filter(None) == {}
+    assert keyset_filter(encode_cursor({"id": "m", "created_at": created_at})) == {"$or": [
+        {"created_at": {"$lt": created_at}},
+        {"created_at": created_at, "id": {"$lt": "m"}},
+        # Legacy string and missing timestamps sort after every date
+        {"created_at": {"$type": "string"}},
+        {"created_at": None},
+    ]}
+
+
+def test_keyset_filter_past_legacy_rows():
+    assert keyset_filter(encode_cursor({"id": "m", "created_at": "2024-01-01T00:00:00"})) == {"$or": [
+        {"created_at": {"$lt": "2024-01-01T00:00:00"}},
+        {"created_at": "2024-01-01T00:00:00", "id": {"$lt": "m"}},
+        {"created_at": None},
+    ]}
+    assert keyset_filter(encode_cursor({"id": "m"})) == {"$or": [{"created_at": None, "id": {"$lt": "m"}}]}
@@ -0,0 +1,20 @@
+from slug_cache import normalize_alt_text, placeholder_slug
+
+
+def test_normalize_alt_text():
+    assert normalize_alt_text('  Succinct   Hypercube  Architecture. ') == 'succinct hypercube architecture'
+    assert normalize_alt_text('"Team photo"') == normalize_alt_text('team photo')
+    assert normalize_alt_text('Ｆｕｌｌｗｉｄｔｈ') == 'fullwidth'
+
+
+def test_placeholders_are_slugged_locally():
+    assert placeholder_slug(normalize_alt_text('image-3')) == 'hinh-anh-3'
+    assert placeholder_slug(normalize_alt_text('IMG_1234.JPG')) == 'hinh-anh-1234'
+    assert placeholder_slug(normalize_alt_text('2024')) == 'hinh-anh-2024'
+    assert placeholder_slug(normalize_alt_text('Screenshot')) == 'hinh-anh'
+    assert placeholder_slug('') == 'hinh-anh'
+
+
+def test_meaningful_alt_text_is_not_a_placeholder():
+    assert placeholder_slug(normalize_alt_text('Image of the SP1 prover pipeline')) is None
+    assert placeholder_slug(normalize_alt_text('Photo 5 - team at ETHCC')) is None
@@ -0,0 +1,35 @@
+import json
+
+from slug_protocol import build_translation_prompt, chunked, parse_translation_response
+
+
+def test_prompt_carries_ids_and_unescaped_text():
+    prompt = build_translation_prompt({'0': 'Team photo', '1': 'Café "Sài Gòn" meetup'})
+    payload = json.loads(prompt.rsplit('\n', 1)[1])
+    assert payload == [{'id': '0', 'text': 'Team photo'}, {'id': '1', 'text': 'Café "Sài Gòn" meetup'}]
+
+
+def test_parses_fenced_json_by_id():
+    response = '```json\n[{"id": "1", "vi": "Sơ đồ kiến trúc"}, {"id": "0", "vi": "Ảnh đội ngũ"}]\n```'
+    assert parse_translation_response(response, ['0', '1']) == {'0': 'Ảnh đội ngũ', '1': 'Sơ đồ kiến trúc'}
+
+
+def test_invalid_items_are_left_for_retry():
+    response = json.dumps([
+        {'id': '0', 'vi': 'Ảnh đội ngũ'},
+        {'id': '0', 'vi': 'Bản dịch trùng'},  # duplicate id: first wins
+        {'id': '1', 'vi': ''},                 # empty
+        {'id': '2', 'vi': 'dòng 1\ndòng 2'},   # multi-line
+        {'id': '9', 'vi': 'Không được yêu cầu'},  # unknown id
+        'not an object',
+    ], ensure_ascii=False)
+    assert parse_translation_response(response, ['0', '1', '2', '3']) == {'0': 'Ảnh đội ngũ'}
+
+
+def test_unparseable_response_yields_nothing():
+    assert parse_translation_response('1. Ảnh đội ngũ\n2. Sơ đồ', ['0', '1']) == {}
+    assert parse_translation_response('[{"id": "0", "vi": "cut off', ['0']) == {}
+
+
+def test_chunked():
+    assert chunked(list('abcde'), 2) == [['a', 'b'], ['c', 'd'], ['e']]
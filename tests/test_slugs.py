@@ -0,0 +1,34 @@
+import unicodedata
+
+from slugs import remove_accents, slugify, slugify_many, unique_slugs
+
+
+def test_vietnamese_accents_and_d_stroke():
+    assert remove_accents('Đường đi của Bitcoin') == 'Duong di cua Bitcoin'
+    assert slugify('Tiếng Việt: ỹ ỵ ữ ự ằ ẩ ộ') == 'tieng-viet-y-y-u-u-a-a-o'
+
+
+def test_decomposed_input():
+    assert slugify(unicodedata.normalize('NFD', 'Đồ thị giá')) == 'do-thi-gia'
+
+
+def test_single_pass_collapses_separators():
+    assert slugify('  --Ảnh   minh họa!!  (2024) -- ') == 'anh-minh-hoa-2024'
+    assert slugify('🚀🚀') == ''
+
+
+def test_long_slugs_cut_at_word_boundary():
+    slug = slugify('sơ đồ ' * 40, max_length=20)
+    assert len(slug) <= 20 and not slug.endswith('-')
+    assert slug == 'so-do-so-do-so-do-so'
+
+
+def test_batch_and_uniqueness():
+    slugs = slugify_many(['Ảnh đội ngũ', 'ảnh đội ngũ', 'Sơ đồ', '', 'Ảnh đội ngũ'])
+    assert unique_slugs(slugs) == ['anh-doi-ngu', 'anh-doi-ngu-2', 'so-do', 'hinh-anh', 'anh-doi-ngu-3']
+
+
+def test_uniqueness_against_taken_names():
+    taken = {'so-do', 'so-do-2'}
+    assert unique_slugs(['so-do'], taken) == ['so-do-3']
+    assert 'so-do-3' in taken
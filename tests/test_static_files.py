@@ -0,0 +1,139 @@
+import gzip
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from static_files import CachedStaticFiles, IMMUTABLE_CACHE_CONTROL, accepts_encoding, file_response, parse_range_header
+
+CONTENT = bytes(range(256)) * 1000
+SHA = 'ab' * 32
+SVG = b'<svg xmlns="http://www.w3.org/2000/svg">' + b'<rect width="1" height="1"/>' * 50 + b'</svg>'
+
+
+@pytest.fixture
+def client(tmp_path):
+    path = tmp_path / 'photo.webp'
+    path.write_bytes(CONTENT)
+    app = FastAPI()
+
+    @app.get('/file')
+    async def serve(request: Request):
+        return file_response(path, request, headers={'Content-Disposition': 'attachment; filename="anh.webp"'})
+
+    return TestClient(app)
+
+
+def test_parse_range_header():
+    assert parse_range_header(None, 100) is None
+    assert parse_range_header('bytes=0-9', 100) == (0, 9)
+    assert parse_range_header('bytes=90-', 100) == (90, 99)
+    assert parse_range_header('bytes=-10', 100) == (90, 99)
+    assert parse_range_header('bytes=50-500', 100) == (50, 99)
+    assert parse_range_header('bytes=0-1,5-6', 100) is None
+    assert parse_range_header('items=0-1', 100) is None
+    with pytest.raises(ValueError):
+        parse_range_header('bytes=100-', 100)
+
+
+def test_accepts_encoding_honours_q_values():
+    assert accepts_encoding('gzip, deflate, br', 'gzip')
+    assert accepts_encoding('br;q=1.0, GZIP;q=0.5', 'gzip')
+    assert accepts_encoding('*', 'gzip')
+    assert not accepts_encoding('gzip;q=0', 'gzip')
+    assert not accepts_encoding('gzip; q=0.000, br', 'gzip')
+    assert not accepts_encoding('*;q=0, br', 'gzip')
+    assert not accepts_encoding('gzip;q=0, *', 'gzip')
+    assert not accepts_encoding('identity', 'gzip')
+    assert not accepts_encoding(None, 'gzip')
+
+
+def test_full_file(client):
+    response = client.get('/file')
+    assert response.status_code == 200
+    assert response.content == CONTENT
+    assert response.headers['content-type'] == 'image/webp'
+    assert response.headers['accept-ranges'] == 'bytes'
+    assert 'anh.webp' in response.headers['content-disposition']
+
+
+def test_partial_content(client):
+    response = client.get('/file', headers={'Range': 'bytes=1000-70999'})
+    assert response.status_code == 206
+    assert response.content == CONTENT[1000:71000]
+    assert response.headers['content-range'] == f'bytes 1000-70999/{len(CONTENT)}'
+    assert response.headers['content-length'] == '70000'
+
+
+def test_unsatisfiable_range(client):
+    response = client.get('/file', headers={'Range': f'bytes={len(CONTENT)}-'})
+    assert response.status_code == 416
+    assert response.headers['content-range'] == f'bytes */{len(CONTENT)}'
+
+
+@pytest.fixture
+def static_client(tmp_path):
+    store_dir = tmp_path / 'images' / 'store' / 'ab' / 'ab'
+    store_dir.mkdir(parents=True)
+    (store_dir / f'{SHA}.webp').write_bytes(CONTENT)
+    (store_dir / f'{SHA}.svg').write_bytes(SVG)
+    (store_dir / f'{SHA}.svg.gz').write_bytes(gzip.compress(SVG))
+    legacy_dir = tmp_path / 'images' / 'project-1'
+    legacy_dir.mkdir()
+    (legacy_dir / 'header.png').write_bytes(b'png bytes')
+
+    app = FastAPI()
+    app.mount('/static', CachedStaticFiles(directory=str(tmp_path)), name='static')
+    return TestClient(app)
+
+
+def test_store_images_are_immutable_with_hash_etag(static_client):
+    url = f'/static/images/store/ab/ab/{SHA}.webp'
+    response = static_client.get(url)
+    assert response.status_code == 200
+    assert response.headers['cache-control'] == IMMUTABLE_CACHE_CONTROL
+    assert response.headers['etag'] == f'"{SHA}"'
+
+    revalidated = static_client.get(url, headers={'If-None-Match': f'"{SHA}"'})
+    assert revalidated.status_code == 304
+    assert revalidated.content == b''
+
+
+def test_store_images_support_ranges(static_client):
+    response = static_client.get(f'/static/images/store/ab/ab/{SHA}.webp', headers={'Range': 'bytes=0-99'})
+    assert response.status_code == 206
+    assert response.content == CONTENT[:100]
+
+
+def test_precompressed_svg(static_client):
+    url = f'/static/images/store/ab/ab/{SHA}.svg'
+    compressed = static_client.get(url, headers={'Accept-Encoding': 'gzip'})
+    assert compressed.headers['content-encoding'] == 'gzip'
+    assert compressed.headers['content-type'].startswith('image/svg+xml')
+    assert compressed.headers['etag'] == f'"{SHA}-gz"'
+    assert compressed.content == SVG  # decoded by the client
+
+    plain = static_client.get(url, headers={'Accept-Encoding': 'identity'})
+    assert 'content-encoding' not in plain.headers
+    assert plain.headers['vary'] == 'Accept-Encoding'
+    assert plain.content == SVG
+
+    refused = static_client.get(url, headers={'Accept-Encoding': 'gzip;q=0, identity'})
+    assert 'content-encoding' not in refused.headers
+
+
+def test_svg_cannot_run_scripts_on_our_origin(static_client):
+    for encoding in ('gzip', 'identity'):
+        response = static_client.get(f'/static/images/store/ab/ab/{SHA}.svg', headers={'Accept-Encoding': encoding})
+        assert response.headers['content-security-policy'].startswith("default-src 'none'")
+        assert response.headers['content-disposition'] == 'attachment'
+        assert response.headers['x-content-type-options'] == 'nosniff'
+    # Raster images are unaffected
+    assert 'content-security-policy' not in static_client.get(f'/static/images/store/ab/ab/{SHA}.webp').headers
+
+
+def test_legacy_project_paths_still_served(static_client):
+    response = static_client.get('/static/images/project-1/header.png')
+    assert response.status_code == 200
+    assert response.content == b'png bytes'
+    assert 'immutable' not in response.headers['cache-control']
@@ -0,0 +1,33 @@
+from summaries import EXCERPT_LENGTH, excerpt_expression, excerpt_from, make_excerpt
+
+
+def test_excerpt_strips_html_and_markdown():
+    assert make_excerpt('<h1>Title</h1>\n<p>First   <b>bold</b> line</p>') == 'Title First bold line'
+    assert make_excerpt('## Heading\n- **Point** one\n![alt](http://x/y.png) done') == 'Heading Point one done'
+
+
+def test_excerpt_cuts_long_text_at_word_boundary():
+    excerpt = make_excerpt('word ' * 100)
+    assert len(excerpt) <= EXCERPT_LENGTH + 1
+    assert excerpt.endswith('word…')
+
+
+def test_empty_text_has_no_excerpt():
+    assert make_excerpt(None) is None
+    assert make_excerpt('') is None
+    assert make_excerpt('<p> </p>') is None
+
+
+def test_excerpt_expression_falls_back_in_field_order():
+    expression = excerpt_expression('translated_content', 'original_content')
+    condition, stored, fallback = expression['$cond']
+    assert stored == '$excerpt'
+    assert fallback['$cond'][1] == {'$substrCP': ['$translated_content', 0, EXCERPT_LENGTH]}
+    assert fallback['$cond'][2]['$cond'][1] == {'$substrCP': ['$original_content', 0, EXCERPT_LENGTH]}
+    assert fallback['$cond'][2]['$cond'][2] is None
+
+
+def test_excerpt_from_first_string_field():
+    document = {'translated_content': '', 'original_content': '<p>Body</p>', 'other': 'x'}
+    assert excerpt_from(document, 'translated_content', 'original_content') == 'Body'
+    assert excerpt_from({'original_content': {'codec': 'zlib'}}, 'original_content') is None
@@ -0,0 +1,43 @@
+import asyncio
+import io
+import zipfile
+
+from zip_stream import ZIP_CHUNK_SIZE, stream_zip, unique_archive_names
+
+
+def _collect(entries):
+    async def run():
+        return [chunk async for chunk in stream_zip(entries)]
+    return asyncio.run(run())
+
+
+def test_unique_archive_names():
+    names = ['anh-bia.jpg', 'anh-bia.jpg', 'ANH-BIA.jpg', 'so-do.png', '../../etc/passwd', '']
+    assert unique_archive_names(names) == ['anh-bia.jpg', 'anh-bia-2.jpg', 'ANH-BIA-3.jpg', 'so-do.png', 'passwd', 'image']
+
+
+def test_streamed_archive_is_valid(tmp_path):
+    big = tmp_path / 'big'
+    big.write_bytes(bytes(range(256)) * 4000)
+    small = tmp_path / 'small'
+    small.write_bytes(b'GIF89a tiny')
+
+    chunks = _collect([('anh-bia.jpg', big), ('logo.gif', small)])
+    archive = zipfile.ZipFile(io.BytesIO(b''.join(chunks)))
+
+    assert archive.testzip() is None
+    assert archive.namelist() == ['anh-bia.jpg', 'logo.gif']
+    assert archive.read('anh-bia.jpg') == big.read_bytes()
+    assert all(info.compress_type == zipfile.ZIP_STORED for info in archive.infolist())
+
+
+def test_chunks_stay_small(tmp_path):
+    paths = []
+    for i in range(5):
+        path = tmp_path / f'img{i}'
+        path.write_bytes(b'\xff' * (3 * ZIP_CHUNK_SIZE))
+        paths.append((f'img{i}.jpg', path))
+
+    chunks = _collect(paths)
+    # Nothing close to the whole archive (15 chunks of data) is ever held at once
+    assert max(len(chunk) for chunk in chunks) < 2 * ZIP_CHUNK_SIZE